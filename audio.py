@@ -3,145 +3,211 @@ Audio Manager for Tetris
 Handles sound effects and background music
 """
 
-import pygame
+import json
 import os
+import threading
+import pygame
+
+# Bump when synthesis changes so cached waveforms are regenerated
+SYNTH_VERSION = 2
+SAMPLE_RATE = 22050
+AMPLITUDE = 0.3
+FADE_SECONDS = 0.01
+
+# Where synthesized waveforms are persisted between runs
+CACHE_DIR = os.environ.get('TETRIS_CACHE_DIR',
+                           os.path.join(os.path.expanduser('~'), '.cache', 'tetris'))
+
+# Sound effects as (kind, parameters)
+SOUND_SPECS = {
+    'move': ('tone', (220, 0.1)),                                   # Short low beep
+    'rotate': ('tone', (440, 0.08)),                                # Quick chirp
+    'drop': ('sweep', (440, 220, 0.2)),                             # Descending tone
+    'line_clear': ('arpeggio', ((261, 329, 392, 523), 0.15)),       # Ascending arpeggio
+    'tetris': ('arpeggio', ((261, 329, 392, 523, 659), 0.3)),       # Victory fanfare
+    'game_over': ('sweep', (523, 130, 1.0)),                        # Descending sad tone
+    'level_up': ('arpeggio', ((392, 523, 659, 784), 0.2)),          # Triumphant beep
+}
+
+def _fade_envelope(frames, sample_rate):
+    """Get a linear fade-in/fade-out envelope that avoids clicks."""
+    import numpy as np
+    
+    i = np.arange(frames)
+    fade = sample_rate * FADE_SECONDS
+    return np.minimum(1.0, np.minimum(i / fade, (frames - i) / fade))
+
+def _to_int16(wave):
+    """Scale a [-1, 1] waveform to 16-bit samples at the effect volume."""
+    import numpy as np
+    
+    return (wave * (AMPLITUDE * 32767)).astype(np.int16)
+
+def synthesize_tone(frequency, duration, sample_rate=SAMPLE_RATE):
+    """Get mono 16-bit samples of a sine tone."""
+    import numpy as np
+    
+    frames = int(duration * sample_rate)
+    wave = np.sin(2 * np.pi * frequency / sample_rate * np.arange(frames))
+    return _to_int16(wave * _fade_envelope(frames, sample_rate))
+
+def synthesize_sweep(start_freq, end_freq, duration, sample_rate=SAMPLE_RATE):
+    """Get mono 16-bit samples of a linear frequency sweep."""
+    import numpy as np
+    
+    frames = int(duration * sample_rate)
+    frequency = start_freq + (end_freq - start_freq) * (np.arange(frames) / frames)
+    
+    # Accumulate phase so the pitch glides smoothly from start_freq to end_freq
+    phase = 2 * np.pi / sample_rate * (np.cumsum(frequency) - frequency)
+    return _to_int16(np.sin(phase) * _fade_envelope(frames, sample_rate))
+
+def synthesize_arpeggio(frequencies, total_duration, sample_rate=SAMPLE_RATE):
+    """Get mono 16-bit samples of equal-length notes played in sequence."""
+    import numpy as np
+    
+    frames_per_note = int(total_duration / len(frequencies) * sample_rate)
+    i = np.arange(frames_per_note)
+    
+    # Attack and release over the first and last 10% of each note
+    progress = i / frames_per_note
+    envelope = np.minimum(1.0, np.minimum(progress / 0.1, (1 - progress) / 0.1))
+    
+    notes = np.sin(2 * np.pi / sample_rate * np.outer(frequencies, i)) * envelope
+    return _to_int16(notes.reshape(-1))
+
+SYNTHESIZERS = {
+    'tone': synthesize_tone,
+    'sweep': synthesize_sweep,
+    'arpeggio': synthesize_arpeggio,
+}
+
+def load_waveforms(specs=SOUND_SPECS, sample_rate=SAMPLE_RATE, cache_dir=CACHE_DIR):
+    """Get mono samples for each sound, memory-mapped from the cache when it is current."""
+    import numpy as np
+    
+    data_path = os.path.join(cache_dir, f"waveforms-v{SYNTH_VERSION}.npy")
+    index_path = os.path.join(cache_dir, f"waveforms-v{SYNTH_VERSION}.json")
+    signature = json.dumps({'sample_rate': sample_rate, 'specs': specs}, sort_keys=True)
+    
+    # The index maps each sound to its slice of one concatenated sample array
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+        if index['signature'] == signature:
+            samples = np.load(data_path, mmap_mode='r')
+            return {name: samples[start:start + length]
+                    for name, (start, length) in index['sounds'].items()}
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    waveforms = {name: SYNTHESIZERS[kind](*params, sample_rate=sample_rate)
+                 for name, (kind, params) in specs.items()}
+    
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        sounds = {}
+        offset = 0
+        for name, wave in waveforms.items():
+            sounds[name] = (offset, len(wave))
+            offset += len(wave)
+        
+        # Write to temporary files first so a crash never leaves a torn cache
+        with open(data_path + '.tmp', 'wb') as f:
+            np.save(f, np.concatenate(list(waveforms.values())))
+        with open(index_path + '.tmp', 'w') as f:
+            json.dump({'signature': signature, 'sounds': sounds}, f)
+        os.replace(data_path + '.tmp', data_path)
+        os.replace(index_path + '.tmp', index_path)
+    except OSError:
+        # A read-only cache location only costs resynthesis next time
+        pass
+    
+    return waveforms
 
 class AudioManager:
     """Manages game audio including sound effects and music."""
     
-    def __init__(self):
-        """Initialize the audio system."""
-        pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+    def __init__(self, background=True):
+        """Initialize the audio system, in a background thread unless background is False."""
         self.sounds = {}
         self.music_volume = 0.5
         self.sfx_volume = 0.7
         self.muted = False
+        self.sample_rate = SAMPLE_RATE
+        self.channels = 2
+        
+        # Set once startup has finished (successfully or not); sounds played
+        # before then are dropped
+        self.ready = threading.Event()
+        self.mixer_ready = False
         
-        # Try to load sounds if they exist
-        self.load_sounds()
+        if background:
+            threading.Thread(target=self.start, name="audio-init", daemon=True).start()
+        else:
+            self.start()
+    
+    def start(self):
+        """Initialize the mixer and load the sounds."""
+        try:
+            pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=2, buffer=512)
+            
+            # The mixer may already be running at another rate (e.g. after pygame.init())
+            mixer = pygame.mixer.get_init()
+            if mixer:
+                self.sample_rate = mixer[0]
+                self.channels = mixer[2]
+                self.mixer_ready = True
+                
+                # Try to load sounds if they exist
+                self.load_sounds()
+                self._apply_music_volume()
+        except pygame.error as e:
+            # No sound device (e.g. headless hosts): play silently
+            print(f"Audio unavailable: {e}")
+        finally:
+            self.ready.set()
+    
+    def wait_ready(self, timeout=None):
+        """Wait for startup to finish, returning whether it did."""
+        return self.ready.wait(timeout)
         
     def load_sounds(self):
         """Load sound effects. Creates placeholder sounds if files don't exist."""
-        sound_files = {
-            'move': None,
-            'rotate': None,
-            'drop': None,
-            'line_clear': None,
-            'tetris': None,
-            'game_over': None,
-            'level_up': None
-        }
-        
         # For now, we'll create simple programmatic sounds
         # In a full implementation, you'd load actual sound files
         self.create_simple_sounds()
         
     def create_simple_sounds(self):
-        """Create simple programmatic sound effects."""
+        """Create simple programmatic sound effects, reusing cached waveforms."""
         try:
-            # Create simple beep sounds using pygame
-            # Move sound - short low beep
-            self.sounds['move'] = self.create_tone(220, 0.1)
-            
-            # Rotate sound - quick chirp
-            self.sounds['rotate'] = self.create_tone(440, 0.08)
-            
-            # Drop sound - descending tone
-            self.sounds['drop'] = self.create_sweep_tone(440, 220, 0.2)
-            
-            # Line clear - ascending arpeggio
-            self.sounds['line_clear'] = self.create_arpeggio([261, 329, 392, 523], 0.15)
-            
-            # Tetris (4 lines) - victory fanfare
-            self.sounds['tetris'] = self.create_arpeggio([261, 329, 392, 523, 659], 0.3)
-            
-            # Game over - descending sad tone
-            self.sounds['game_over'] = self.create_sweep_tone(523, 130, 1.0)
-            
-            # Level up - triumphant beep
-            self.sounds['level_up'] = self.create_arpeggio([392, 523, 659, 784], 0.2)
-            
+            waveforms = load_waveforms(sample_rate=self.sample_rate)
+            # Publish the finished dict in one assignment for the game thread
+            self.sounds = {name: self.make_sound(wave) for name, wave in waveforms.items()}
         except Exception as e:
             print(f"Could not create sounds: {e}")
             # Disable sounds if creation fails
             self.sounds = {}
     
-    def create_tone(self, frequency, duration, sample_rate=22050):
-        """Create a simple tone sound."""
+    def make_sound(self, samples):
+        """Create a pygame sound from mono 16-bit samples."""
         import numpy as np
         
-        frames = int(duration * sample_rate)
-        arr = np.zeros((frames, 2))
-        
-        for i in range(frames):
-            wave = np.sin(2 * np.pi * frequency * i / sample_rate)
-            # Apply envelope to avoid clicks
-            envelope = min(1.0, i / (sample_rate * 0.01), (frames - i) / (sample_rate * 0.01))
-            arr[i][0] = wave * envelope * 0.3  # Left channel
-            arr[i][1] = wave * envelope * 0.3  # Right channel
-        
-        # Convert to pygame sound
-        sound_array = (arr * 32767).astype(np.int16)
-        sound = pygame.sndarray.make_sound(sound_array)
-        return sound
+        if self.channels == 1:
+            return pygame.sndarray.make_sound(np.ascontiguousarray(samples))
+        return pygame.sndarray.make_sound(np.repeat(samples[:, None], self.channels, axis=1))
+    
+    def create_tone(self, frequency, duration):
+        """Create a simple tone sound."""
+        return self.make_sound(synthesize_tone(frequency, duration, self.sample_rate))
     
-    def create_sweep_tone(self, start_freq, end_freq, duration, sample_rate=22050):
+    def create_sweep_tone(self, start_freq, end_freq, duration):
         """Create a frequency sweep tone."""
-        try:
-            import numpy as np
-            
-            frames = int(duration * sample_rate)
-            arr = np.zeros((frames, 2))
-            
-            for i in range(frames):
-                # Linear frequency interpolation
-                progress = i / frames
-                current_freq = start_freq + (end_freq - start_freq) * progress
-                
-                wave = np.sin(2 * np.pi * current_freq * i / sample_rate)
-                # Apply envelope
-                envelope = min(1.0, i / (sample_rate * 0.01), (frames - i) / (sample_rate * 0.01))
-                arr[i][0] = wave * envelope * 0.3
-                arr[i][1] = wave * envelope * 0.3
-            
-            sound_array = (arr * 32767).astype(np.int16)
-            sound = pygame.sndarray.make_sound(sound_array)
-            return sound
-        except ImportError:
-            # Fallback if numpy not available
-            return self.create_tone(start_freq, duration)
-    
-    def create_arpeggio(self, frequencies, total_duration, sample_rate=22050):
+        return self.make_sound(synthesize_sweep(start_freq, end_freq, duration, self.sample_rate))
+    
+    def create_arpeggio(self, frequencies, total_duration):
         """Create an arpeggio from a list of frequencies."""
-        try:
-            import numpy as np
-            
-            note_duration = total_duration / len(frequencies)
-            frames_per_note = int(note_duration * sample_rate)
-            total_frames = frames_per_note * len(frequencies)
-            
-            arr = np.zeros((total_frames, 2))
-            
-            for note_idx, freq in enumerate(frequencies):
-                start_frame = note_idx * frames_per_note
-                for i in range(frames_per_note):
-                    frame_idx = start_frame + i
-                    if frame_idx < total_frames:
-                        wave = np.sin(2 * np.pi * freq * i / sample_rate)
-                        # Apply envelope to each note
-                        note_progress = i / frames_per_note
-                        envelope = min(1.0, 
-                                     note_progress / 0.1,  # Attack
-                                     (1 - note_progress) / 0.1)  # Release
-                        arr[frame_idx][0] = wave * envelope * 0.3
-                        arr[frame_idx][1] = wave * envelope * 0.3
-            
-            sound_array = (arr * 32767).astype(np.int16)
-            sound = pygame.sndarray.make_sound(sound_array)
-            return sound
-        except ImportError:
-            # Fallback if numpy not available
-            return self.create_tone(frequencies[0], total_duration)
+        return self.make_sound(synthesize_arpeggio(frequencies, total_duration, self.sample_rate))
     
     def play_sound(self, sound_name):
         """Play a sound effect."""
@@ -183,10 +249,12 @@ class AudioManager:
     def toggle_mute(self):
         """Toggle mute state."""
         self.muted = not self.muted
-        if self.muted:
-            pygame.mixer.music.set_volume(0)
-        else:
-            pygame.mixer.music.set_volume(self.music_volume)
+        self._apply_music_volume()
+    
+    def _apply_music_volume(self):
+        """Push the music volume to the mixer once it is running."""
+        if self.mixer_ready:
+            pygame.mixer.music.set_volume(0 if self.muted else self.music_volume)
     
     def set_sfx_volume(self, volume):
         """Set sound effects volume (0.0 to 1.0)."""
@@ -195,5 +263,15 @@ class AudioManager:
     def set_music_volume(self, volume):
         """Set music volume (0.0 to 1.0)."""
         self.music_volume = max(0.0, min(1.0, volume))
-        if not self.muted:
-            pygame.mixer.music.set_volume(self.music_volume)
\ No newline at end of file
+        self._apply_music_volume()
+
+class NullAudioManager(AudioManager):
+    """Silent audio backend that never touches pygame.mixer (headless runs, CI, simulations)."""
+    
+    def __init__(self):
+        """Initialize without starting the mixer."""
+        super().__init__(background=False)
+    
+    def start(self):
+        """Skip mixer startup; every sound is dropped."""
+        self.ready.set()
\ No newline at end of file
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Tetris Benchmarks
+Times board, piece, game and rendering hot paths and compares them against a stored baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import timeit
+from board import TetrisBoard
+from pieces import TetrisPiece, PIECE_TYPES, PIECE_COLORS, PIECE_BOUNDS, ROTATION_COUNTS
+from engine import TetrisEngine, NUM_ACTIONS
+
+# Baseline file compared against by default
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# A benchmark regresses when it is this fraction slower than its baseline
+DEFAULT_THRESHOLD = 0.25
+
+# Iterations of the calibration loop every benchmark is measured against
+CALIBRATION_ITERATIONS = 2000
+
+# Seed for every generated board, piece set and game
+BENCH_SEED = 1234
+
+def _make_board(filled_rows=8, seed=BENCH_SEED):
+    """Build a mid-game board: the bottom rows filled except for one or two gaps each."""
+    rng = random.Random(seed)
+    board = TetrisBoard()
+    colors = list(PIECE_COLORS.values())
+    grid = [[None] * board.width for _ in range(board.height)]
+    for y in range(board.height - filled_rows, board.height):
+        gaps = rng.sample(range(board.width), rng.choice((1, 2)))
+        grid[y] = [None if x in gaps else rng.choice(colors) for x in range(board.width)]
+    board.load_grid(grid)
+    return board
+
+def _make_pieces():
+    """Get one piece per type, rotation and in-bounds column, at spawn height."""
+    pieces = []
+    for piece_type in PIECE_TYPES:
+        for rotation in range(ROTATION_COUNTS[piece_type]):
+            min_x, _, max_x, _ = PIECE_BOUNDS[piece_type][rotation]
+            for x in range(-min_x, 10 - max_x):
+                piece = TetrisPiece(piece_type, x, 0)
+                piece.rotation = rotation
+                pieces.append(piece)
+    return pieces
+
+def bench_is_valid_position():
+    """Collision checks of every piece placement at spawn and mid-board heights."""
+    board = _make_board()
+    pieces = _make_pieces()
+    for piece in pieces[::2]:
+        piece.y = 10
+    is_valid_position = board.is_valid_position
+    
+    def run():
+        for piece in pieces:
+            is_valid_position(piece)
+    return run, len(pieces)
+
+def bench_place_piece():
+    """Locking pieces onto a copy of a mid-game board (includes one board copy)."""
+    base = _make_board()
+    pieces = [base.get_ghost_piece(piece) for piece in _make_pieces()[:20]]
+    
+    def run():
+        board = base.copy()
+        for piece in pieces:
+            board.place_piece(piece)
+    return run, len(pieces)
+
+def bench_clear_lines():
+    """Clearing four full rows from a copy of a mid-game board (includes one board copy)."""
+    base = _make_board(12)
+    grid = [list(row) for row in base.grid]
+    for y in range(base.height - 4, base.height):
+        grid[y] = [PIECE_COLORS['I']] * base.width
+    base.load_grid(grid)
+    
+    def run():
+        base.copy().clear_lines()
+    return run, 1
+
+def bench_clear_lines_none():
+    """Scanning a mid-game board that has no full rows."""
+    board = _make_board()
+    
+    def run():
+        board.clear_lines()
+    return run, 1
+
+def bench_board_copy():
+    """Copying a mid-game board (the overhead inside place_piece and clear_lines)."""
+    board = _make_board()
+    
+    def run():
+        board.copy()
+    return run, 1
+
+def bench_ghost_piece():
+    """Finding the landing position of every piece placement from spawn."""
+    board = _make_board()
+    pieces = _make_pieces()
+    get_ghost_piece = board.get_ghost_piece
+    
+    def run():
+        for piece in pieces:
+            get_ghost_piece(piece)
+    return run, len(pieces)
+
+def bench_height_map():
+    """Column heights of a mid-game board."""
+    board = _make_board()
+    
+    def run():
+        board.get_height_map()
+    return run, 1
+
+def bench_holes_count():
+    """Hole count of a mid-game board."""
+    board = _make_board()
+    
+    def run():
+        board.get_holes_count()
+    return run, 1
+
+def bench_piece_blocks():
+    """Absolute block positions of every piece placement."""
+    pieces = _make_pieces()
+    
+    def run():
+        for piece in pieces:
+            piece.get_blocks()
+    return run, len(pieces)
+
+def bench_piece_rotation():
+    """Clockwise and counterclockwise rotation of one piece of each type."""
+    pieces = [TetrisPiece(piece_type) for piece_type in PIECE_TYPES]
+    
+    def run():
+        for piece in pieces:
+            piece.rotate_clockwise()
+            piece.rotate_counterclockwise()
+    return run, 2 * len(pieces)
+
+def bench_game_random():
+    """A seeded headless game of random inputs, played until it tops out (per engine step)."""
+    rng = random.Random(BENCH_SEED)
+    actions = [rng.randrange(NUM_ACTIONS) for _ in range(5000)]
+    engine = TetrisEngine(seed=BENCH_SEED)
+    step = engine.step
+    steps = [0]
+    
+    def run():
+        engine.reset(BENCH_SEED)
+        for i, action in enumerate(actions):
+            step(action, 16)
+            if engine.game_over:
+                steps[0] = i + 1
+                break
+        else:
+            steps[0] = len(actions)
+    
+    run()
+    return run, steps[0]
+
+def bench_game_bot():
+    """A seeded headless bot game of 30 pieces (per piece)."""
+    from bot import BeamSearchBot
+    pieces = 30
+    
+    def run():
+        engine = TetrisEngine(seed=BENCH_SEED)
+        bot = BeamSearchBot(depth=1, beam_width=4)
+        while not engine.game_over and engine.pieces_placed < pieces:
+            placement = bot.choose(engine)
+            if placement is None:
+                break
+            for action in placement.get_path():
+                engine.step(action)
+    return run, pieces
+
+def bench_env_step():
+    """A seeded environment episode of random inputs, with observations (per step)."""
+    from env import TetrisEnv
+    rng = random.Random(BENCH_SEED)
+    actions = [rng.randrange(NUM_ACTIONS) for _ in range(5000)]
+    env = TetrisEnv(seed=BENCH_SEED)
+    step = env.step
+    steps = [0]
+    
+    def run():
+        env.reset(BENCH_SEED)
+        for i, action in enumerate(actions):
+            if step(action)[2]:
+                steps[0] = i + 1
+                break
+        else:
+            steps[0] = len(actions)
+    
+    run()
+    return run, steps[0]
+
+def _make_game(dirty_rendering=False):
+    """Create a silent game in progress on an offscreen display."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    from tetris import TetrisGame, GAME_STATE_PLAYING
+    game = TetrisGame(seed=BENCH_SEED, audio=False, dirty_rendering=dirty_rendering)
+    game.state = GAME_STATE_PLAYING
+    game.board.load_grid(_make_board().grid)
+    return game
+
+def bench_render_full():
+    """A full frame: grid, board, ghost, piece and HUD."""
+    game = _make_game()
+    draw = game.draw
+    draw()
+    return draw, 1
+
+def bench_render_dirty():
+    """A dirty-region frame where the falling piece moved one column."""
+    game = _make_game(dirty_rendering=True)
+    piece = game.current_piece
+    draw = game.draw
+    draw()
+    
+    def run():
+        piece.x ^= 1
+        draw()
+    return run, 1
+
+# Benchmarks by name, in report order
+BENCHMARKS = {
+    'board.is_valid_position': bench_is_valid_position,
+    'board.place_piece': bench_place_piece,
+    'board.clear_lines': bench_clear_lines,
+    'board.clear_lines_none': bench_clear_lines_none,
+    'board.copy': bench_board_copy,
+    'board.get_ghost_piece': bench_ghost_piece,
+    'board.get_height_map': bench_height_map,
+    'board.get_holes_count': bench_holes_count,
+    'piece.get_blocks': bench_piece_blocks,
+    'piece.rotate': bench_piece_rotation,
+    'game.random': bench_game_random,
+    'game.bot': bench_game_bot,
+    'env.step': bench_env_step,
+    'render.full_frame': bench_render_full,
+    'render.dirty_frame': bench_render_dirty,
+}
+
+def _calibration_loop():
+    """A fixed pure-Python workload (indexing, arithmetic, dict lookups, calls) to time against."""
+    table = {i: i * 3 for i in range(64)}
+    cells = bytearray(200)
+    total = 0
+    for i in range(CALIBRATION_ITERATIONS):
+        x, y = i % 10, i % 20
+        if not cells[y * 10 + x]:
+            total += table[i & 63]
+        total += len((x, y))
+    return total
+
+def _loop_count(timer, min_time):
+    """Get how many calls of a timer's callable take at least min_time."""
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1 << 20:
+            return number
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.1))
+
+def run_benchmark(name, repeat=15, min_time=0.02):
+    """Time one benchmark, returning its cost per operation in microseconds and calibration units."""
+    run, ops = BENCHMARKS[name]()
+    timer = timeit.Timer(run)
+    calibration = timeit.Timer(_calibration_loop)
+    number = _loop_count(timer, min_time)
+    calibration_number = _loop_count(calibration, min_time)
+    
+    # Each round times the benchmark and then the calibration loop back to
+    # back, so their ratio cancels out the machine's speed and its load at
+    # that moment; the median ratio is what baselines compare
+    times = []
+    calibration_times = []
+    ratios = []
+    for _ in range(repeat):
+        times.append(timer.timeit(number) / number / ops)
+        calibration_times.append(calibration.timeit(calibration_number) / calibration_number)
+        ratios.append(times[-1] / calibration_times[-1])
+    
+    return {
+        'us_per_op': min(times) * 1e6,
+        'median_us_per_op': statistics.median(times) * 1e6,
+        'relative': statistics.median(ratios),
+        'calibration_us': statistics.median(calibration_times) * 1e6,
+        'ops': ops,
+        'loops': number,
+        'repeat': repeat,
+    }
+
+def _make_report(results):
+    """Wrap benchmark results with the environment they were measured in."""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+
+def run_benchmarks(names=None, repeat=15, min_time=0.02):
+    """Run benchmarks (all by default), returning a machine-readable report."""
+    return _make_report({name: run_benchmark(name, repeat, min_time)
+                         for name in (BENCHMARKS if names is None else names)})
+
+def make_baseline(report):
+    """Reduce a report to a baseline: calibration-relative costs only, no absolute timings."""
+    baseline = {key: value for key, value in report.items() if key != 'results'}
+    baseline['results'] = {name: {'relative': result['relative'], 'ops': result['ops']}
+                           for name, result in report['results'].items()}
+    return baseline
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """Compare a report to a baseline, returning {name: current/baseline ratio} and regressions."""
+    # Costs are compared in calibration units; entries without one (from an
+    # older absolute-time baseline) are skipped until it is re-recorded
+    ratios = {}
+    regressions = []
+    for name, result in report['results'].items():
+        expected = baseline.get('results', {}).get(name)
+        if expected is None or 'relative' not in expected:
+            continue
+        ratio = result['relative'] / expected['relative']
+        ratios[name] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return ratios, regressions
+
+def load_report(path):
+    """Read a benchmark report (or baseline) from a JSON file."""
+    with open(path) as f:
+        return json.load(f)
+
+def save_report(report, path):
+    """Write a benchmark report (or baseline) as JSON."""
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Benchmark Tetris hot paths against a baseline")
+    parser.add_argument('--filter', type=str, help="only run benchmarks whose name contains this")
+    parser.add_argument('--list', action='store_true', help="list benchmarks and exit")
+    parser.add_argument('--quick', action='store_true', help="fewer, shorter repeats (noisier)")
+    parser.add_argument('--baseline', type=str, default=BASELINE_PATH, help="baseline JSON to compare with")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown, relative to the calibration loop, before a benchmark "
+                        "counts as a regression (0.25 = 25%%)")
+    parser.add_argument('--save-baseline', action='store_true', help="write the results as the new baseline")
+    parser.add_argument('--output', type=str, help="write the results as JSON")
+    return parser.parse_args()
+
+def main():
+    """Run benchmarks from the command line."""
+    args = parse_args()
+    
+    names = [name for name in BENCHMARKS if not args.filter or args.filter in name]
+    if args.list:
+        for name in names:
+            print(f"{name:<26} {BENCHMARKS[name].__doc__}")
+        return 0
+    
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        baseline = load_report(args.baseline)
+    
+    repeat, min_time = (7, 0.01) if args.quick else (15, 0.02)
+    print(f"⏱️  Running {len(names)} benchmarks (Python {platform.python_version()})")
+    results = {}
+    for name in names:
+        results[name] = result = run_benchmark(name, repeat, min_time)
+        line = f"  {name:<26} {result['us_per_op']:>11.2f} us/op {result['relative']:>10.4g} cal"
+        expected = baseline['results'].get(name, {}) if baseline is not None else {}
+        if 'relative' in expected:
+            ratio = result['relative'] / expected['relative']
+            marker = "❌" if ratio > 1 + args.threshold else "  "
+            line += f"  {ratio:>5.2f}x baseline {marker}"
+        print(line)
+    report = _make_report(results)
+    
+    if args.output:
+        save_report(report, args.output)
+    if args.save_baseline:
+        save_report(make_baseline(report), args.baseline)
+        print(f"💾 Baseline written to {args.baseline}")
+        return 0
+    if baseline is None:
+        return 0
+    
+    ratios, regressions = compare(report, baseline, args.threshold)
+    print("=" * 50)
+    if not ratios:
+        print(f"⚠️  {os.path.basename(args.baseline)} has no comparable results; re-record it with --save-baseline")
+        return 0
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"✅ No regressions over {args.threshold:.0%} against {os.path.basename(args.baseline)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,358 @@
+"""
+Tetris Bitboard
+Row-bitmask board backend with the same interface as TetrisBoard
+"""
+
+from pieces import (PIECE_BLOCKS, PIECE_ROW_MASKS, PIECE_BOUNDS, PIECE_BOTTOMS, PIECE_COLORS,
+                    CODE_COLORS, COLOR_CODES, BLOCK_CODE, BLOCK_COLOR)
+from zobrist import get_keys
+
+class BitBoard:
+    """Tetris board storing each row as an integer bitmask."""
+    
+    def __init__(self, width=10, height=20, track_colors=True):
+        """Initialize the game board."""
+        # Bit x of rows[y] is set when cell (x, y) is occupied. The color
+        # layer is only kept when rendering needs it (track_colors=True).
+        self.width = width
+        self.height = height
+        self.full_mask = (1 << width) - 1
+        self.track_colors = track_colors
+        self.rows = [0] * height
+        self.colors = [[None] * width for _ in range(height)] if track_colors else None
+        
+        # Zobrist hash of the occupied cells, updated incrementally
+        self.zobrist = get_keys(width, height)
+        self.hash = 0
+        
+        # Bumped on every change; column tops and the ghost piece are cached against it
+        self.version = 0
+        self._tops = None
+        self._tops_version = -1
+        self._ghost = None
+        self._ghost_key = None
+    
+    @classmethod
+    def from_board(cls, board, track_colors=True):
+        """Create a bitboard from a TetrisBoard or another BitBoard."""
+        new_board = cls(board.width, board.height, track_colors)
+        new_board.rows = board.get_row_masks()
+        new_board.hash = getattr(board, 'hash', None)
+        if new_board.hash is None:
+            new_board.compute_hash()
+        if track_colors:
+            new_board.colors = [list(row) for row in board.grid]
+        return new_board
+    
+    @property
+    def grid(self):
+        """Get the color grid used for rendering."""
+        if self.colors is not None:
+            return self.colors
+        
+        # No color layer: expose occupancy with a neutral color
+        grid = []
+        for mask in self.rows:
+            grid.append([BLOCK_COLOR if mask >> x & 1 else None
+                         for x in range(self.width)])
+        return grid
+    
+    def is_valid_position(self, piece):
+        """Check if a piece can be placed at its current position."""
+        min_x, _, max_x, _ = PIECE_BOUNDS[piece.type][piece.rotation]
+        x = piece.x + min_x
+        
+        # Check side boundaries
+        if x < 0 or piece.x + max_x >= self.width:
+            return False
+        
+        rows = self.rows
+        for dy, mask in PIECE_ROW_MASKS[piece.type][piece.rotation]:
+            y = piece.y + dy
+            if y >= self.height:
+                return False
+            # Allow negative y for spawn area
+            if y >= 0 and rows[y] & (mask << x):
+                return False
+        
+        return True
+    
+    def place_piece(self, piece):
+        """Place a piece on the board permanently."""
+        x = piece.x + PIECE_BOUNDS[piece.type][piece.rotation][0]
+        rows = self.rows
+        
+        # Keep cached column tops current; placing can only raise them
+        tops = self._tops if self._tops_version == self.version else None
+        if tops is not None:
+            for dx, dy in PIECE_BLOCKS[piece.type][piece.rotation]:
+                col, row = piece.x + dx, piece.y + dy
+                if 0 <= col < self.width and 0 <= row < tops[col]:
+                    tops[col] = row
+        
+        for dy, mask in PIECE_ROW_MASKS[piece.type][piece.rotation]:
+            y = piece.y + dy
+            if 0 <= y < self.height:
+                if x >= 0:
+                    bits = (mask << x) & self.full_mask
+                else:
+                    bits = mask >> -x
+                old = rows[y]
+                rows[y] = old | bits
+                self.hash ^= self.zobrist.row_hash(y, old) ^ self.zobrist.row_hash(y, old | bits)
+                
+                if self.colors is not None:
+                    row_colors = self.colors[y]
+                    while bits:
+                        low = bits & -bits
+                        row_colors[low.bit_length() - 1] = piece.color
+                        bits ^= low
+        
+        self.version += 1
+        if tops is not None:
+            self._tops_version = self.version
+    
+    def clear_lines(self):
+        """Clear completed lines and return the number cleared."""
+        full = self.full_mask
+        rows = self.rows
+        if full not in rows:
+            return 0
+        
+        kept = [i for i, mask in enumerate(rows) if mask != full]
+        lines_cleared = self.height - len(kept)
+        self.rows = [0] * lines_cleared + [rows[i] for i in kept]
+        self._rehash_rows(rows, len(rows) - 1 - rows[::-1].index(full))
+        
+        if self.colors is not None:
+            colors = self.colors
+            self.colors = ([[None] * self.width for _ in range(lines_cleared)] +
+                           [colors[i] for i in kept])
+        
+        self.version += 1
+        return lines_cleared
+    
+    def _rehash_rows(self, old_rows, lowest):
+        """Update the hash for rows 0..lowest after they changed from old_rows."""
+        row_hash = self.zobrist.row_hash
+        rows = self.rows
+        for y in range(lowest + 1):
+            self.hash ^= row_hash(y, old_rows[y]) ^ row_hash(y, rows[y])
+    
+    def place_and_clear(self, piece_type, rotation, x, y):
+        """Lock a piece and clear lines in place, returning an undo record."""
+        # The record is (placed, cleared, cleared_colors, lines_cleared, hash)
+        # where placed lists (row, bits) set by the piece and cleared lists
+        # the indices of the removed rows in ascending order.
+        shift = x + PIECE_BOUNDS[piece_type][rotation][0]
+        rows = self.rows
+        full = self.full_mask
+        colors = self.colors
+        row_hash = self.zobrist.row_hash
+        previous_hash = self.hash
+        placed = []
+        
+        for dy, mask in PIECE_ROW_MASKS[piece_type][rotation]:
+            row = y + dy
+            if 0 <= row < self.height:
+                bits = (mask << shift) & full if shift >= 0 else mask >> -shift
+                old = rows[row]
+                rows[row] = old | bits
+                self.hash ^= row_hash(row, old) ^ row_hash(row, old | bits)
+                placed.append((row, bits))
+                
+                if colors is not None:
+                    row_colors = colors[row]
+                    color = PIECE_COLORS[piece_type]
+                    while bits:
+                        low = bits & -bits
+                        row_colors[low.bit_length() - 1] = color
+                        bits ^= low
+        
+        # Only rows the piece touched can have become full
+        cleared = sorted(row for row, _ in placed if rows[row] == full)
+        cleared_colors = None
+        if cleared:
+            old_rows = rows[:cleared[-1] + 1]
+            for row in reversed(cleared):
+                del rows[row]
+            rows[0:0] = [0] * len(cleared)
+            self._rehash_rows(old_rows, cleared[-1])
+            
+            if colors is not None:
+                cleared_colors = [colors[row] for row in cleared]
+                for row in reversed(cleared):
+                    del colors[row]
+                colors[0:0] = [[None] * self.width for _ in cleared]
+        
+        self.version += 1
+        return (placed, cleared, cleared_colors, len(cleared), previous_hash)
+    
+    def undo(self, record):
+        """Revert a place_and_clear using its undo record."""
+        placed, cleared, cleared_colors, lines_cleared, previous_hash = record
+        self.hash = previous_hash
+        self.version += 1
+        rows = self.rows
+        colors = self.colors
+        
+        if lines_cleared:
+            del rows[:lines_cleared]
+            for row in cleared:
+                rows.insert(row, self.full_mask)
+            
+            if colors is not None:
+                del colors[:lines_cleared]
+                for row, row_colors in zip(cleared, cleared_colors):
+                    colors.insert(row, row_colors)
+        
+        for row, bits in placed:
+            rows[row] ^= bits
+            
+            if colors is not None:
+                row_colors = colors[row]
+                while bits:
+                    low = bits & -bits
+                    row_colors[low.bit_length() - 1] = None
+                    bits ^= low
+    
+    def is_game_over(self):
+        """Check if the game is over (blocks reached the top)."""
+        return any(self.rows[:min(4, self.height)])
+    
+    def get_column_tops(self):
+        """Get the row of the highest filled cell in each column (height when empty)."""
+        if self._tops_version != self.version:
+            tops = [self.height] * self.width
+            seen = 0
+            for row, mask in enumerate(self.rows):
+                new_bits = mask & ~seen
+                if new_bits:
+                    seen |= new_bits
+                    while new_bits:
+                        low = new_bits & -new_bits
+                        tops[low.bit_length() - 1] = row
+                        new_bits ^= low
+                    if seen == self.full_mask:
+                        break
+            self._tops = tops
+            self._tops_version = self.version
+        return self._tops
+    
+    def drop_distance(self, piece):
+        """Get how many rows a piece in a valid position can fall before it lands."""
+        tops = self.get_column_tops()
+        rows = self.rows
+        px, py = piece.x, piece.y
+        distance = self.height
+        
+        for dx, dy in PIECE_BOTTOMS[piece.type][piece.rotation]:
+            x, y = px + dx, py + dy
+            floor = tops[x]
+            if floor <= y:
+                # Tucked under an overhang: find the first filled cell below
+                floor = y + 1
+                while floor < self.height and not rows[floor] >> x & 1:
+                    floor += 1
+            if floor - y - 1 < distance:
+                distance = floor - y - 1
+        
+        return max(distance, 0)
+    
+    def get_ghost_piece(self, piece):
+        """Get the ghost piece position (where the piece would land)."""
+        # Cached until the piece or the board changes; callers must not modify it
+        key = (self.version, piece.type, piece.rotation, piece.x, piece.y)
+        if key != self._ghost_key:
+            ghost_piece = piece.copy()
+            ghost_piece.y += self.drop_distance(piece)
+            self._ghost = ghost_piece
+            self._ghost_key = key
+        return self._ghost
+    
+    def get_height_map(self):
+        """Get the height of each column (for AI or difficulty calculation)."""
+        heights = [0] * self.width
+        seen = 0
+        
+        for row, mask in enumerate(self.rows):
+            new_bits = mask & ~seen
+            if new_bits:
+                seen |= new_bits
+                while new_bits:
+                    low = new_bits & -new_bits
+                    heights[low.bit_length() - 1] = self.height - row
+                    new_bits ^= low
+                if seen == self.full_mask:
+                    break
+        
+        return heights
+    
+    def get_holes_count(self):
+        """Count the number of holes in the board."""
+        holes = 0
+        covered = 0
+        
+        for mask in self.rows:
+            holes += bin(covered & ~mask).count('1')
+            covered |= mask
+        
+        return holes
+    
+    def get_row_masks(self):
+        """Get each row as an integer bitmask (bit x set when column x is filled)."""
+        return self.rows[:]
+    
+    def compute_hash(self):
+        """Recompute the Zobrist hash from scratch (after editing rows directly)."""
+        self.hash = self.zobrist.board_hash(self.rows)
+        self.version += 1
+        return self.hash
+    
+    def get_cells(self):
+        """Get the cell codes as bytes, row by row, in TetrisBoard's format."""
+        if self.colors is None:
+            return bytes(BLOCK_CODE if mask >> x & 1 else 0
+                         for mask in self.rows for x in range(self.width))
+        return bytes(0 if color is None else COLOR_CODES.get(tuple(color), BLOCK_CODE)
+                     for row in self.colors for color in row)
+    
+    def load_cells(self, cells):
+        """Replace the board contents with cell codes from get_cells."""
+        width = self.width
+        self.load_grid([[CODE_COLORS[code] for code in cells[start:start + width]]
+                        for start in range(0, len(cells), width)])
+    
+    def load_grid(self, grid):
+        """Replace the board contents with a grid of colors (None for empty)."""
+        self.rows = [sum(1 << x for x, color in enumerate(row) if color is not None)
+                     for row in grid]
+        if self.track_colors:
+            self.colors = [list(row) for row in grid]
+        self.compute_hash()
+    
+    def clear(self):
+        """Clear the entire board."""
+        self.rows = [0] * self.height
+        self.hash = 0
+        self.version += 1
+        if self.track_colors:
+            self.colors = [[None] * self.width for _ in range(self.height)]
+    
+    def copy(self):
+        """Create a copy of the board."""
+        new_board = BitBoard.__new__(BitBoard)
+        new_board.width = self.width
+        new_board.height = self.height
+        new_board.full_mask = self.full_mask
+        new_board.track_colors = self.track_colors
+        new_board.rows = self.rows[:]
+        new_board.colors = [row[:] for row in self.colors] if self.colors is not None else None
+        new_board.zobrist = self.zobrist
+        new_board.hash = self.hash
+        new_board.version = 0
+        new_board._tops = None
+        new_board._tops_version = -1
+        new_board._ghost = None
+        new_board._ghost_key = None
+        return new_board
\ No newline at end of file
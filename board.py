@@ -3,6 +3,17 @@ Tetris Game Board
 Handles the game grid, collision detection, line clearing, and board state
 """
 
+from pieces import PIECE_BLOCKS, PIECE_BOTTOMS, PIECE_CODES, CODE_COLORS, COLOR_CODES, BLOCK_CODE
+from zobrist import get_keys
+
+def _row_mask(row):
+    """Get a row of cell codes as an integer bitmask."""
+    mask = 0
+    for col, cell in enumerate(row):
+        if cell:
+            mask |= 1 << col
+    return mask
+
 class TetrisBoard:
     """Manages the Tetris game board and its operations."""
     
@@ -10,103 +21,297 @@ class TetrisBoard:
         """Initialize the game board."""
         self.width = width
         self.height = height
-        self.grid = [[None for _ in range(width)] for _ in range(height)]
         
+        # One byte per cell, row by row: 0 when empty, otherwise the piece code
+        # (see pieces.PIECE_CODES). Colors are looked up only when rendering.
+        self.cells = bytearray(width * height)
+        
+        # Zobrist hash of the occupied cells and each row's occupancy bitmask,
+        # both updated incrementally
+        self.zobrist = get_keys(width, height)
+        self.hash = 0
+        self.row_masks = [0] * height
+        
+        # Surface and fill statistics, updated incrementally: the row of the
+        # highest filled cell per column (height when empty), filled cells per
+        # column and per row, and the number of holes
+        self.tops = [height] * width
+        self.column_counts = [0] * width
+        self.row_counts = [0] * height
+        self.holes = 0
+        
+        # Rows changed since the last clear_lines; only these can have become full
+        self._dirty_rows = set()
+        
+        # Bumped on every change; the ghost piece is cached against it
+        self.version = 0
+        self._ghost = None
+        self._ghost_key = None
+    
     def is_valid_position(self, piece):
         """Check if a piece can be placed at its current position."""
-        blocks = piece.get_blocks()
+        px, py = piece.x, piece.y
+        width = self.width
         
-        for x, y in blocks:
+        for dx, dy in PIECE_BLOCKS[piece.type][piece.rotation]:
+            x, y = px + dx, py + dy
+            
             # Check boundaries
-            if x < 0 or x >= self.width or y >= self.height:
+            if x < 0 or x >= width or y >= self.height:
                 return False
             
             # Check collision with existing blocks (but allow negative y for spawn area)
-            if y >= 0 and self.grid[y][x] is not None:
+            if y >= 0 and self.cells[y * width + x]:
                 return False
         
         return True
     
     def place_piece(self, piece):
         """Place a piece on the board permanently."""
-        blocks = piece.get_blocks()
+        px, py = piece.x, piece.y
+        width = self.width
+        cells = self.cells
+        code = PIECE_CODES[piece.type]
+        tops = self.tops
+        
+        for dx, dy in PIECE_BLOCKS[piece.type][piece.rotation]:
+            x, y = px + dx, py + dy
+            if 0 <= y < self.height and 0 <= x < width:
+                index = y * width + x
+                if not cells[index]:
+                    self.hash ^= self.zobrist.cells[y][x]
+                    self.row_masks[y] |= 1 << x
+                    self.column_counts[x] += 1
+                    self.row_counts[y] += 1
+                    self._dirty_rows.add(y)
+                    
+                    if y < tops[x]:
+                        # Covers the empty cells between the old top and this block
+                        self.holes += tops[x] - y - 1
+                        tops[x] = y
+                    else:
+                        # Fills a hole under an overhang
+                        self.holes -= 1
+                cells[index] = code
         
-        for x, y in blocks:
-            if 0 <= y < self.height and 0 <= x < self.width:
-                self.grid[y][x] = piece.color
+        self.version += 1
     
     def clear_lines(self):
         """Clear completed lines and return the number cleared."""
-        lines_cleared = 0
-        new_grid = []
+        # Only rows changed since the last clear can be full
+        row_counts = self.row_counts
+        cleared = sorted(y for y in self._dirty_rows if row_counts[y] == self.width)
+        self._dirty_rows.clear()
         
-        # Check each row from bottom to top
-        for row in self.grid:
-            if None in row:  # Row is not complete
-                new_grid.append(row)
-            else:  # Row is complete
-                lines_cleared += 1
+        lines_cleared = len(cleared)
+        if lines_cleared == 0:
+            return 0
         
-        # Add empty rows at the top
-        while len(new_grid) < self.height:
-            new_grid.insert(0, [None for _ in range(self.width)])
+        # Only rows from the stack top down to the lowest cleared row move;
+        # rows above are empty and rows below keep their position and hash
+        width = self.width
+        cells = self.cells
+        masks = self.row_masks
+        stack_top = min(self.tops)
+        lowest = cleared[-1]
+        old_masks = masks[stack_top:lowest + 1]
         
-        self.grid = new_grid
+        # Shift the kept rows down under lines_cleared empty rows, one slice per
+        # run of kept rows, in place so exported views stay live
+        new_top = stack_top + lines_cleared
+        chunks = [bytes(lines_cleared * width)]
+        start = stack_top
+        for y in cleared:
+            chunks.append(cells[start * width:y * width])
+            start = y + 1
+        chunks.append(cells[start * width:(lowest + 1) * width])
+        cells[stack_top * width:(lowest + 1) * width] = b''.join(chunks)
+        
+        for y in reversed(cleared):
+            del masks[y]
+            del row_counts[y]
+        masks[stack_top:stack_top] = [0] * lines_cleared
+        row_counts[stack_top:stack_top] = [0] * lines_cleared
+        
+        # Rehash only the rows whose occupancy changed
+        row_hash = self.zobrist.row_hash
+        hash_value = self.hash
+        for y, old_mask in enumerate(old_masks, stack_top):
+            new_mask = masks[y]
+            if old_mask != new_mask:
+                hash_value ^= row_hash(y, old_mask) ^ row_hash(y, new_mask)
+        self.hash = hash_value
+        
+        # New tops are the first filled row per column, found from the row masks
+        # starting where the shifted stack begins
+        height = self.height
+        tops = [height] * width
+        open_columns = (1 << width) - 1
+        for y in range(new_top, height):
+            found = masks[y] & open_columns
+            if found:
+                open_columns ^= found
+                while found:
+                    low = found & -found
+                    tops[low.bit_length() - 1] = y
+                    found ^= low
+                if not open_columns:
+                    break
+        self.tops = tops
+        
+        column_counts = self.column_counts
+        holes = 0
+        for x in range(width):
+            column_counts[x] -= lines_cleared
+            holes += height - tops[x] - column_counts[x]
+        self.holes = holes
+        
+        self.version += 1
         return lines_cleared
     
     def is_game_over(self):
         """Check if the game is over (blocks reached the top)."""
-        # Check the top few rows for any blocks
-        for row in range(min(4, self.height)):
-            for col in range(self.width):
-                if self.grid[row][col] is not None:
-                    return True
-        return False
+        # Any block in the top few rows
+        return min(self.tops) < min(4, self.height)
     
-    def get_ghost_piece(self, piece):
-        """Get the ghost piece position (where the piece would land)."""
-        ghost_piece = piece.copy()
+    def get_column_tops(self):
+        """Get the row of the highest filled cell in each column (height when empty)."""
+        return self.tops
+    
+    def drop_distance(self, piece):
+        """Get how many rows a piece in a valid position can fall before it lands."""
+        tops = self.get_column_tops()
+        px, py = piece.x, piece.y
+        distance = self.height
         
-        # Move the ghost piece down until it can't move anymore
-        while self.is_valid_position(ghost_piece):
-            ghost_piece.move(0, 1)
+        for dx, dy in PIECE_BOTTOMS[piece.type][piece.rotation]:
+            x, y = px + dx, py + dy
+            floor = tops[x]
+            if floor <= y:
+                # Tucked under an overhang: find the first filled cell below
+                floor = y + 1
+                while floor < self.height and not self.cells[floor * self.width + x]:
+                    floor += 1
+            if floor - y - 1 < distance:
+                distance = floor - y - 1
         
-        # Move back one step to get the last valid position
-        ghost_piece.move(0, -1)
-        return ghost_piece
+        return max(distance, 0)
+    
+    def get_ghost_piece(self, piece):
+        """Get the ghost piece position (where the piece would land)."""
+        # Cached until the piece or the board changes; callers must not modify it
+        key = (self.version, piece.type, piece.rotation, piece.x, piece.y)
+        if key != self._ghost_key:
+            ghost_piece = piece.copy()
+            ghost_piece.y += self.drop_distance(piece)
+            self._ghost = ghost_piece
+            self._ghost_key = key
+        return self._ghost
     
     def get_height_map(self):
         """Get the height of each column (for AI or difficulty calculation)."""
-        heights = [0] * self.width
-        
-        for col in range(self.width):
-            for row in range(self.height):
-                if self.grid[row][col] is not None:
-                    heights[col] = self.height - row
-                    break
-        
-        return heights
+        height = self.height
+        return [height - top for top in self.tops]
     
     def get_holes_count(self):
         """Count the number of holes in the board."""
-        holes = 0
+        return self.holes
+    
+    def get_row_masks(self):
+        """Get each row as an integer bitmask (bit x set when column x is filled)."""
+        return self.row_masks[:]
+    
+    @property
+    def grid(self):
+        """Get a read-only color grid (None for empty) built from the cell codes."""
+        # Rows are tuples so writes through the old grid attribute fail loudly
+        # instead of editing a copy; write with load_grid, load_cells or cells
+        colors = tuple(CODE_COLORS[code] for code in self.cells)
+        width = self.width
+        return tuple(colors[start:start + width] for start in range(0, len(colors), width))
+    
+    def get_cells(self):
+        """Get the cell codes as immutable bytes, row by row."""
+        return bytes(self.cells)
+    
+    def get_cells_view(self):
+        """Get a zero-copy (height, width) memoryview of the cell codes."""
+        # Every change is made in place, so the view stays current for the board's life
+        return memoryview(self.cells).cast('B', (self.height, self.width))
+    
+    def to_numpy(self):
+        """Get a zero-copy (height, width) uint8 NumPy array of the cell codes."""
+        import numpy as np
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.height, self.width)
+    
+    def _rebuild_stats(self):
+        """Recompute the row masks and the surface and fill statistics from the cells."""
+        cells = self.cells
+        width = self.width
+        self.row_masks = [_row_mask(cells[start:start + width]) for start in range(0, len(cells), width)]
+        self.tops = [self.height] * width
+        self.column_counts = [0] * width
+        self.row_counts = [width - cells.count(0, start, start + width)
+                           for start in range(0, len(cells), width)]
+        self.holes = 0
         
-        for col in range(self.width):
-            block_found = False
+        for col in range(width):
             for row in range(self.height):
-                if self.grid[row][col] is not None:
-                    block_found = True
-                elif block_found and self.grid[row][col] is None:
-                    holes += 1
+                if cells[row * width + col]:
+                    if self.column_counts[col] == 0:
+                        self.tops[col] = row
+                    self.column_counts[col] += 1
+                elif self.column_counts[col]:
+                    self.holes += 1
         
-        return holes
+        self._dirty_rows = set(range(self.height))
+    
+    def compute_hash(self):
+        """Recompute the Zobrist hash and board statistics from scratch (after editing cells directly)."""
+        self._rebuild_stats()
+        self.hash = self.zobrist.board_hash(self.row_masks)
+        self.version += 1
+        return self.hash
+    
+    def load_grid(self, grid):
+        """Replace the board contents with a grid of colors (None for empty)."""
+        # Colors that belong to no piece load as generic blocks
+        self.cells[:] = bytes(0 if color is None else COLOR_CODES.get(tuple(color), BLOCK_CODE)
+                              for row in grid for color in row)
+        self.compute_hash()
+    
+    def load_cells(self, cells):
+        """Replace the board contents with cell codes from get_cells."""
+        self.cells[:] = cells
+        self.compute_hash()
     
     def clear(self):
         """Clear the entire board."""
-        self.grid = [[None for _ in range(self.width)] for _ in range(self.height)]
+        self.cells[:] = bytes(self.width * self.height)
+        self.hash = 0
+        self.row_masks = [0] * self.height
+        self.tops = [self.height] * self.width
+        self.column_counts = [0] * self.width
+        self.row_counts = [0] * self.height
+        self.holes = 0
+        self._dirty_rows = set()
+        self.version += 1
     
     def copy(self):
         """Create a copy of the board."""
-        new_board = TetrisBoard(self.width, self.height)
-        new_board.grid = [row[:] for row in self.grid]
+        new_board = TetrisBoard.__new__(TetrisBoard)
+        new_board.width = self.width
+        new_board.height = self.height
+        new_board.cells = self.cells[:]
+        new_board.zobrist = self.zobrist
+        new_board.hash = self.hash
+        new_board.row_masks = self.row_masks[:]
+        new_board.tops = self.tops[:]
+        new_board.column_counts = self.column_counts[:]
+        new_board.row_counts = self.row_counts[:]
+        new_board.holes = self.holes
+        new_board._dirty_rows = set(self._dirty_rows)
+        new_board.version = 0
+        new_board._ghost = None
+        new_board._ghost_key = None
         return new_board
\ No newline at end of file
@@ -0,0 +1,183 @@
+"""
+Tetris Bot
+Beam-search autoplayer using in-place make/unmake moves on a bitboard
+"""
+
+import time
+from bitboard import BitBoard
+from features import extract_features_from_masks
+from movegen import MoveGenerator, Placement
+from zobrist import TranspositionTable
+
+# Heuristic weights; 'lines' rewards lines cleared along the searched path
+DEFAULT_WEIGHTS = {
+    'aggregate_height': -0.51,
+    'lines': 0.76,
+    'holes': -0.36,
+    'bumpiness': -0.18,
+    'wells': -0.05,
+    'hole_depth': -0.05,
+}
+
+# Penalty for leaving the stack in the rows new pieces spawn into
+TOP_OUT_PENALTY = -1000.0
+SPAWN_DANGER_ROWS = 2
+
+class BeamSearchBot:
+    """Chooses placements by beam search over the current, next and hold pieces."""
+    
+    def __init__(self, weights=None, depth=2, beam_width=6, use_hold=True,
+                 table_size=200000, placement_table_size=4096):
+        """Initialize the bot."""
+        self.weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+        self.depth = depth
+        self.beam_width = beam_width
+        self.use_hold = use_hold
+        
+        # Memoized board scores and placement lists, keyed by Zobrist hash
+        self.table = TranspositionTable(table_size)
+        self.placement_table = TranspositionTable(placement_table_size)
+        
+        # Search statistics
+        self.nodes = 0
+        self.search_time = 0.0
+    
+    @property
+    def nodes_per_second(self):
+        """Get the average number of evaluated nodes per second of search."""
+        return self.nodes / self.search_time if self.search_time else 0.0
+    
+    def evaluate(self, board, lines):
+        """Score a board plus the lines cleared on the way to it."""
+        score = self.table.get(board.hash)
+        if score is None:
+            score = self._board_score(board)
+            self.table.store(board.hash, score)
+        
+        if score <= TOP_OUT_PENALTY:
+            return TOP_OUT_PENALTY
+        return score + self.weights.get('lines', 0.0) * lines
+    
+    def _board_score(self, board):
+        """Score a board's features with the heuristic weights."""
+        rows = board.rows
+        if any(rows[:SPAWN_DANGER_ROWS]):
+            return TOP_OUT_PENALTY
+        
+        features = extract_features_from_masks(rows, board.width)
+        score = 0.0
+        for name, weight in self.weights.items():
+            if name != 'lines':
+                score += weight * features[name]
+        return score
+    
+    def choose(self, engine):
+        """Pick the best placement for the engine's current piece, or None if there is none."""
+        start_time = time.perf_counter()
+        
+        board = BitBoard.from_board(engine.board, track_colors=False)
+        queue = [engine.current_piece.type] + self._preview_types(engine)
+        hold_type = engine.hold_piece.type if engine.hold_piece else None
+        piece = engine.current_piece
+        start = (piece.rotation, piece.x, piece.y)
+        
+        best_value = None
+        best_placement = None
+        for value, placement in self._search(board, queue, 0, hold_type,
+                                             engine.can_hold, self.depth, start):
+            if best_value is None or value > best_value:
+                best_value = value
+                best_placement = placement
+        
+        self.search_time += time.perf_counter() - start_time
+        return best_placement
+    
+    def _preview_types(self, engine):
+        """Get the types of the known upcoming pieces."""
+        return [piece.type for piece in engine.preview]
+    
+    def _placements(self, board, piece_type, use_hold=False, start=None, root=False):
+        """Get the placements for a piece, memoized by board hash below the root."""
+        if root:
+            # Root placements keep their paths, so they are not cached; held
+            # pieces start from spawn (start=None)
+            return MoveGenerator(board).generate(piece_type, use_hold, start)
+        
+        key = (board.hash, piece_type, use_hold)
+        placements = self.placement_table.get(key)
+        if placements is None:
+            # Deeper plies only need the lock positions
+            placements = [Placement(p.piece_type, p.rotation, p.x, p.y, use_hold)
+                          for p in MoveGenerator(board).generate(piece_type, use_hold)]
+            self.placement_table.store(key, placements)
+        return placements
+    
+    def _candidates(self, board, queue, index, hold_type, can_hold, start):
+        """Get (placement, next index, next hold type) for every move at this ply."""
+        # Only the root ply has a start position, and its moves must carry paths
+        root = start is not None
+        moves = [(placement, index + 1, hold_type)
+                 for placement in self._placements(board, queue[index], start=start, root=root)]
+        
+        if self.use_hold and can_hold:
+            if hold_type is None:
+                # Holding into an empty slot plays the following piece instead
+                if index + 1 < len(queue) and queue[index + 1] != queue[index]:
+                    moves.extend((placement, index + 2, queue[index])
+                                 for placement in self._placements(board, queue[index + 1], True,
+                                                                   root=root))
+            elif hold_type != queue[index]:
+                moves.extend((placement, index + 1, queue[index])
+                             for placement in self._placements(board, hold_type, True, root=root))
+        
+        return moves
+    
+    def _search(self, board, queue, index, hold_type, can_hold, depth, start=None):
+        """Yield (value, placement) for the best moves at this ply, searching deeper in place."""
+        children = []
+        for placement, next_index, next_hold in self._candidates(board, queue, index, hold_type,
+                                                                  can_hold, start):
+            record = board.place_and_clear(placement.piece_type, placement.rotation,
+                                           placement.x, placement.y)
+            lines = record[3]
+            children.append((self.evaluate(board, lines), lines, placement, next_index, next_hold))
+            board.undo(record)
+            self.nodes += 1
+        
+        # Keep only the most promising children for deeper search
+        children.sort(key=lambda child: child[0], reverse=True)
+        children = children[:self.beam_width]
+        
+        for value, lines, placement, next_index, next_hold in children:
+            if depth > 1 and next_index < len(queue) and value > TOP_OUT_PENALTY:
+                record = board.place_and_clear(placement.piece_type, placement.rotation,
+                                               placement.x, placement.y)
+                deeper = [child_value for child_value, _ in
+                          self._search(board, queue, next_index, next_hold, True, depth - 1)]
+                board.undo(record)
+                if deeper:
+                    value = self.weights.get('lines', 0.0) * lines + max(deeper)
+            yield value, placement
+
+class BotController:
+    """Input source that plays a bot's placements through TetrisGame."""
+    
+    def __init__(self, bot=None, piece_delay=200):
+        """Initialize the controller with a think delay per piece in milliseconds."""
+        self.bot = bot if bot is not None else BeamSearchBot()
+        self.piece_delay = piece_delay
+        self.wait_time = 0
+        self.pieces_played = 0
+    
+    def next_actions(self, engine, dt):
+        """Get the engine actions to apply this frame."""
+        self.wait_time += dt
+        if self.wait_time < self.piece_delay:
+            return []
+        self.wait_time = 0
+        
+        placement = self.bot.choose(engine)
+        if placement is None:
+            return []
+        self.pieces_played += 1
+        return placement.get_path()
\ No newline at end of file
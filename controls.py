@@ -0,0 +1,74 @@
+"""
+Tetris Controls
+Delayed auto shift (DAS) and auto repeat rate (ARR) for held keys, driven by input timestamps
+"""
+
+from engine import ACTION_LEFT, ACTION_RIGHT, ACTION_SOFT_DROP
+
+# Milliseconds a direction is held before it starts repeating, and between repeats
+DEFAULT_DAS = 167
+DEFAULT_ARR = 33
+
+# Milliseconds between soft drop repeats while the key is held
+DEFAULT_SOFT_DROP_INTERVAL = 33
+
+# Repeats applied at once when a rate is 0 (enough to cross the board)
+INSTANT_REPEATS = 20
+
+class DasInput:
+    """Turns press and release times into the repeated moves of held keys."""
+    
+    def __init__(self, das=DEFAULT_DAS, arr=DEFAULT_ARR, soft_drop_interval=DEFAULT_SOFT_DROP_INTERVAL):
+        """Initialize with the repeat timings in milliseconds."""
+        self.das = das
+        self.arr = arr
+        self.soft_drop_interval = soft_drop_interval
+        self.reset()
+    
+    def reset(self):
+        """Forget all held keys."""
+        # Held directions, most recent last; only the last one repeats
+        self.directions = []
+        self.next_shift = None
+        self.next_drop = None
+    
+    def press(self, action, timestamp):
+        """Note that an action's key went down at timestamp (ms)."""
+        if action in (ACTION_LEFT, ACTION_RIGHT):
+            if action in self.directions:
+                self.directions.remove(action)
+            self.directions.append(action)
+            self.next_shift = timestamp + self.das
+        elif action == ACTION_SOFT_DROP:
+            self.next_drop = timestamp + self.soft_drop_interval
+    
+    def release(self, action, timestamp):
+        """Note that an action's key went up at timestamp (ms)."""
+        if action in self.directions:
+            was_active = action == self.directions[-1]
+            self.directions.remove(action)
+            if not self.directions:
+                self.next_shift = None
+            elif was_active:
+                # The other direction is still held: it charges its own DAS
+                self.next_shift = timestamp + self.das
+        elif action == ACTION_SOFT_DROP:
+            self.next_drop = None
+    
+    def poll(self, timestamp):
+        """Get the repeated actions that fell due up to timestamp (ms), in order."""
+        actions = []
+        if self.next_shift is not None and timestamp >= self.next_shift:
+            count, self.next_shift = self._due(self.next_shift, self.arr, timestamp)
+            actions.extend([self.directions[-1]] * count)
+        if self.next_drop is not None and timestamp >= self.next_drop:
+            count, self.next_drop = self._due(self.next_drop, self.soft_drop_interval, timestamp)
+            actions.extend([ACTION_SOFT_DROP] * count)
+        return actions
+    
+    def _due(self, first, interval, timestamp):
+        """Get (repeats due, next repeat time) for repeats starting at first."""
+        if interval <= 0:
+            return INSTANT_REPEATS, timestamp
+        count = int((timestamp - first) // interval) + 1
+        return count, first + count * interval
\ No newline at end of file
@@ -0,0 +1,313 @@
+"""
+Tetris Game Engine
+Headless, deterministic game rules with an explicit step(action, dt) API
+"""
+
+from collections import deque
+from board import TetrisBoard
+from pieces import TetrisPiece
+from randomizer import create_randomizer, DEFAULT_POLICY
+
+# Default board dimensions
+BOARD_WIDTH = 10
+BOARD_HEIGHT = 20
+
+# Actions accepted by TetrisEngine.step
+ACTION_NONE = 0
+ACTION_LEFT = 1
+ACTION_RIGHT = 2
+ACTION_SOFT_DROP = 3
+ACTION_ROTATE_CW = 4
+ACTION_ROTATE_CCW = 5
+ACTION_HARD_DROP = 6
+ACTION_HOLD = 7
+NUM_ACTIONS = 8
+
+# Upcoming pieces shown to the player and to bots
+DEFAULT_PREVIEW_COUNT = 5
+
+# Offsets tried in order when a rotation collides
+WALL_KICKS = ((0, 0), (-1, 0), (1, 0), (0, -1), (-1, -1), (1, -1))
+
+# Scoring and leveling
+LINE_SCORES = {0: 0, 1: 40, 2: 100, 3: 300, 4: 1200}
+HARD_DROP_POINTS = 2
+LINES_PER_LEVEL = 10
+MAX_LEVEL = 15
+
+# Events emitted by the engine (names match AudioManager sounds)
+EVENT_MOVE = 'move'
+EVENT_ROTATE = 'rotate'
+EVENT_DROP = 'drop'
+EVENT_LINE_CLEAR = 'line_clear'
+EVENT_TETRIS = 'tetris'
+EVENT_LEVEL_UP = 'level_up'
+EVENT_GAME_OVER = 'game_over'
+
+class TetrisEngine:
+    """Game rules for a single Tetris game, independent of rendering and input."""
+    
+    def __init__(self, width=BOARD_WIDTH, height=BOARD_HEIGHT, seed=None, board_class=TetrisBoard,
+                 randomizer=DEFAULT_POLICY, preview_count=DEFAULT_PREVIEW_COUNT):
+        """Initialize the engine with a randomizer policy name or instance."""
+        self.width = width
+        self.height = height
+        self.board_class = board_class
+        self.preview_count = max(1, preview_count)
+        if isinstance(randomizer, str):
+            randomizer = create_randomizer(randomizer, seed)
+        self.randomizer = randomizer
+        self.reset()
+    
+    def reset(self, seed=None):
+        """Reset the game to initial state, optionally reseeding."""
+        self.randomizer.reset(seed)
+        
+        self.board = self.board_class(self.width, self.height)
+        self.current_piece = self.new_piece()
+        self.current_piece.x = self.spawn_x
+        self.current_piece.y = 0
+        
+        # Upcoming pieces, next piece first
+        self.preview = deque(TetrisPiece(piece_type)
+                             for piece_type in self.randomizer.generate(self.preview_count))
+        self.hold_piece = None
+        self.can_hold = True
+        
+        # Game statistics
+        self.score = 0
+        self.lines_cleared = 0
+        self.level = 1
+        self.pieces_placed = 0
+        self.game_over = False
+        
+        # Timing (milliseconds)
+        self.fall_time = 0
+        self.fall_speed = 500
+        
+        # Events produced since the last step
+        self.events = []
+    
+    @property
+    def next_piece(self):
+        """Get the piece that spawns next."""
+        return self.preview[0]
+    
+    @property
+    def spawn_x(self):
+        """Get the column new pieces spawn at."""
+        return self.width // 2 - 2
+    
+    def new_piece(self):
+        """Create a new piece from the engine's randomizer."""
+        return TetrisPiece(self.randomizer.next())
+    
+    def update_fall_speed(self):
+        """Update fall speed based on level."""
+        self.fall_speed = max(50, 500 - (self.level - 1) * 50)
+    
+    def calculate_score(self, lines_cleared):
+        """Calculate score based on lines cleared."""
+        return LINE_SCORES.get(lines_cleared, 0) * self.level
+    
+    def move(self, dx, dy):
+        """Move the current piece, returning whether it moved."""
+        if self.game_over:
+            return False
+        
+        piece = self.current_piece
+        piece.x += dx
+        piece.y += dy
+        
+        if not self.board.is_valid_position(piece):
+            piece.x -= dx
+            piece.y -= dy
+            return False
+        
+        if dx != 0 or dy != 0:
+            self.events.append(EVENT_MOVE)
+        return True
+    
+    def rotate(self, clockwise=True):
+        """Rotate the current piece with wall kicks, returning whether it rotated."""
+        if self.game_over:
+            return False
+        
+        piece = self.current_piece
+        original_rotation = piece.rotation
+        
+        if clockwise:
+            piece.rotate_clockwise()
+        else:
+            piece.rotate_counterclockwise()
+        
+        if self.board.is_valid_position(piece):
+            self.events.append(EVENT_ROTATE)
+            return True
+        
+        # Rotation is invalid, try wall kicks
+        for dx, dy in WALL_KICKS:
+            piece.x += dx
+            piece.y += dy
+            if self.board.is_valid_position(piece):
+                self.events.append(EVENT_ROTATE)
+                return True
+            piece.x -= dx
+            piece.y -= dy
+        
+        # Revert rotation
+        piece.rotation = original_rotation
+        return False
+    
+    def hard_drop(self):
+        """Drop the piece to the bottom and lock it."""
+        if self.game_over:
+            return
+        
+        # One lookup against the column tops instead of a move per row
+        drop_distance = self.board.drop_distance(self.current_piece)
+        self.current_piece.y += drop_distance
+        
+        self.score += drop_distance * HARD_DROP_POINTS
+        self.events.append(EVENT_DROP)
+        self.place_current_piece()
+    
+    def hold(self):
+        """Hold/swap the current piece."""
+        if not self.can_hold or self.game_over:
+            return
+        
+        if self.hold_piece is None:
+            self.hold_piece = TetrisPiece(self.current_piece.type)
+            self.spawn_next_piece()
+        else:
+            # Swap pieces
+            temp_type = self.hold_piece.type
+            self.hold_piece = TetrisPiece(self.current_piece.type)
+            self.current_piece = TetrisPiece(temp_type, self.spawn_x, 0)
+            
+            # A swapped-in piece can be blocked at spawn just like a new one
+            if not self.board.is_valid_position(self.current_piece):
+                self.game_over = True
+                self.events.append(EVENT_GAME_OVER)
+        
+        self.can_hold = False
+    
+    def spawn_next_piece(self):
+        """Spawn the next piece."""
+        self.current_piece = self.preview.popleft()
+        self.current_piece.x = self.spawn_x
+        self.current_piece.y = 0
+        self.preview.append(self.new_piece())
+        self.can_hold = True
+        
+        # Check game over
+        if not self.board.is_valid_position(self.current_piece):
+            self.game_over = True
+            self.events.append(EVENT_GAME_OVER)
+    
+    def place_current_piece(self):
+        """Lock the current piece, clear lines and spawn the next piece."""
+        self.board.place_piece(self.current_piece)
+        self.pieces_placed += 1
+        
+        lines_cleared = self.board.clear_lines()
+        if lines_cleared > 0:
+            old_level = self.level
+            self.lines_cleared += lines_cleared
+            self.score += self.calculate_score(lines_cleared)
+            self.level = min(MAX_LEVEL, 1 + self.lines_cleared // LINES_PER_LEVEL)
+            self.update_fall_speed()
+            
+            self.events.append(EVENT_TETRIS if lines_cleared == 4 else EVENT_LINE_CLEAR)
+            if self.level > old_level:
+                self.events.append(EVENT_LEVEL_UP)
+        
+        self.spawn_next_piece()
+    
+    def get_state(self):
+        """Get a snapshot of the full game state for set_state."""
+        piece = self.current_piece
+        return {
+            'cells': self.board.get_cells(),
+            'current': (piece.type, piece.x, piece.y, piece.rotation),
+            'preview': [piece.type for piece in self.preview],
+            'hold': self.hold_piece.type if self.hold_piece else None,
+            'can_hold': self.can_hold,
+            'score': self.score,
+            'lines_cleared': self.lines_cleared,
+            'level': self.level,
+            'pieces_placed': self.pieces_placed,
+            'game_over': self.game_over,
+            'fall_time': self.fall_time,
+            'fall_speed': self.fall_speed,
+            'randomizer': self.randomizer.getstate(),
+        }
+    
+    def set_state(self, state):
+        """Restore a snapshot from get_state."""
+        self.board = self.board_class(self.width, self.height)
+        self.board.load_cells(state['cells'])
+        
+        piece_type, x, y, rotation = state['current']
+        self.current_piece = TetrisPiece(piece_type, x, y)
+        self.current_piece.rotation = rotation
+        self.preview = deque(TetrisPiece(piece_type) for piece_type in state['preview'])
+        self.hold_piece = TetrisPiece(state['hold']) if state['hold'] else None
+        self.can_hold = state['can_hold']
+        
+        self.score = state['score']
+        self.lines_cleared = state['lines_cleared']
+        self.level = state['level']
+        self.pieces_placed = state['pieces_placed']
+        self.game_over = state['game_over']
+        self.fall_time = state['fall_time']
+        self.fall_speed = state['fall_speed']
+        self.randomizer.setstate(state['randomizer'])
+        self.events = []
+    
+    def tick(self, dt):
+        """Advance gravity by dt milliseconds, dropping every row that is due in one sweep."""
+        if self.game_over:
+            return
+        
+        self.fall_time += dt
+        if self.fall_time < self.fall_speed:
+            return
+        
+        # Keep the remainder so the fall rate does not depend on how time is sliced
+        rows, self.fall_time = divmod(self.fall_time, self.fall_speed)
+        piece = self.current_piece
+        distance = self.board.drop_distance(piece)
+        if rows <= distance:
+            piece.y += rows
+            self.events.append(EVENT_MOVE)
+        else:
+            # Landed with gravity to spare: lock, and the next piece starts its fall afresh
+            piece.y += distance
+            self.place_current_piece()
+            self.fall_time = 0
+    
+    def step(self, action=ACTION_NONE, dt=0):
+        """Apply an action, advance time by dt milliseconds and return the events produced."""
+        if action == ACTION_LEFT:
+            self.move(-1, 0)
+        elif action == ACTION_RIGHT:
+            self.move(1, 0)
+        elif action == ACTION_SOFT_DROP:
+            self.move(0, 1)
+        elif action == ACTION_ROTATE_CW:
+            self.rotate()
+        elif action == ACTION_ROTATE_CCW:
+            self.rotate(clockwise=False)
+        elif action == ACTION_HARD_DROP:
+            self.hard_drop()
+        elif action == ACTION_HOLD:
+            self.hold()
+        
+        if dt:
+            self.tick(dt)
+        
+        events = self.events
+        self.events = []
+        return events
\ No newline at end of file
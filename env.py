@@ -0,0 +1,184 @@
+"""
+Tetris Environment
+Gym-style reset/step/render over the headless engine, with preallocated read-only NumPy observations
+"""
+
+import numpy as np
+from pieces import PIECE_BOUNDS, PIECE_CODES
+from engine import TetrisEngine, BOARD_WIDTH, BOARD_HEIGHT, NUM_ACTIONS
+from movegen import MoveGenerator
+
+# Action spaces: one engine input per step, or one whole placement per step
+ACTION_MODE_INPUTS = 'inputs'
+ACTION_MODE_PLACEMENTS = 'placements'
+
+# Game time that passes with each input step (one frame at 60 FPS)
+DEFAULT_FRAME_MS = 16
+
+# Characters used by the text renderer
+EMPTY_CHAR = '.'
+PIECE_CHAR = '@'
+
+def _read_only(array):
+    """Get a view of array that callers cannot write through."""
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+class TetrisEnv:
+    """Reinforcement learning wrapper around TetrisEngine."""
+    
+    def __init__(self, action_mode=ACTION_MODE_INPUTS, width=BOARD_WIDTH, height=BOARD_HEIGHT,
+                 frame_ms=DEFAULT_FRAME_MS, max_steps=None, render_mode=None, **engine_options):
+        """Initialize the environment; engine_options are passed to TetrisEngine."""
+        if action_mode not in (ACTION_MODE_INPUTS, ACTION_MODE_PLACEMENTS):
+            raise ValueError(f"Unknown action mode: {action_mode}")
+        self.action_mode = action_mode
+        self.frame_ms = frame_ms
+        self.max_steps = max_steps
+        self.render_mode = render_mode
+        self.engine = TetrisEngine(width, height, **engine_options)
+        
+        # Placements are indexed by (use_hold, rotation, leftmost column)
+        if action_mode == ACTION_MODE_PLACEMENTS:
+            self.num_actions = 2 * 4 * width
+        else:
+            self.num_actions = NUM_ACTIONS
+        self.placements = [None] * self.num_actions
+        
+        # Observation buffers, written in place every step; pieces use the board's
+        # cell codes (pieces.PIECE_CODES), 0 for none
+        self._board = np.zeros((height, width), dtype=np.uint8)
+        self._piece = np.zeros(4, dtype=np.int16)
+        self._queue = np.zeros(self.engine.preview_count, dtype=np.uint8)
+        self._hold = np.zeros(2, dtype=np.uint8)
+        self._action_mask = np.ones(self.num_actions, dtype=bool)
+        
+        # Scratch space for unpacking row masks into the board buffer
+        self._rows = np.zeros((height, 1), dtype=np.int64)
+        self._shifted = np.zeros((height, width), dtype=np.int64)
+        self._columns = np.arange(width, dtype=np.int64)
+        self._synced_board = None
+        self._synced_version = -1
+        
+        # The same read-only views are returned from every reset and step, so
+        # they always show the latest state; copy them to keep a history
+        self.observation = {
+            'board': _read_only(self._board),
+            'piece': _read_only(self._piece),
+            'queue': _read_only(self._queue),
+            'hold': _read_only(self._hold),
+            'action_mask': _read_only(self._action_mask),
+        }
+        self.steps = 0
+    
+    def reset(self, seed=None):
+        """Start a new game, optionally reseeding, and return (observation, info)."""
+        self.engine.reset(seed)
+        self.steps = 0
+        self._synced_board = None
+        self._update_observation()
+        return self.observation, self._info()
+    
+    def step(self, action):
+        """Apply an action and return (observation, reward, terminated, truncated, info)."""
+        engine = self.engine
+        score = engine.score
+        
+        if self.action_mode == ACTION_MODE_INPUTS:
+            engine.step(action, self.frame_ms)
+        elif not engine.game_over:
+            placement = self.placements[action]
+            if placement is None:
+                raise ValueError(f"Placement {action} is not available (check action_mask)")
+            step = engine.step
+            for path_action in placement.get_path():
+                step(path_action)
+        
+        self.steps += 1
+        self._update_observation()
+        truncated = self.max_steps is not None and self.steps >= self.max_steps
+        
+        if self.render_mode == 'human':
+            print(self.render())
+        return self.observation, engine.score - score, engine.game_over, truncated, self._info()
+    
+    def render(self):
+        """Get the board and falling piece as text, one line per row."""
+        engine = self.engine
+        cells = [[EMPTY_CHAR if cell is None else PIECE_CHAR for cell in row] for row in engine.board.grid]
+        if not engine.game_over:
+            for x, y in engine.current_piece.get_blocks():
+                if 0 <= y < engine.height and 0 <= x < engine.width:
+                    cells[y][x] = engine.current_piece.type
+        return '\n'.join(''.join(row) for row in cells)
+    
+    def placement_action(self, use_hold, rotation, column):
+        """Get the placement action index for a hold flag, rotation and leftmost column."""
+        return (int(use_hold) * 4 + rotation) * self.engine.width + column
+    
+    def sample_action(self, rng=np.random):
+        """Get a random valid action."""
+        if self.action_mode == ACTION_MODE_INPUTS:
+            return int(rng.randint(self.num_actions))
+        valid = np.flatnonzero(self._action_mask)
+        return int(valid[rng.randint(len(valid))]) if len(valid) else 0
+    
+    def _info(self):
+        """Get the game statistics that are not part of the observation."""
+        engine = self.engine
+        return {
+            'score': engine.score,
+            'lines_cleared': engine.lines_cleared,
+            'level': engine.level,
+            'pieces_placed': engine.pieces_placed,
+        }
+    
+    def _update_observation(self):
+        """Write the engine state into the observation buffers."""
+        engine = self.engine
+        board = engine.board
+        
+        # The board only changes when a piece locks, so most steps skip it
+        if board is not self._synced_board or board.version != self._synced_version:
+            self._rows[:, 0] = board.get_row_masks()
+            np.right_shift(self._rows, self._columns, out=self._shifted)
+            np.bitwise_and(self._shifted, 1, out=self._board, casting='unsafe')
+            self._synced_board = board
+            self._synced_version = board.version
+        
+        piece = engine.current_piece
+        self._piece[:] = (PIECE_CODES[piece.type], piece.rotation, piece.x, piece.y)
+        for i, upcoming in enumerate(engine.preview):
+            self._queue[i] = PIECE_CODES[upcoming.type]
+        self._hold[0] = PIECE_CODES[engine.hold_piece.type] if engine.hold_piece else 0
+        self._hold[1] = engine.can_hold
+        
+        if self.action_mode == ACTION_MODE_PLACEMENTS:
+            self._update_placements()
+    
+    def _update_placements(self):
+        """Enumerate the reachable placements and mark them in the action mask."""
+        engine = self.engine
+        placements = self.placements
+        placements[:] = [None] * self.num_actions
+        
+        if not engine.game_over:
+            generator = MoveGenerator(engine.board, engine.spawn_x)
+            candidates = generator.generate(engine.current_piece.type)
+            
+            if engine.can_hold:
+                # Holding into an empty slot plays the next piece instead
+                hold_type = engine.hold_piece.type if engine.hold_piece else engine.next_piece.type
+                if hold_type != engine.current_piece.type:
+                    candidates += generator.generate(hold_type, use_hold=True)
+            
+            # Several lock positions can share a column (tucks under overhangs);
+            # keep the first found, which has the shortest input path
+            for placement in candidates:
+                column = placement.x + PIECE_BOUNDS[placement.piece_type][placement.rotation][0]
+                action = self.placement_action(placement.use_hold, placement.rotation, column)
+                if placements[action] is None:
+                    placements[action] = placement
+        
+        self._action_mask[:] = [placement is not None for placement in placements]
\ No newline at end of file
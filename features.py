@@ -0,0 +1,139 @@
+"""
+Tetris Board Features
+Standard placement-evaluation heuristics computed in a single pass over the board
+"""
+
+# Names of the scalar features, in the order used by weight vectors
+FEATURE_NAMES = ('aggregate_height', 'max_height', 'holes', 'bumpiness', 'wells',
+                 'row_transitions', 'col_transitions', 'hole_depth')
+
+def _add_bits(planes, bits):
+    """Add 1 to the bit-sliced per-column counters selected by bits."""
+    for k, plane in enumerate(planes):
+        planes[k] = plane ^ bits
+        bits &= plane
+        if not bits:
+            return
+    planes.append(bits)
+
+def _sum_bits(planes, mask):
+    """Sum the bit-sliced per-column counters selected by mask."""
+    total = 0
+    for k, plane in enumerate(planes):
+        total += bin(plane & mask).count('1') << k
+    return total
+
+def extract_features_from_masks(rows, width):
+    """Compute all features from row bitmasks (top row first) in one pass."""
+    height = len(rows)
+    full = (1 << width) - 1
+    left_wall = 1
+    right_wall = 1 << (width - 1)
+    edges = 1 | 1 << (width + 1)
+    
+    heights = [0] * width
+    covered = 0
+    holes = 0
+    hole_depth = 0
+    wells = 0
+    row_transitions = 0
+    col_transitions = 0
+    prev = 0
+    
+    # Per-column counters kept as bit planes: filled cells seen so far and
+    # the current run of well cells
+    filled_above = []
+    well_run = []
+    
+    for row_idx, mask in enumerate(rows):
+        # Column heights from the first filled cell in each column
+        new_bits = mask & ~covered
+        while new_bits:
+            low = new_bits & -new_bits
+            heights[low.bit_length() - 1] = height - row_idx
+            new_bits ^= low
+        
+        # Holes and how many filled cells sit above them
+        hole_bits = covered & ~mask
+        if hole_bits:
+            holes += bin(hole_bits).count('1')
+            hole_depth += _sum_bits(filled_above, hole_bits)
+        
+        # Open cells with filled neighbors (or walls) on both sides
+        well_bits = ~mask & ~covered & full & ((mask << 1) | left_wall) & ((mask >> 1) | right_wall)
+        well_run = [plane & well_bits for plane in well_run]
+        if well_bits:
+            _add_bits(well_run, well_bits)
+            wells += _sum_bits(well_run, well_bits)
+        
+        # Transitions, with walls counted as filled and the area above the board as empty
+        walled = (mask << 1) | edges
+        row_transitions += bin(walled ^ (walled >> 1)).count('1') - 1
+        col_transitions += bin(mask ^ prev).count('1')
+        prev = mask
+        
+        if mask:
+            _add_bits(filled_above, mask)
+        covered |= mask
+    
+    # The floor counts as filled
+    col_transitions += bin(prev ^ full).count('1')
+    
+    bumpiness = 0
+    for col in range(width - 1):
+        bumpiness += abs(heights[col] - heights[col + 1])
+    
+    return {
+        'heights': heights,
+        'aggregate_height': sum(heights),
+        'max_height': max(heights),
+        'holes': holes,
+        'bumpiness': bumpiness,
+        'wells': wells,
+        'row_transitions': row_transitions,
+        'col_transitions': col_transitions,
+        'hole_depth': hole_depth,
+    }
+
+def extract_features(board):
+    """Compute all features for a TetrisBoard or BitBoard in one pass."""
+    return extract_features_from_masks(board.get_row_masks(), board.width)
+
+def extract_features_batch(boards):
+    """Compute all features for a stack of boards shaped (N, height, width), nonzero = filled."""
+    import numpy as np
+    
+    filled = np.asarray(boards) != 0
+    count, height, width = filled.shape
+    covered = np.maximum.accumulate(filled, axis=1)
+    
+    heights = np.where(filled.any(axis=1), height - filled.argmax(axis=1), 0)
+    hole_mask = covered & ~filled
+    
+    # Filled cells strictly above each cell
+    filled_above = np.cumsum(filled, axis=1) - filled
+    hole_depth = (filled_above * hole_mask).sum(axis=(1, 2))
+    
+    # Open cells with filled neighbors (or walls) on both sides, weighted by run length
+    padded = np.pad(filled, ((0, 0), (0, 0), (1, 1)), constant_values=True)
+    well_mask = ~covered & padded[:, :, :-2] & padded[:, :, 2:]
+    run_total = np.cumsum(well_mask, axis=1)
+    run_start = np.maximum.accumulate(np.where(well_mask, 0, run_total), axis=1)
+    wells = ((run_total - run_start) * well_mask).sum(axis=(1, 2))
+    
+    row_transitions = (padded[:, :, 1:] != padded[:, :, :-1]).sum(axis=(1, 2))
+    vertical = np.concatenate([np.zeros((count, 1, width), dtype=bool), filled,
+                               np.ones((count, 1, width), dtype=bool)], axis=1)
+    col_transitions = (vertical[:, 1:] != vertical[:, :-1]).sum(axis=(1, 2))
+    
+    return {
+        'heights': heights,
+        'aggregate_height': heights.sum(axis=1),
+        'max_height': heights.max(axis=1),
+        'holes': hole_mask.sum(axis=(1, 2)),
+        'bumpiness': np.abs(np.diff(heights, axis=1)).sum(axis=1),
+        'wells': wells,
+        'row_transitions': row_transitions,
+        'col_transitions': col_transitions,
+        'hole_depth': hole_depth,
+    }
\ No newline at end of file
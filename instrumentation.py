@@ -0,0 +1,167 @@
+"""
+Tetris Frame Instrumentation
+Per-phase frame timings in a ring buffer, with percentiles, dropped frames, CPU use, input latency and export
+"""
+
+import csv
+import json
+import time
+from array import array
+from collections import deque
+
+# Phases of one main-loop iteration, in order
+PHASES = ('input', 'update', 'draw', 'wait')
+
+# Frames kept for statistics (ten seconds at 60 FPS)
+DEFAULT_CAPACITY = 600
+
+# A frame counts as dropped when it takes this many frame budgets or more
+DROP_FACTOR = 1.5
+
+def _percentiles(values, points):
+    """Get nearest-rank percentiles of values in seconds, in milliseconds."""
+    window = sorted(values)
+    if not window:
+        return {f"p{point}": 0.0 for point in points}
+    last = len(window) - 1
+    return {f"p{point}": window[min(last, int(point / 100 * len(window)))] * 1000
+            for point in points}
+
+class FrameProfiler:
+    """Records how long each phase of each frame takes."""
+    
+    def __init__(self, capacity=DEFAULT_CAPACITY, target_fps=60):
+        """Initialize an empty ring buffer."""
+        self.capacity = capacity
+        self.target_fps = target_fps
+        self.drop_threshold = DROP_FACTOR / target_fps
+        
+        # Seconds per phase and per whole frame, one slot per frame
+        self.samples = {phase: array('d', bytes(8 * capacity)) for phase in PHASES}
+        self.frame_times = array('d', bytes(8 * capacity))
+        self.index = 0
+        self.count = 0
+        
+        # Totals over the whole session
+        self.frames = 0
+        self.dropped = 0
+        
+        # Wall and process CPU seconds spent in frames and in idle waits
+        self.active_time = 0.0
+        self.active_cpu = 0.0
+        self.idle_time = 0.0
+        self.idle_cpu = 0.0
+        self.idle_wakeups = 0
+        self.idle_redraws = 0
+        
+        # Seconds from each input event to the display flip that showed it
+        self.latencies = deque(maxlen=capacity)
+        self.input_events = 0
+        
+        self._frame_start = 0.0
+        self._frame_cpu = 0.0
+        self._last_mark = 0.0
+        self._idle_start = 0.0
+        self._idle_cpu_start = 0.0
+    
+    def begin_frame(self):
+        """Start timing a frame."""
+        self._frame_start = self._last_mark = time.perf_counter()
+        self._frame_cpu = time.process_time()
+    
+    def mark(self, phase):
+        """Record the time since the previous mark as the given phase."""
+        now = time.perf_counter()
+        self.samples[phase][self.index] = now - self._last_mark
+        self._last_mark = now
+    
+    def end_frame(self):
+        """Finish the frame and advance the ring buffer."""
+        total = self._last_mark - self._frame_start
+        self.frame_times[self.index] = total
+        if total >= self.drop_threshold:
+            self.dropped += 1
+        self.active_time += total
+        self.active_cpu += time.process_time() - self._frame_cpu
+        
+        self.frames += 1
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+    
+    def begin_idle(self):
+        """Start timing a wait for input outside of active play."""
+        self._idle_start = time.perf_counter()
+        self._idle_cpu_start = time.process_time()
+    
+    def end_idle(self, redrawn=False):
+        """Finish an idle wait, noting whether it redrew the screen."""
+        self.idle_time += time.perf_counter() - self._idle_start
+        self.idle_cpu += time.process_time() - self._idle_cpu_start
+        self.idle_wakeups += 1
+        self.idle_redraws += redrawn
+    
+    def record_latency(self, seconds):
+        """Record the time from an input event to the flip that showed its result."""
+        self.latencies.append(seconds)
+        self.input_events += 1
+    
+    def _window(self, values):
+        """Get the buffered values, oldest first."""
+        if self.count < self.capacity:
+            return values[:self.count]
+        return values[self.index:] + values[:self.index]
+    
+    def percentiles(self, values, points=(50, 95, 99)):
+        """Get nearest-rank percentiles of the buffered values, in milliseconds."""
+        return _percentiles(self._window(values), points)
+    
+    def get_stats(self):
+        """Get frame rate, dropped frames and per-phase percentiles over the buffered frames."""
+        frame_window = self._window(self.frame_times)
+        elapsed = sum(frame_window)
+        dropped = sum(1 for frame_time in frame_window if frame_time >= self.drop_threshold)
+        
+        stats = {
+            'frames': self.frames,
+            'dropped': self.dropped,
+            'window_frames': len(frame_window),
+            'window_dropped': dropped,
+            'fps': len(frame_window) / elapsed if elapsed else 0.0,
+            'frame': self.percentiles(self.frame_times),
+            'cpu_percent': 100 * self.active_cpu / self.active_time if self.active_time else 0.0,
+            'idle_seconds': self.idle_time,
+            'idle_cpu_percent': 100 * self.idle_cpu / self.idle_time if self.idle_time else 0.0,
+            'idle_wakeups': self.idle_wakeups,
+            'idle_redraws': self.idle_redraws,
+            'input_events': self.input_events,
+            'input_latency': _percentiles(self.latencies, (50, 95, 99)),
+        }
+        for phase in PHASES:
+            stats[phase] = self.percentiles(self.samples[phase])
+        return stats
+    
+    def export(self, path):
+        """Write the buffered frames as CSV, or a summary plus frames as JSON (by extension)."""
+        columns = [self._window(self.samples[phase]) for phase in PHASES]
+        frame_window = self._window(self.frame_times)
+        first_frame = self.frames - len(frame_window)
+        
+        rows = []
+        for i, frame_time in enumerate(frame_window):
+            row = {'frame': first_frame + i}
+            for phase, column in zip(PHASES, columns):
+                row[f"{phase}_ms"] = column[i] * 1000
+            row['total_ms'] = frame_time * 1000
+            row['dropped'] = frame_time >= self.drop_threshold
+            rows.append(row)
+        
+        with open(path, 'w', newline='') as f:
+            if path.endswith('.json'):
+                json.dump({'summary': self.get_stats(), 'frames': rows,
+                           'input_latencies_ms': [latency * 1000 for latency in self.latencies]},
+                          f, indent=2)
+            else:
+                writer = csv.DictWriter(f, fieldnames=['frame'] + [f"{phase}_ms" for phase in PHASES]
+                                        + ['total_ms', 'dropped'])
+                writer.writeheader()
+                writer.writerows(rows)
\ No newline at end of file
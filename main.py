@@ -4,16 +4,60 @@ Tetris Game - Main Entry Point
 A fully-featured Tetris implementation with cyberpunk theme
 """
 
+import argparse
 import pygame
 import sys
-from tetris import TetrisGame
+from tetris import TetrisGame, DEFAULT_TICK_RATE, DEFAULT_MAX_FPS
+from engine import DEFAULT_PREVIEW_COUNT
+from controls import DEFAULT_DAS, DEFAULT_ARR
+from randomizer import RANDOMIZERS, DEFAULT_POLICY
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Tetris - Cyberpunk Edition")
+    parser.add_argument('--bot', action='store_true', help="let the beam-search bot play")
+    parser.add_argument('--seed', type=int, help="seed for a reproducible piece sequence")
+    parser.add_argument('--randomizer', choices=sorted(RANDOMIZERS), default=DEFAULT_POLICY,
+                        help="piece randomizer policy")
+    parser.add_argument('--preview', type=int, default=DEFAULT_PREVIEW_COUNT,
+                        help="number of upcoming pieces shown")
+    parser.add_argument('--no-audio', action='store_true',
+                        help="run silently without initializing the sound mixer")
+    parser.add_argument('--dirty-rendering', action='store_true',
+                        help="redraw only changed screen regions (lower CPU use)")
+    parser.add_argument('--tick-rate', type=int, default=DEFAULT_TICK_RATE,
+                        help="simulation ticks per second, independent of the frame rate")
+    parser.add_argument('--max-fps', type=int, default=DEFAULT_MAX_FPS,
+                        help="render frame cap (0 for unlimited)")
+    parser.add_argument('--uncapped', action='store_true',
+                        help="run the simulation as fast as possible (fast-forward, e.g. with --bot)")
+    parser.add_argument('--das', type=int, default=DEFAULT_DAS,
+                        help="milliseconds a left/right key is held before it auto-repeats")
+    parser.add_argument('--arr', type=int, default=DEFAULT_ARR,
+                        help="milliseconds between auto-repeated moves (0 moves straight to the wall)")
+    parser.add_argument('--no-idle-wait', action='store_true',
+                        help="keep redrawing at 60 FPS in the menu, pause and game over screens")
+    parser.add_argument('--profile', type=str, metavar='PATH',
+                        help="record frame timings and export them at exit (.csv or .json)")
+    parser.add_argument('--record', type=str, metavar='PATH',
+                        help="save a replay of the last game played (verify with replay.py)")
+    return parser.parse_args()
 
 def main():
     """Initialize and run the Tetris game."""
-    pygame.init()
+    args = parse_args()
     
     # Initialize the game
-    game = TetrisGame()
+    controller = None
+    if args.bot:
+        from bot import BotController
+        controller = BotController()
+    game = TetrisGame(seed=args.seed, controller=controller,
+                      randomizer=args.randomizer, preview_count=args.preview,
+                      record=bool(args.record), dirty_rendering=args.dirty_rendering,
+                      audio=not args.no_audio, profile=bool(args.profile),
+                      idle_wait=not args.no_idle_wait, tick_rate=args.tick_rate,
+                      max_fps=args.max_fps, uncapped=args.uncapped, das=args.das, arr=args.arr)
     
     try:
         # Run the game
@@ -23,6 +67,12 @@ def main():
     except Exception as e:
         print(f"An error occurred: {e}")
     finally:
+        if args.profile and game.profiler is not None:
+            game.profiler.export(args.profile)
+            print(f"Frame timings saved to {args.profile}")
+        if game.recorder is not None:
+            game.recorder.save(args.record)
+            print(f"Replay saved to {args.record}")
         pygame.quit()
         sys.exit()
 
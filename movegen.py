@@ -0,0 +1,184 @@
+"""
+Tetris Move Generator
+Enumerates every distinct lock position a piece can reach on a board
+"""
+
+from collections import deque
+from pieces import PIECE_TYPES, PIECE_BLOCKS, PIECE_ROW_MASKS, PIECE_BOUNDS, ROTATION_COUNTS
+from engine import (WALL_KICKS, ACTION_LEFT, ACTION_RIGHT, ACTION_SOFT_DROP, ACTION_ROTATE_CW,
+                    ACTION_ROTATE_CCW, ACTION_HARD_DROP, ACTION_HOLD)
+
+# Rows above the board a piece may occupy (spawn area and upward kicks)
+SPAWN_ROWS = 4
+
+def _normalized_shapes():
+    """Map (type, rotation) to its cells relative to the bounding box corner."""
+    shapes = {}
+    for piece_type in PIECE_TYPES:
+        for rotation in range(ROTATION_COUNTS[piece_type]):
+            min_x, min_y, _, _ = PIECE_BOUNDS[piece_type][rotation]
+            shapes[piece_type, rotation] = tuple(sorted(
+                (dx - min_x, dy - min_y) for dx, dy in PIECE_BLOCKS[piece_type][rotation]))
+    return shapes
+
+# Rotations with identical cells (O, S, Z, I) share a shape so they deduplicate
+SHAPES = _normalized_shapes()
+
+class Placement:
+    """A reachable lock position for a piece."""
+    
+    __slots__ = ('piece_type', 'rotation', 'x', 'y', 'use_hold', '_state', '_parents')
+    
+    def __init__(self, piece_type, rotation, x, y, use_hold=False, state=None, parents=None):
+        """Initialize a placement."""
+        self.piece_type = piece_type
+        self.rotation = rotation
+        self.x = x
+        self.y = y
+        self.use_hold = use_hold
+        self._state = state
+        self._parents = parents
+    
+    def __repr__(self):
+        """Get a readable representation of the placement."""
+        hold = ', hold' if self.use_hold else ''
+        return f"Placement({self.piece_type}, rot={self.rotation}, x={self.x}, y={self.y}{hold})"
+    
+    def get_blocks(self):
+        """Get the absolute positions of the locked piece's blocks."""
+        return [(self.x + dx, self.y + dy) for dx, dy in PIECE_BLOCKS[self.piece_type][self.rotation]]
+    
+    def get_path(self):
+        """Get the engine actions that reach this placement from its start and lock it."""
+        actions = []
+        state = self._state
+        parents = self._parents
+        
+        while parents is not None and state in parents:
+            state, action = parents[state]
+            actions.append(action)
+        
+        actions.reverse()
+        if self.use_hold:
+            actions.insert(0, ACTION_HOLD)
+        actions.append(ACTION_HARD_DROP)
+        return actions
+
+class MoveGenerator:
+    """Finds reachable placements on one board, caching its collision data."""
+    
+    def __init__(self, board, spawn_x=None):
+        """Initialize the generator for a board."""
+        self.width = board.width
+        self.height = board.height
+        self.spawn_x = board.width // 2 - 2 if spawn_x is None else spawn_x
+        self.rows = board.get_row_masks()
+        
+        # free[mask] has bit (y + SPAWN_ROWS) set when row y does not collide with mask
+        self._free = {}
+        # fits[type, rotation, x] has bit (y + SPAWN_ROWS) set when the piece fits at y
+        self._fits = {}
+    
+    def _free_rows(self, mask):
+        """Get the bitmask of rows a row mask can occupy without collision."""
+        free = self._free.get(mask)
+        if free is None:
+            # Rows above the board are always free, rows below it never are
+            free = (1 << SPAWN_ROWS) - 1
+            bit = 1 << SPAWN_ROWS
+            for row in self.rows:
+                if not row & mask:
+                    free |= bit
+                bit <<= 1
+            self._free[mask] = free
+        return free
+    
+    def fits(self, piece_type, rotation, x):
+        """Get the bitmask of y positions (offset by SPAWN_ROWS) where a piece fits."""
+        key = (piece_type, rotation, x)
+        fits = self._fits.get(key)
+        if fits is None:
+            min_x, _, max_x, _ = PIECE_BOUNDS[piece_type][rotation]
+            if x + min_x < 0 or x + max_x >= self.width:
+                fits = 0
+            else:
+                fits = -1
+                shift = x + min_x
+                for dy, mask in PIECE_ROW_MASKS[piece_type][rotation]:
+                    fits &= self._free_rows(mask << shift) >> dy
+                fits &= (1 << (self.height + SPAWN_ROWS)) - 1
+            self._fits[key] = fits
+        return fits
+    
+    def is_valid(self, piece_type, rotation, x, y):
+        """Check if a piece fits at the given position."""
+        if y < -SPAWN_ROWS:
+            return False
+        return bool(self.fits(piece_type, rotation, x) >> (y + SPAWN_ROWS) & 1)
+    
+    def drop(self, piece_type, rotation, x, y):
+        """Get the lowest y a piece at y can fall to."""
+        column = ~(self.fits(piece_type, rotation, x) >> (y + SPAWN_ROWS))
+        # Count the run of set bits starting at y
+        return y + (column & -column).bit_length() - 2
+    
+    def generate(self, piece_type, use_hold=False, start=None):
+        """Get every distinct placement reachable by a piece from spawn or a (rotation, x, y) start."""
+        if start is None:
+            start = (0, self.spawn_x, 0)
+        if not self.is_valid(piece_type, *start):
+            return []
+        
+        rotations = ROTATION_COUNTS[piece_type]
+        is_valid = self.is_valid
+        parents = {}
+        seen = {start}
+        queue = deque([start])
+        placements = []
+        landed = set()
+        
+        while queue:
+            state = queue.popleft()
+            rotation, x, y = state
+            
+            grounded = not is_valid(piece_type, rotation, x, y + 1)
+            if grounded:
+                key = (SHAPES[piece_type, rotation], x + PIECE_BOUNDS[piece_type][rotation][0],
+                       y + PIECE_BOUNDS[piece_type][rotation][1])
+                if key not in landed:
+                    landed.add(key)
+                    placements.append(Placement(piece_type, rotation, x, y, use_hold, state, parents))
+            
+            # Successor states: shifts, rotations (with the engine's kicks) and a soft drop
+            successors = []
+            if is_valid(piece_type, rotation, x - 1, y):
+                successors.append(((rotation, x - 1, y), ACTION_LEFT))
+            if is_valid(piece_type, rotation, x + 1, y):
+                successors.append(((rotation, x + 1, y), ACTION_RIGHT))
+            if rotations > 1:
+                for action, direction in ((ACTION_ROTATE_CW, 1), (ACTION_ROTATE_CCW, -1)):
+                    new_rotation = (rotation + direction) % rotations
+                    for dx, dy in WALL_KICKS:
+                        if is_valid(piece_type, new_rotation, x + dx, y + dy):
+                            successors.append(((new_rotation, x + dx, y + dy), action))
+                            break
+            if not grounded:
+                successors.append(((rotation, x, y + 1), ACTION_SOFT_DROP))
+            
+            for successor, action in successors:
+                if successor not in seen:
+                    seen.add(successor)
+                    parents[successor] = (state, action)
+                    queue.append(successor)
+        
+        return placements
+
+def generate_placements(board, piece_type, hold_type=None, spawn_x=None, start=None):
+    """Get every distinct reachable lock position for a piece, and for the hold piece if given."""
+    generator = MoveGenerator(board, spawn_x)
+    placements = generator.generate(piece_type, start=start)
+    
+    if hold_type is not None and hold_type != piece_type:
+        placements.extend(generator.generate(hold_type, use_hold=True))
+    
+    return placements
\ No newline at end of file
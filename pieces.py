@@ -138,13 +138,72 @@ PIECES = {
     ]
 }
 
+def _compile_pieces():
+    """Compile the PIECES string grids into offset, mask, bounds and bottom profile tables."""
+    blocks, row_masks, bounds, bottoms = {}, {}, {}, {}
+    
+    for piece_type, rotations in PIECES.items():
+        type_blocks, type_masks, type_bounds, type_bottoms = [], [], [], []
+        
+        # Always build 4 entries so any rotation 0-3 indexes directly
+        for rotation in range(4):
+            shape = rotations[rotation % len(rotations)]
+            offsets = tuple((col_idx, row_idx)
+                            for row_idx, row in enumerate(shape)
+                            for col_idx, cell in enumerate(row[0])
+                            if cell != '.')
+            min_x = min(dx for dx, _ in offsets)
+            max_x = max(dx for dx, _ in offsets)
+            min_y = min(dy for _, dy in offsets)
+            max_y = max(dy for _, dy in offsets)
+            
+            # Row masks are relative to the bounding box's left edge
+            masks = {}
+            for dx, dy in offsets:
+                masks[dy] = masks.get(dy, 0) | 1 << (dx - min_x)
+            
+            # Lowest block offset in each occupied column
+            lowest = {}
+            for dx, dy in offsets:
+                lowest[dx] = max(lowest.get(dx, dy), dy)
+            
+            type_blocks.append(offsets)
+            type_masks.append(tuple(sorted(masks.items())))
+            type_bounds.append((min_x, min_y, max_x, max_y))
+            type_bottoms.append(tuple(sorted(lowest.items())))
+        
+        blocks[piece_type] = tuple(type_blocks)
+        row_masks[piece_type] = tuple(type_masks)
+        bounds[piece_type] = tuple(type_bounds)
+        bottoms[piece_type] = tuple(type_bottoms)
+    
+    return blocks, row_masks, bounds, bottoms
+
+# Precompiled geometry, indexed as TABLE[piece_type][rotation]
+PIECE_TYPES = tuple(PIECES.keys())
+ROTATION_COUNTS = {piece_type: len(rotations) for piece_type, rotations in PIECES.items()}
+PIECE_BLOCKS, PIECE_ROW_MASKS, PIECE_BOUNDS, PIECE_BOTTOMS = _compile_pieces()
+
+# One-byte cell codes: 0 is empty, 1-7 follow PIECE_TYPES, and the last code
+# marks a filled cell of unknown type (garbage, or a color with no piece)
+EMPTY_CODE = 0
+PIECE_CODES = {piece_type: code for code, piece_type in enumerate(PIECE_TYPES, 1)}
+BLOCK_CODE = len(PIECE_TYPES) + 1
+BLOCK_COLOR = (128, 128, 128)
+
+# Render colors by code, and codes by color for loading color grids
+CODE_COLORS = (None,) + tuple(PIECE_COLORS[piece_type] for piece_type in PIECE_TYPES) + (BLOCK_COLOR,)
+COLOR_CODES = {color: code for code, color in enumerate(CODE_COLORS) if color is not None}
+
 class TetrisPiece:
     """Represents a single Tetris piece with position and rotation."""
     
+    __slots__ = ('type', 'x', 'y', 'rotation', 'color')
+    
     def __init__(self, piece_type=None, x=0, y=0):
         """Initialize a Tetris piece."""
         if piece_type is None:
-            piece_type = random.choice(list(PIECES.keys()))
+            piece_type = random.choice(PIECE_TYPES)
         
         self.type = piece_type
         self.x = x
@@ -157,27 +216,22 @@ class TetrisPiece:
         rotations = PIECES[self.type]
         return rotations[self.rotation % len(rotations)]
     
+    def get_offsets(self):
+        """Get the precompiled block offsets for the current rotation."""
+        return PIECE_BLOCKS[self.type][self.rotation]
+    
     def get_blocks(self):
         """Get the absolute positions of all blocks in this piece."""
-        shape = self.get_shape()
-        blocks = []
-        
-        for row_idx, row in enumerate(shape):
-            for col_idx, cell in enumerate(row[0]):  # row is a list with one string
-                if cell != '.':
-                    blocks.append((self.x + col_idx, self.y + row_idx))
-        
-        return blocks
+        x, y = self.x, self.y
+        return [(x + dx, y + dy) for dx, dy in PIECE_BLOCKS[self.type][self.rotation]]
     
     def rotate_clockwise(self):
         """Rotate the piece clockwise."""
-        rotations = PIECES[self.type]
-        self.rotation = (self.rotation + 1) % len(rotations)
+        self.rotation = (self.rotation + 1) % ROTATION_COUNTS[self.type]
     
     def rotate_counterclockwise(self):
         """Rotate the piece counterclockwise."""
-        rotations = PIECES[self.type]
-        self.rotation = (self.rotation - 1) % len(rotations)
+        self.rotation = (self.rotation - 1) % ROTATION_COUNTS[self.type]
     
     def move(self, dx, dy):
         """Move the piece by the given offset."""
@@ -186,12 +240,18 @@ class TetrisPiece:
     
     def copy(self):
         """Create a copy of this piece."""
-        new_piece = TetrisPiece(self.type, self.x, self.y)
+        new_piece = TetrisPiece.__new__(TetrisPiece)
+        new_piece.type = self.type
+        new_piece.x = self.x
+        new_piece.y = self.y
         new_piece.rotation = self.rotation
+        new_piece.color = self.color
         return new_piece
 
-def get_random_piece():
-    """Get a random Tetris piece."""
+def get_random_piece(randomizer=None):
+    """Get a random Tetris piece, drawn from a randomizer.Randomizer if given."""
+    if randomizer is not None:
+        return TetrisPiece(randomizer.next())
     return TetrisPiece()
 
 def get_piece_preview_shape(piece_type):
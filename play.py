@@ -61,8 +61,8 @@ def main():
             from tetris import TetrisGame
             import pygame
             
-            pygame.init()
-            game = TetrisGame()
+            # The game initializes the pygame modules it needs (and the mixer only with audio)
+            game = TetrisGame(audio='--no-audio' not in sys.argv[1:])
             game.run()
             
         except KeyboardInterrupt:
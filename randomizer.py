@@ -0,0 +1,155 @@
+"""
+Tetris Randomizers
+Seeded piece sequence policies (uniform, 7-bag, history) with batched generation
+"""
+
+import random
+from pieces import PIECE_TYPES
+
+# Randomizer policies
+POLICY_UNIFORM = 'uniform'
+POLICY_BAG = 'bag'
+POLICY_HISTORY = 'history'
+DEFAULT_POLICY = POLICY_BAG
+
+class Randomizer:
+    """Independent uniform draws from a per-game RNG."""
+    
+    policy = POLICY_UNIFORM
+    
+    def __init__(self, seed=None):
+        """Initialize the randomizer."""
+        self.rng = random.Random(seed)
+        self.reset(seed)
+    
+    def reset(self, seed=None):
+        """Restart the sequence, optionally reseeding."""
+        if seed is not None:
+            self.rng.seed(seed)
+    
+    def next(self):
+        """Get the next piece type."""
+        return PIECE_TYPES[int(self.rng.random() * len(PIECE_TYPES))]
+    
+    def generate(self, count):
+        """Get the next count piece types."""
+        rng_random = self.rng.random
+        size = len(PIECE_TYPES)
+        return [PIECE_TYPES[int(rng_random() * size)] for _ in range(count)]
+    
+    def getstate(self):
+        """Get a snapshot of the sequence state for setstate."""
+        return self.rng.getstate(), None
+    
+    def setstate(self, state):
+        """Restore a snapshot from getstate."""
+        self.rng.setstate(state[0])
+
+class BagRandomizer(Randomizer):
+    """Deals each piece type once per shuffled bag of seven."""
+    
+    policy = POLICY_BAG
+    
+    def reset(self, seed=None):
+        """Restart the sequence with an empty bag, optionally reseeding."""
+        super().reset(seed)
+        # Remaining pieces of the current bag, dealt from the end
+        self.bag = []
+    
+    def _refill(self):
+        """Shuffle a fresh bag."""
+        self.bag = list(PIECE_TYPES)
+        self.rng.shuffle(self.bag)
+    
+    def next(self):
+        """Get the next piece type."""
+        if not self.bag:
+            self._refill()
+        return self.bag.pop()
+    
+    def generate(self, count):
+        """Get the next count piece types."""
+        pieces = []
+        while len(pieces) < count:
+            if not self.bag:
+                self._refill()
+            # Deal from the end of the bag, in the same order as next()
+            take = min(count - len(pieces), len(self.bag))
+            pieces.extend(reversed(self.bag[-take:]))
+            del self.bag[-take:]
+        return pieces
+    
+    def getstate(self):
+        """Get a snapshot of the sequence state for setstate."""
+        return self.rng.getstate(), tuple(self.bag)
+    
+    def setstate(self, state):
+        """Restore a snapshot from getstate."""
+        self.rng.setstate(state[0])
+        self.bag = list(state[1])
+
+class HistoryRandomizer(Randomizer):
+    """Rerolls draws that repeat one of the last few pieces."""
+    
+    policy = POLICY_HISTORY
+    
+    def __init__(self, seed=None, history_size=4, rolls=4):
+        """Initialize the randomizer."""
+        self.history_size = history_size
+        self.rolls = rolls
+        super().__init__(seed)
+    
+    def reset(self, seed=None):
+        """Restart the sequence with an empty history, optionally reseeding."""
+        super().reset(seed)
+        self.history = []
+    
+    def next(self):
+        """Get the next piece type."""
+        rng_random = self.rng.random
+        size = len(PIECE_TYPES)
+        for _ in range(self.rolls):
+            piece_type = PIECE_TYPES[int(rng_random() * size)]
+            if piece_type not in self.history:
+                break
+        
+        self.history.append(piece_type)
+        if len(self.history) > self.history_size:
+            del self.history[0]
+        return piece_type
+    
+    def generate(self, count):
+        """Get the next count piece types."""
+        return [self.next() for _ in range(count)]
+    
+    def getstate(self):
+        """Get a snapshot of the sequence state for setstate."""
+        return self.rng.getstate(), tuple(self.history)
+    
+    def setstate(self, state):
+        """Restore a snapshot from getstate."""
+        self.rng.setstate(state[0])
+        self.history = list(state[1])
+
+RANDOMIZERS = {
+    POLICY_UNIFORM: Randomizer,
+    POLICY_BAG: BagRandomizer,
+    POLICY_HISTORY: HistoryRandomizer,
+}
+
+def create_randomizer(policy=DEFAULT_POLICY, seed=None):
+    """Create a randomizer for a policy name."""
+    if policy not in RANDOMIZERS:
+        raise ValueError(f"Unknown randomizer policy: {policy}")
+    return RANDOMIZERS[policy](seed)
+
+def generate_batch(seeds, count, policy=DEFAULT_POLICY):
+    """Get an array (len(seeds), count) of PIECE_TYPES indices, one seeded sequence per row."""
+    import numpy as np
+    
+    index = {piece_type: i for i, piece_type in enumerate(PIECE_TYPES)}
+    sequences = np.empty((len(seeds), count), dtype=np.int8)
+    for row, seed in enumerate(seeds):
+        types = create_randomizer(policy, seed).generate(count)
+        sequences[row] = [index[piece_type] for piece_type in types]
+    return sequences
\ No newline at end of file
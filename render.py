@@ -0,0 +1,157 @@
+"""
+Tetris Dirty-Region Renderer
+Redraws only the board cells and HUD fields that changed, over a cached static background
+"""
+
+import pygame
+from pieces import CODE_COLORS
+
+# Alpha used for the ghost piece
+GHOST_ALPHA = 64
+
+class DirtyRenderer:
+    """Draws TetrisGame frames by pushing only changed rectangles to the display."""
+    
+    def __init__(self, game, board_x, board_y, cell_size):
+        """Initialize the renderer for a game whose board is drawn at (board_x, board_y)."""
+        self.game = game
+        self.board_x = board_x
+        self.board_y = board_y
+        self.cell_size = cell_size
+        self.background = None
+        
+        # What is currently on screen: per-cell (color, alpha) or None, and per-field values
+        self.cells = None
+        self.board_key = None
+        self.field_values = {}
+        
+        # Statistics for the last frame
+        self.dirty_rects = 0
+        self.dirty_area = 0
+    
+    def invalidate(self):
+        """Force a full repaint on the next frame (e.g. after an overlay or window expose)."""
+        self.cells = None
+    
+    def _build_background(self):
+        """Render the static frame (border, grid lines, labels, controls) once."""
+        game = self.game
+        game.screen.fill((0, 0, 0))
+        game.draw_grid()
+        game.draw_labels()
+        self.background = game.screen.copy()
+    
+    def _get_fields(self):
+        """Get (name, value, rect, draw function) for each HUD field."""
+        game = self.game
+        fields = [
+            ('stats', (game.score, game.lines_cleared, game.level),
+             pygame.Rect(450, 100, 350, 110), game.draw_stats),
+            ('next', game.next_piece.type, pygame.Rect(470, 270, 80, 80), game.draw_next_piece),
+            ('queue', tuple(piece.type for piece in game.preview),
+             pygame.Rect(640, 270, 60, 55 * max(0, len(game.preview) - 2) + 60), game.draw_queue),
+            ('hold', game.hold_piece.type if game.hold_piece else None,
+             pygame.Rect(450, 370, 190, 110), game.draw_hold),
+        ]
+        
+        bot = getattr(game.controller, 'bot', None)
+        if bot is not None:
+            fields.append(('bot', int(bot.nodes_per_second), pygame.Rect(450, 60, 350, 24),
+                           game.draw_bot_stats))
+        return fields
+    
+    def _get_cells(self):
+        """Get the (color, alpha) shown in each board cell, or None when empty."""
+        game = self.game
+        board = game.board
+        codes = board.get_cells()
+        width = board.width
+        cells = [[(CODE_COLORS[code], 255) if code else None for code in codes[start:start + width]]
+                 for start in range(0, len(codes), width)]
+        
+        piece = game.current_piece
+        for shown, alpha in ((board.get_ghost_piece(piece), GHOST_ALPHA), (piece, 255)):
+            for x, y in shown.get_blocks():
+                if 0 <= x < board.width and 0 <= y < board.height:
+                    cells[y][x] = (shown.color, alpha)
+        return cells
+    
+    def _cell_rect(self, x, y):
+        """Get the screen rectangle of a board cell."""
+        size = self.cell_size
+        return pygame.Rect(self.board_x + x * size, self.board_y + y * size, size, size)
+    
+    def _draw_cell(self, rect, cell):
+        """Restore the background under a cell and draw its contents."""
+        screen = self.game.screen
+        screen.blit(self.background, rect, rect)
+        if cell is None:
+            return
+        
+        color, alpha = cell
+        screen.blit(self.game.sprites.get(color, alpha, self.cell_size), rect)
+    
+    def _board_key(self):
+        """Get a cheap key that changes whenever the board cells on screen may change."""
+        game = self.game
+        piece = game.current_piece
+        return (game.board.hash, game.engine.pieces_placed,
+                piece.type, piece.x, piece.y, piece.rotation)
+    
+    def draw(self):
+        """Draw a frame of the game in progress."""
+        game = self.game
+        if self.background is None:
+            self._build_background()
+        
+        screen = game.screen
+        width, height = game.board.width, game.board.height
+        rects = []
+        
+        if self.cells is None:
+            # Full repaint
+            screen.blit(self.background, (0, 0))
+            self.cells = self._get_cells()
+            self.board_key = self._board_key()
+            for y in range(height):
+                for x in range(width):
+                    if self.cells[y][x] is not None:
+                        self._draw_cell(self._cell_rect(x, y), self.cells[y][x])
+            for name, value, rect, draw_field in self._get_fields():
+                self.field_values[name] = value
+                draw_field()
+            pygame.display.flip()
+            self.dirty_rects = 1
+            self.dirty_area = screen.get_width() * screen.get_height()
+            return
+        
+        board_key = self._board_key()
+        if board_key != self.board_key:
+            self.board_key = board_key
+            cells = self._get_cells()
+            old_cells = self.cells
+            for y in range(height):
+                row = cells[y]
+                old_row = old_cells[y]
+                if row == old_row:
+                    continue
+                for x in range(width):
+                    if row[x] != old_row[x]:
+                        rect = self._cell_rect(x, y)
+                        self._draw_cell(rect, row[x])
+                        rects.append(rect)
+            self.cells = cells
+        
+        for name, value, rect, draw_field in self._get_fields():
+            if self.field_values.get(name) != value:
+                self.field_values[name] = value
+                screen.blit(self.background, rect, rect)
+                screen.set_clip(rect)
+                draw_field()
+                screen.set_clip(None)
+                rects.append(rect)
+        
+        if rects:
+            pygame.display.update(rects)
+        self.dirty_rects = len(rects)
+        self.dirty_area = sum(rect.width * rect.height for rect in rects)
\ No newline at end of file
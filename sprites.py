@@ -0,0 +1,52 @@
+"""
+Tetris Block Sprites
+Prebuilt block surfaces shared by the board, piece, ghost and preview renderers
+"""
+
+import pygame
+
+# Outline drawn around every block
+BORDER_COLOR = (255, 255, 255)
+
+class SpriteAtlas:
+    """Cache of bordered block surfaces keyed by color, alpha and cell size."""
+    
+    def __init__(self, border_color=BORDER_COLOR):
+        """Initialize an empty atlas."""
+        self.border_color = border_color
+        self.sprites = {}
+    
+    def __len__(self):
+        """Get the number of cached sprites."""
+        return len(self.sprites)
+    
+    def get(self, color, alpha=255, size=30):
+        """Get the block sprite for a color, alpha and size, building it on first use."""
+        key = (tuple(color), alpha, size)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self.sprites[key] = self._build(*key)
+        return sprite
+    
+    def _build(self, color, alpha, size):
+        """Render a filled block with an opaque outline."""
+        if alpha >= 255:
+            sprite = pygame.Surface((size, size))
+            sprite.fill(color)
+        else:
+            # Per-pixel alpha keeps the outline opaque over a translucent fill
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            sprite.fill((*color, alpha))
+        pygame.draw.rect(sprite, self.border_color, sprite.get_rect(), 1)
+        
+        # Match the display's pixel format so blits need no conversion
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert() if alpha >= 255 else sprite.convert_alpha()
+        return sprite
+    
+    def blit_blocks(self, surface, blocks, color, origin, size, alpha=255):
+        """Blit one sprite at each (column, row) cell of a grid whose corner is at origin."""
+        sprite = self.get(color, alpha, size)
+        origin_x, origin_y = origin
+        surface.blits([(sprite, (origin_x + x * size, origin_y + y * size)) for x, y in blocks],
+                      doreturn=False)
\ No newline at end of file
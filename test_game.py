@@ -62,21 +62,908 @@ def test_basic_functionality():
         print(f"❌ Functionality test error: {e}")
         return False
 
+def test_bitboard_backend():
+    """Test that the bitboard backend matches TetrisBoard."""
+    try:
+        from pieces import TetrisPiece
+        from board import TetrisBoard
+        from bitboard import BitBoard
+        
+        board = TetrisBoard()
+        bitboard = BitBoard()
+        
+        # Fill the bottom row except one gap, then drop an I piece into it
+        for x in range(0, 8, 4):
+            piece = TetrisPiece('I', x, 17)
+            board.place_piece(piece)
+            bitboard.place_piece(piece)
+        piece = TetrisPiece('O', 7, 17)
+        for b in (board, bitboard):
+            b.place_piece(b.get_ghost_piece(piece))
+        
+        assert board.get_cells() == bitboard.get_cells()
+        assert board.get_height_map() == bitboard.get_height_map()
+        assert board.get_holes_count() == bitboard.get_holes_count()
+        assert board.clear_lines() == bitboard.clear_lines() == 1
+        assert board.get_cells() == bitboard.copy().get_cells()
+        print("✅ Bitboard matches TetrisBoard")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Bitboard test error: {e}")
+        return False
+
+def test_headless_engine():
+    """Test that the headless engine is deterministic and pygame-free."""
+    try:
+        import random
+        from engine import TetrisEngine, NUM_ACTIONS
+        
+        results = []
+        for _ in range(2):
+            engine = TetrisEngine(seed=42)
+            actions = random.Random(7)
+            while not engine.game_over:
+                engine.step(actions.randrange(NUM_ACTIONS), 16)
+            results.append((engine.score, engine.lines_cleared, engine.pieces_placed,
+                            engine.board.grid))
+        
+        assert results[0] == results[1]
+        print(f"✅ Seeded engine replayed identically: score {results[0][0]}")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Engine test error: {e}")
+        return False
+
+def test_vector_engine():
+    """Test that the batched engine matches single-board semantics."""
+    try:
+        import numpy as np
+        from board import TetrisBoard
+        from pieces import PIECE_TYPES, TetrisPiece
+        from vector_engine import VectorEngine
+        from engine import ACTION_HARD_DROP
+        
+        games = VectorEngine(8, seed=1)
+        board = TetrisBoard()
+        
+        # Same piece hard-dropped on an empty board lands identically
+        piece = TetrisPiece(PIECE_TYPES[games.piece_type[0]], games.spawn_x, 0)
+        board.place_piece(board.get_ghost_piece(piece))
+        games.step(np.full(8, ACTION_HARD_DROP))
+        
+        occupied = [[cell is not None for cell in row] for row in board.grid]
+        assert (games.boards[0] != 0).tolist() == occupied
+        assert games.get_height_map()[0].tolist() == board.get_height_map()
+        assert games.get_holes_count()[0] == board.get_holes_count()
+        print(f"✅ Batched hard drop matches TetrisBoard: {games.pieces_placed.sum()} pieces placed")
+        
+        # Games that top out are reset automatically
+        for _ in range(200):
+            games.step(np.full(8, ACTION_HARD_DROP))
+        assert not games.game_over.any()
+        print("✅ Batched games auto-reset after game over")
+        
+        # Each game deals from its own queue with the engine's default 7-bag policy
+        games = VectorEngine(4, seed=3)
+        assert (games.piece_type == games.queue[:, 0]).all()
+        assert (games.next_type == games.queue[:, 1]).all()
+        assert (np.sort(games.queue[:, :7], axis=1) == np.arange(7)).all()
+        uniform = VectorEngine(4, seed=3, randomizer='uniform')
+        assert uniform.randomizer == 'uniform'
+        print("✅ Batched games deal pieces from seeded randomizer queues")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Vector engine test error: {e}")
+        return False
+
+def test_move_generator():
+    """Test reachable-placement enumeration."""
+    try:
+        from board import TetrisBoard
+        from engine import TetrisEngine
+        from movegen import generate_placements
+        
+        board = TetrisBoard()
+        counts = {t: len(generate_placements(board, t)) for t in 'IOTSZJL'}
+        assert counts == {'I': 17, 'O': 9, 'T': 34, 'S': 17, 'Z': 17, 'J': 34, 'L': 34}
+        print(f"✅ Empty-board placement counts: {counts}")
+        
+        # Every path replays through the engine to its placement
+        engine = TetrisEngine(seed=3)
+        start = engine.current_piece.copy()
+        for placement in generate_placements(engine.board, start.type):
+            engine.current_piece = start.copy()
+            for action in placement.get_path()[:-1]:
+                engine.step(action)
+            assert sorted(engine.current_piece.get_blocks()) == sorted(placement.get_blocks())
+        print("✅ Placement paths replay through the engine")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Move generator test error: {e}")
+        return False
+
+def test_board_features():
+    """Test the single-pass and batched feature extractors."""
+    try:
+        import numpy as np
+        from board import TetrisBoard
+        from pieces import TetrisPiece
+        from features import extract_features, extract_features_batch
+        
+        board = TetrisBoard()
+        for piece in (TetrisPiece('O', -1, 17), TetrisPiece('T', 3, 17), TetrisPiece('I', 5, 15)):
+            board.place_piece(piece)
+        
+        features = extract_features(board)
+        assert features['heights'] == board.get_height_map()
+        assert features['holes'] == board.get_holes_count()
+        print(f"✅ Single-pass features: {features}")
+        
+        stack = np.array([[[cell is not None for cell in row] for row in board.grid]] * 3)
+        batch = extract_features_batch(stack)
+        for name, value in features.items():
+            assert np.array_equal(batch[name][2], value)
+        print("✅ Batched features match single-pass features")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Feature test error: {e}")
+        return False
+
+def test_beam_search_bot():
+    """Test make/unmake moves and the beam-search bot."""
+    try:
+        from bitboard import BitBoard
+        from engine import TetrisEngine
+        from bot import BeamSearchBot
+        
+        # Place and clear a line, then undo it
+        board = BitBoard()
+        board.rows[19] = 0b0111111111
+        before = (board.get_row_masks(), [row[:] for row in board.colors])
+        record = board.place_and_clear('I', 1, 7, 16)
+        assert record[3] == 1 and board.rows[19] == 0b1000000000
+        board.undo(record)
+        assert (board.get_row_masks(), board.colors) == before
+        print("✅ Place/clear undo restores the board")
+        
+        engine = TetrisEngine(seed=11)
+        bot = BeamSearchBot(depth=2, beam_width=4)
+        while not engine.game_over and engine.pieces_placed < 40:
+            for action in bot.choose(engine).get_path():
+                engine.step(action)
+        assert not engine.game_over and engine.lines_cleared > 0
+        print(f"✅ Bot cleared {engine.lines_cleared} lines at {bot.nodes_per_second:,.0f} nodes/s")
+        print(f"✅ Evaluation cache hit rate {bot.table.hit_rate:.0%}")
+        
+        # Every chosen path, hold moves included, locks the piece where the placement says
+        engine = TetrisEngine(seed=2)
+        bot = BeamSearchBot(depth=1, beam_width=4)
+        holds = 0
+        while not engine.game_over and engine.pieces_placed < 60:
+            placement = bot.choose(engine)
+            path = placement.get_path()
+            for action in path[:-1]:
+                engine.step(action)
+            piece = engine.current_piece
+            assert sorted(engine.board.get_ghost_piece(piece).get_blocks()) == sorted(placement.get_blocks())
+            engine.step(path[-1])
+            holds += placement.use_hold
+        assert not engine.game_over and holds > 0
+        print(f"✅ Chosen paths reach their placements ({holds} with hold)")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Bot test error: {e}")
+        return False
+
+def test_zobrist_hashing():
+    """Test incremental board hashes and the transposition table."""
+    try:
+        from board import TetrisBoard
+        from bitboard import BitBoard
+        from pieces import TetrisPiece
+        from zobrist import TranspositionTable, EVICT_DEPTH
+        
+        # Hashes stay equal to a full recompute through placements and clears
+        for board_class in (TetrisBoard, BitBoard):
+            board = board_class()
+            for x in (0, 4):
+                piece = TetrisPiece('I', x, 18)
+                board.place_piece(piece)
+                assert board.hash == board.compute_hash()
+            board.place_piece(TetrisPiece('O', 7, 17))
+            assert board.clear_lines() == 1
+            assert board.hash == board.compute_hash() and board.hash != 0
+        
+        bitboard = BitBoard()
+        record = bitboard.place_and_clear('T', 0, 3, 17)
+        placed_hash = bitboard.hash
+        assert placed_hash == bitboard.compute_hash()
+        bitboard.undo(record)
+        assert bitboard.hash == 0
+        print("✅ Incremental hashes match full recomputes")
+        
+        # Bounded tables evict the least recently used or shallowest entry
+        table = TranspositionTable(max_entries=2)
+        table.store(1, 'a')
+        table.store(2, 'b')
+        assert table.get(1) == 'a'
+        table.store(3, 'c')
+        assert table.get(2) is None and table.get(1) == 'a' and len(table) == 2
+        
+        table = TranspositionTable(max_entries=2, policy=EVICT_DEPTH)
+        table.store(1, 'deep', depth=3)
+        table.store(2, 'shallow', depth=1)
+        table.store(3, 'new', depth=2)
+        assert table.get(2) is None and table.get(1, depth=2) == 'deep'
+        assert table.get(3, depth=3) is None
+        stats = table.get_stats()
+        assert stats['evictions'] == 1 and stats['hits'] == 1 and stats['misses'] == 2
+        print("✅ Transposition table bounds and eviction")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Zobrist test error: {e}")
+        return False
+
+def test_randomizer():
+    """Test seeded randomizer policies and the preview queue."""
+    try:
+        from randomizer import create_randomizer, RANDOMIZERS
+        from pieces import PIECE_TYPES
+        from engine import TetrisEngine, ACTION_HARD_DROP
+        
+        for policy in RANDOMIZERS:
+            first = create_randomizer(policy, seed=3)
+            second = create_randomizer(policy, seed=3)
+            sequence = [first.next() for _ in range(10)] + first.generate(20)
+            assert sequence == second.generate(30)
+            
+            # Restoring a snapshot replays the same pieces
+            state = first.getstate()
+            upcoming = first.generate(9)
+            first.setstate(state)
+            assert first.generate(9) == upcoming
+        print("✅ Seeded sequences are reproducible and restorable")
+        
+        bag = create_randomizer('bag', seed=4).generate(35)
+        assert all(sorted(bag[i:i + 7]) == sorted(PIECE_TYPES) for i in range(0, 35, 7))
+        print("✅ 7-bag deals every piece once per bag")
+        
+        engine = TetrisEngine(seed=5, preview_count=4)
+        upcoming = [piece.type for piece in engine.preview]
+        assert len(upcoming) == 4 and engine.next_piece.type == upcoming[0]
+        engine.step(ACTION_HARD_DROP)
+        assert engine.current_piece.type == upcoming[0]
+        assert [piece.type for piece in engine.preview][:3] == upcoming[1:]
+        print("✅ Preview queue advances")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Randomizer test error: {e}")
+        return False
+
+def test_replay():
+    """Test recording, verifying and seeking replays."""
+    try:
+        import random
+        from engine import TetrisEngine
+        from replay import Replay, ReplayRecorder
+        
+        engine = TetrisEngine()
+        recorder = ReplayRecorder(engine, seed=21, snapshot_interval=50)
+        inputs = random.Random(2)
+        while not engine.game_over and recorder.step_count < 400:
+            recorder.step(inputs.choice([0, 0, 0, 1, 2, 4]), 16)
+        
+        version = engine.board.version
+        data = recorder.get_replay().to_bytes()
+        replay = Replay.from_bytes(data)
+        assert engine.board.version == version
+        assert replay.steps == recorder.step_count and replay.snapshots
+        print(f"✅ Recorded {replay.steps} steps in {len(data)} bytes")
+        
+        assert replay.verify() == []
+        replay.footer['score'] += 1
+        assert replay.verify() != []
+        print("✅ Replay verification detects mismatches")
+        
+        target = replay.snapshots[0][0] + 7
+        sought = replay.seek(target)
+        played = replay.play(stop=target)
+        assert sought.get_state() == played.get_state()
+        print("✅ Seeking from snapshots matches full re-simulation")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Replay test error: {e}")
+        return False
+
+def test_dirty_renderer():
+    """Test that dirty-region frames match full redraws."""
+    try:
+        import random
+        import pygame
+        from tetris import TetrisGame, GAME_STATE_PLAYING
+        
+        game = TetrisGame(seed=8, dirty_rendering=True)
+        game.state = GAME_STATE_PLAYING
+        renderer = game.renderer
+        inputs = random.Random(8)
+        
+        for _ in range(120):
+            game.apply_action(inputs.choice([0, 0, 1, 2, 4, 6]), 16)
+            if game.state != GAME_STATE_PLAYING:
+                break
+            game.draw()
+            dirty_frame = pygame.image.tostring(game.screen, 'RGB')
+            
+            # Redraw the same frame the normal way and compare pixels
+            game.renderer = None
+            game.draw()
+            game.renderer = renderer
+            assert pygame.image.tostring(game.screen, 'RGB') == dirty_frame
+        
+        print(f"✅ Dirty frames match full redraws (last frame pushed {renderer.dirty_rects} rects)")
+        return True
+    except Exception as e:
+        print(f"❌ Dirty renderer test error: {e}")
+        return False
+
+def test_sprite_atlas():
+    """Test that block sprites are built once and reused."""
+    try:
+        from tetris import TetrisGame, GAME_STATE_PLAYING
+        
+        game = TetrisGame(seed=6)
+        game.state = GAME_STATE_PLAYING
+        atlas = game.sprites
+        
+        sprite = atlas.get((255, 0, 0), 64, 30)
+        assert atlas.get((255, 0, 0), 64, 30) is sprite
+        assert sprite.get_at((0, 0))[:3] == (255, 255, 255)
+        
+        for _ in range(30):
+            game.hard_drop()
+            game.draw()
+        built = len(atlas)
+        for _ in range(5):
+            game.draw()
+        assert len(atlas) == built
+        print(f"✅ {built} sprites cover every block drawn")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Sprite atlas test error: {e}")
+        return False
+
+def test_text_cache():
+    """Test cached text rendering and digit glyph composition."""
+    try:
+        import pygame
+        from text_cache import TextCache
+        
+        pygame.font.init()
+        font = pygame.font.Font(None, 32)
+        cache = TextCache(max_entries=4)
+        
+        label = cache.render(font, "Next:", (255, 0, 255))
+        assert cache.render(font, "Next:", (255, 0, 255)) is label
+        print("✅ Repeated text reuses the cached surface")
+        
+        surface = pygame.Surface((300, 40))
+        for score in (120, 340):
+            cache.blit_number(surface, font, "Score: ", score, (0, 255, 0), (0, 0))
+        assert cache.misses == 7 and cache.evictions == 3 and len(cache) == 4
+        print(f"✅ Glyph composition and LRU bound ({cache.get_stats()['evictions']} evictions)")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Text cache test error: {e}")
+        return False
+
+def test_sound_synthesis():
+    """Test vectorized synthesis and the on-disk waveform cache."""
+    try:
+        import math
+        import tempfile
+        import numpy as np
+        from audio import synthesize_tone, load_waveforms, SOUND_SPECS
+        
+        # Matches a per-sample reference (sine with 10ms fades)
+        samples = synthesize_tone(440, 0.05, 8000)
+        frames = len(samples)
+        for i in (0, 40, 200, frames - 1):
+            envelope = min(1.0, i / 80, (frames - i) / 80)
+            expected = int(math.sin(2 * math.pi * 440 * i / 8000) * envelope * 0.3 * 32767)
+            assert abs(int(samples[i]) - expected) <= 1
+        print("✅ Vectorized tone matches the reference")
+        
+        with tempfile.TemporaryDirectory() as cache_dir:
+            fresh = load_waveforms(sample_rate=8000, cache_dir=cache_dir)
+            cached = load_waveforms(sample_rate=8000, cache_dir=cache_dir)
+            assert set(cached) == set(SOUND_SPECS)
+            assert all(isinstance(cached[name], np.memmap) for name in cached)
+            assert all(np.array_equal(fresh[name], cached[name]) for name in fresh)
+            del cached
+        print("✅ Waveforms reload from the memory-mapped cache")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Sound synthesis test error: {e}")
+        return False
+
+def test_frame_profiler():
+    """Test frame timing collection, export and the overlay."""
+    try:
+        import csv
+        import json
+        import os
+        import tempfile
+        from instrumentation import FrameProfiler, PHASES
+        from tetris import TetrisGame, GAME_STATE_PLAYING
+        
+        profiler = FrameProfiler(capacity=4)
+        for _ in range(6):
+            profiler.begin_frame()
+            for phase in PHASES:
+                profiler.mark(phase)
+            profiler.end_frame()
+        stats = profiler.get_stats()
+        assert stats['frames'] == 6 and stats['window_frames'] == 4
+        assert set(PHASES) <= set(stats) and 'p99' in stats['draw']
+        print("✅ Ring buffer keeps the latest frames")
+        
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, 'frames.csv')
+            json_path = os.path.join(directory, 'frames.json')
+            profiler.export(csv_path)
+            profiler.export(json_path)
+            with open(csv_path, newline='') as f:
+                assert len(list(csv.DictReader(f))) == 4
+            with open(json_path) as f:
+                assert json.load(f)['summary']['frames'] == 6
+        print("✅ CSV and JSON export")
+        
+        game = TetrisGame(seed=2, audio=False)
+        game.state = GAME_STATE_PLAYING
+        game.toggle_profiler_overlay()
+        game.draw()
+        assert game.profiler is not None and game.profiler_lines
+        print("✅ Overlay draws")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Frame profiler test error: {e}")
+        return False
+
+def test_benchmarks():
+    """Test the benchmark harness and baseline comparison."""
+    try:
+        import os
+        import tempfile
+        from benchmark import BENCHMARKS, run_benchmarks, compare, make_baseline, save_report, load_report
+        
+        names = ['board.is_valid_position', 'board.get_ghost_piece', 'piece.get_blocks']
+        report = run_benchmarks(names, repeat=2, min_time=0.001)
+        assert list(report['results']) == names
+        assert all(result['us_per_op'] > 0 for result in report['results'].values())
+        assert 'render.full_frame' in BENCHMARKS and 'game.random' in BENCHMARKS
+        print("✅ Benchmarks run")
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            save_report(make_baseline(report), path)
+            baseline = load_report(path)
+        assert all(set(result) == {'relative', 'ops'} for result in baseline['results'].values())
+        ratios, regressions = compare(report, baseline)
+        assert regressions == [] and all(abs(ratio - 1) < 1e-9 for ratio in ratios.values())
+        
+        faster = {'results': {name: dict(result, relative=result['relative'] / 2)
+                              for name, result in report['results'].items()}}
+        ratios, regressions = compare(report, faster, threshold=0.25)
+        assert regressions == names
+        print("✅ Regressions detected against a baseline")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Benchmark test error: {e}")
+        return False
+
+def test_drop_distance():
+    """Test analytic drop distances, the ghost cache and single-step hard drops."""
+    try:
+        import random
+        from board import TetrisBoard
+        from bitboard import BitBoard
+        from pieces import TetrisPiece, PIECE_TYPES, ROTATION_COUNTS
+        from engine import (TetrisEngine, ACTION_HARD_DROP, ACTION_HOLD, EVENT_MOVE, EVENT_DROP,
+                            EVENT_GAME_OVER)
+        
+        rng = random.Random(3)
+        checked = 0
+        for _ in range(200):
+            grid = [[(255, 0, 0) if rng.random() < y / 30 else None for _ in range(10)]
+                    for y in range(20)]
+            for board_class in (TetrisBoard, BitBoard):
+                board = board_class()
+                board.load_grid(grid)
+                piece_type = rng.choice(PIECE_TYPES)
+                piece = TetrisPiece(piece_type, rng.randrange(-1, 9), rng.randrange(-2, 18))
+                piece.rotation = rng.randrange(ROTATION_COUNTS[piece_type])
+                if not board.is_valid_position(piece):
+                    continue
+                
+                # Step down one row at a time for the expected answer
+                stepped = piece.copy()
+                while board.is_valid_position(stepped):
+                    stepped.y += 1
+                assert board.drop_distance(piece) == stepped.y - 1 - piece.y
+                checked += 1
+        assert checked > 100
+        print("✅ Drop distance matches stepping down, including under overhangs")
+        
+        board = TetrisBoard()
+        piece = TetrisPiece('T', 3, 0)
+        ghost = board.get_ghost_piece(piece)
+        assert board.get_ghost_piece(piece) is ghost and ghost.y == 17
+        board.place_piece(ghost)
+        assert board.get_ghost_piece(piece).y == 15
+        piece.x = 0
+        assert board.get_ghost_piece(piece).y == 17
+        print("✅ Ghost is cached until the piece or board changes")
+        
+        engine = TetrisEngine(seed=4)
+        events = engine.step(ACTION_HARD_DROP)
+        assert EVENT_DROP in events and EVENT_MOVE not in events
+        assert engine.pieces_placed == 1 and engine.score > 0
+        print("✅ Hard drop locks in one step without move events")
+        
+        # Swapping in a held piece that is blocked at spawn ends the game before
+        # gravity measures its drop
+        engine = TetrisEngine(seed=4)
+        engine.hold_piece = TetrisPiece('O')
+        engine.current_piece.y = 10
+        engine.board.load_grid([[(128, 128, 128)] * 10 if y < 4 else [None] * 10
+                                for y in range(20)])
+        events = engine.step(ACTION_HOLD, 1000)
+        assert engine.game_over and EVENT_GAME_OVER in events
+        print("✅ A blocked hold swap ends the game")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Drop distance test error: {e}")
+        return False
+
+def test_board_statistics():
+    """Test the incrementally maintained heights, holes and row fills."""
+    try:
+        import random
+        from board import TetrisBoard
+        from engine import TetrisEngine, NUM_ACTIONS, ACTION_HARD_DROP
+        
+        def scan(board):
+            heights, holes = [], 0
+            for x in range(board.width):
+                column = [row[x] is not None for row in board.grid]
+                top = column.index(True) if True in column else board.height
+                heights.append(board.height - top)
+                holes += column[top:].count(False)
+            return heights, holes
+        
+        engine = TetrisEngine(seed=8)
+        actions = random.Random(8)
+        while not engine.game_over:
+            engine.step(actions.choice((actions.randrange(NUM_ACTIONS), ACTION_HARD_DROP)), 16)
+            board = engine.board
+            assert (board.get_height_map(), board.get_holes_count()) == scan(board)
+            assert board.row_counts == [board.width - row.count(None) for row in board.grid]
+        print("✅ Heights, holes and row fills track a whole game")
+        
+        board = TetrisBoard()
+        grid = [[None] * 10 for _ in range(20)]
+        grid[17] = [(255, 0, 0)] * 9 + [None]
+        grid[18] = [(255, 0, 0)] * 10
+        grid[19] = [None] + [(255, 0, 0)] * 9
+        board.load_grid(grid)
+        assert board.get_holes_count() == 1 and board.clear_lines() == 1
+        assert (board.get_height_map(), board.get_holes_count()) == scan(board)
+        print("✅ Full rows are cleared after loading a grid")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Board statistics test error: {e}")
+        return False
+
+def test_idle_loop():
+    """Test that idle screens block on input and only redraw when they change."""
+    try:
+        import pygame
+        from tetris import TetrisGame, GAME_STATE_MENU, GAME_STATE_PLAYING
+        
+        game = TetrisGame(seed=5, audio=False, profile=True)
+        assert game.state == GAME_STATE_MENU
+        pygame.event.clear()
+        game.run_idle(timeout=10)
+        game.run_idle(timeout=10)
+        stats = game.profiler.get_stats()
+        assert stats['idle_wakeups'] == 2 and stats['idle_redraws'] == 1
+        assert stats['idle_seconds'] > 0 and 'idle_cpu_percent' in stats
+        print("✅ Unchanged idle screen is drawn once")
+        
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+        game.run_idle(timeout=10)
+        assert game.state == GAME_STATE_PLAYING and game.profiler.idle_redraws == 2
+        print("✅ Input wakes the idle loop")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Idle loop test error: {e}")
+        return False
+
+def test_fixed_timestep():
+    """Test frame-rate independent gravity and the fixed-tick game loop."""
+    try:
+        from engine import TetrisEngine
+        from tetris import TetrisGame, GAME_STATE_PLAYING
+        
+        # The same time sliced differently gives the same fall
+        coarse = TetrisEngine(seed=6)
+        fine = TetrisEngine(seed=6)
+        for _ in range(60):
+            coarse.step(dt=33)
+        for _ in range(33 * 60):
+            fine.step(dt=1)
+        assert coarse.current_piece.y == fine.current_piece.y == 3
+        assert coarse.fall_time == fine.fall_time == 1980 - 3 * 500
+        print("✅ Gravity keeps its remainder across steps")
+        
+        engine = TetrisEngine(seed=6)
+        events = engine.step(dt=4 * engine.fall_speed)
+        assert engine.current_piece.y == 4 and events.count('move') == 1
+        engine.step(dt=100 * engine.fall_speed)
+        assert engine.pieces_placed == 1 and engine.fall_time == 0
+        print("✅ Several rows fall in one step, and landing locks")
+        
+        game = TetrisGame(seed=6, audio=False)
+        game.state = GAME_STATE_PLAYING
+        game.update(5 * game.tick_ms + game.tick_ms // 2)
+        assert game.ticks == 5 and game.accumulator == game.tick_ms // 2
+        game.update(game.tick_ms // 2)
+        assert game.ticks == 6 and game.accumulator == 0
+        print("✅ Game loop runs the ticks that are due")
+        
+        # Fast-forward without a frame cap still simulates a slice per frame
+        game = TetrisGame(seed=6, audio=False, uncapped=True, max_fps=0)
+        game.state = GAME_STATE_PLAYING
+        game.update(0)
+        assert game.ticks > 1 or game.state != GAME_STATE_PLAYING
+        print(f"✅ Uncapped frames run {game.ticks} ticks")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Fixed timestep test error: {e}")
+        return False
+
+def test_controls():
+    """Test DAS/ARR key repeat and timestamped input handling."""
+    try:
+        import time
+        import pygame
+        from controls import DasInput, INSTANT_REPEATS
+        from pieces import PIECE_BOUNDS
+        from engine import ACTION_LEFT, ACTION_RIGHT, ACTION_SOFT_DROP
+        from tetris import TetrisGame, GAME_STATE_PLAYING
+        
+        controls = DasInput(das=100, arr=20, soft_drop_interval=50)
+        controls.press(ACTION_LEFT, 0)
+        assert controls.poll(99) == []
+        assert controls.poll(100) == [ACTION_LEFT]
+        assert controls.poll(145) == [ACTION_LEFT] * 2
+        controls.press(ACTION_RIGHT, 150)
+        assert controls.poll(249) == [] and controls.poll(250) == [ACTION_RIGHT]
+        controls.release(ACTION_RIGHT, 260)
+        assert controls.poll(359) == [] and controls.poll(360) == [ACTION_LEFT]
+        controls.release(ACTION_LEFT, 365)
+        controls.press(ACTION_SOFT_DROP, 400)
+        assert controls.poll(1000) == [ACTION_SOFT_DROP] * 12
+        print("✅ DAS, ARR and soft drop repeat on time")
+        
+        instant = DasInput(das=0, arr=0)
+        instant.press(ACTION_RIGHT, 0)
+        assert instant.poll(0) == [ACTION_RIGHT] * INSTANT_REPEATS
+        print("✅ Zero ARR moves straight to the wall")
+        
+        game = TetrisGame(seed=7, audio=False, profile=True, das=50, arr=10)
+        game.state = GAME_STATE_PLAYING
+        pygame.event.clear()
+        piece = game.current_piece
+        leftmost = -PIECE_BOUNDS[piece.type][piece.rotation][0]
+        x = piece.x
+        
+        # Held for 80 ms: the press, then repeats at 50, 60, 70 and 80 ms
+        pressed = time.perf_counter() - 1
+        game.pending_events += [(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_LEFT), pressed),
+                                (pygame.event.Event(pygame.KEYUP, key=pygame.K_LEFT), pressed + 0.08)]
+        game.handle_input()
+        assert piece.x == max(leftmost, x - 5) and game.controls.directions == []
+        assert game.input_times == [pressed]
+        print("✅ Timestamped key events drive the piece")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Controls test error: {e}")
+        return False
+
+def test_environment():
+    """Test the reset/step environment and its in-place observations."""
+    try:
+        import numpy as np
+        from env import TetrisEnv, ACTION_MODE_PLACEMENTS, PIECE_CODES
+        from engine import ACTION_LEFT, ACTION_HARD_DROP
+        
+        env = TetrisEnv(seed=3)
+        obs, info = env.reset(seed=3)
+        board = obs['board']
+        try:
+            board[0, 0] = 1
+            assert False, "observation is writable"
+        except ValueError:
+            pass
+        
+        piece_type = env.engine.current_piece.type
+        assert obs['piece'][0] == PIECE_CODES[piece_type]
+        assert obs['queue'].tolist() == [PIECE_CODES[p.type] for p in env.engine.preview]
+        x = obs['piece'][2]
+        obs, reward, terminated, truncated, info = env.step(ACTION_LEFT)
+        assert obs['piece'][2] == x - 1 and obs['board'] is board
+        obs, reward, terminated, truncated, info = env.step(ACTION_HARD_DROP)
+        occupied = [[cell is not None for cell in row] for row in env.engine.board.grid]
+        assert board.astype(bool).tolist() == occupied and board.sum() == 4
+        assert reward > 0 and info['pieces_placed'] == 1
+        print("✅ Input steps update the read-only observation in place")
+        
+        # Same seed, same game
+        first = TetrisEnv(seed=1)
+        second = TetrisEnv(seed=2)
+        first.reset(seed=9)
+        second.reset(seed=9)
+        assert (first.observation['queue'] == second.observation['queue']).all()
+        
+        env = TetrisEnv(ACTION_MODE_PLACEMENTS, seed=5, max_steps=10)
+        obs, info = env.reset(seed=5)
+        rng = np.random.RandomState(0)
+        for _ in range(10):
+            assert obs['action_mask'].any()
+            obs, reward, terminated, truncated, info = env.step(env.sample_action(rng))
+        assert truncated and not terminated and info['pieces_placed'] == 10
+        assert obs['board'].astype(bool).tolist() == [[cell is not None for cell in row]
+                                                      for row in env.engine.board.grid]
+        print(f"✅ Placement steps lock one piece each ({int(obs['board'].sum())} cells filled)")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Environment test error: {e}")
+        return False
+
+def test_compact_cells():
+    """Test the byte-per-cell board storage and its zero-copy exports."""
+    try:
+        import numpy as np
+        from board import TetrisBoard
+        from bitboard import BitBoard
+        from pieces import TetrisPiece, PIECE_CODES, PIECE_COLORS, CODE_COLORS, BLOCK_CODE
+        
+        board = TetrisBoard()
+        view = board.get_cells_view()
+        array = board.to_numpy()
+        assert len(board.cells) == board.width * board.height and view.shape == (20, 10)
+        
+        piece = board.get_ghost_piece(TetrisPiece('T', 3, 0))
+        board.place_piece(piece)
+        x, y = piece.get_blocks()[0]
+        assert board.cells[y * board.width + x] == PIECE_CODES['T']
+        assert view[y, x] == PIECE_CODES['T'] and array[y, x] == PIECE_CODES['T']
+        assert board.grid[y][x] == PIECE_COLORS['T'] and CODE_COLORS[PIECE_CODES['T']] == PIECE_COLORS['T']
+        try:
+            board.grid[y][x] = None
+            assert False, "grid accepted a write"
+        except TypeError:
+            pass
+        print(f"✅ Cells store piece codes ({len(board.cells)} bytes per board)")
+        
+        # Line clears rewrite the buffer in place, so exported views stay current
+        gaps = {x for x, y in piece.get_blocks() if y == board.height - 1}
+        grid = [[None] * board.width for _ in range(board.height)]
+        grid[-1] = [None if x in gaps else PIECE_COLORS['I'] for x in range(board.width)]
+        board.load_grid(grid)
+        board.place_piece(piece)
+        assert board.clear_lines() == 1
+        assert (array != 0).sum() == 4 - len(gaps) and bytes(view) == board.get_cells()
+        assert array.tolist() == [list(board.cells[y * 10:(y + 1) * 10]) for y in range(20)]
+        print("✅ Memoryview and NumPy exports stay live across line clears")
+        
+        copy = board.copy()
+        copy.place_piece(TetrisPiece('O', 0, 0))
+        assert copy.get_cells() != board.get_cells()
+        restored = TetrisBoard()
+        restored.load_cells(board.get_cells())
+        assert restored.grid == board.grid and restored.hash == board.hash
+        assert BitBoard.from_board(board).get_cells() == board.get_cells()
+        
+        # Colors that belong to no piece load as generic blocks
+        restored.load_grid([[(1, 2, 3)] + [None] * 9] + [[None] * 10] * 19)
+        assert restored.cells[0] == BLOCK_CODE and restored.get_holes_count() == 19
+        print("✅ Cells round-trip through copies, bitboards and color grids")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Compact cells test error: {e}")
+        return False
+
+def test_tournament():
+    """Test seeded bot games and tournament summaries."""
+    try:
+        from tournament import play_game, run_tournament, summarize
+        
+        first = play_game(5, max_pieces=15)
+        second = play_game(5, max_pieces=15)
+        first.pop('seconds')
+        second.pop('seconds')
+        assert first == second
+        assert first['pieces'] == 15 and first['survived']
+        print(f"✅ Same seed, same game (score {first['score']})")
+        
+        results = sorted(run_tournament([5, 6], max_pieces=15, workers=2), key=lambda r: r['seed'])
+        assert [r['seed'] for r in results] == [5, 6] and results[0]['score'] == first['score']
+        print("✅ Pooled games match direct play")
+        
+        fixed = [
+            {'seed': 1, 'score': 100, 'lines': 4, 'pieces': 30, 'survived': True},
+            {'seed': 2, 'score': 300, 'lines': 8, 'pieces': 50, 'survived': False},
+            {'seed': 3, 'score': 200, 'lines': 6, 'pieces': 40, 'survived': True},
+        ]
+        summary = summarize(fixed)
+        assert summary['games'] == 3 and summary['score']['mean'] == 200
+        assert summary['lines']['median'] == 6 and summary['pieces']['min'] == 30
+        assert summary['pieces']['max'] == 50 and abs(summary['survival_rate'] - 2 / 3) < 1e-9
+        empty = summarize([])
+        assert empty['games'] == 0 and empty['score']['mean'] == 0 and empty['survival_rate'] == 0.0
+        print("✅ Summaries total fixed results and handle empty tournaments")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Tournament test error: {e}")
+        return False
+
 def test_audio_system():
     """Test audio system."""
     try:
         # Initialize pygame mixer
         import pygame
-        from audio import AudioManager
+        from audio import AudioManager, NullAudioManager
         pygame.mixer.init()
         
         audio = AudioManager()
-        print("✅ Audio manager created successfully")
+        assert audio.wait_ready(timeout=10)
+        print(f"✅ Audio manager created successfully ({len(audio.sounds)} sounds)")
         
         # Test mute functionality
         audio.toggle_mute()
         print("✅ Audio mute toggle works")
         
+        # The null backend accepts the same calls and stays silent
+        silent = NullAudioManager()
+        silent.play_sound('move')
+        silent.toggle_mute()
+        assert silent.wait_ready(0) and not silent.mixer_ready and not silent.sounds
+        print("✅ Null audio backend works")
+        
         return True
     except Exception as e:
         print(f"❌ Audio test error: {e}")
@@ -90,6 +977,29 @@ def main():
     tests = [
         ("Import Tests", test_imports),
         ("Basic Functionality Tests", test_basic_functionality),
+        ("Bitboard Backend Tests", test_bitboard_backend),
+        ("Headless Engine Tests", test_headless_engine),
+        ("Vector Engine Tests", test_vector_engine),
+        ("Move Generator Tests", test_move_generator),
+        ("Board Feature Tests", test_board_features),
+        ("Beam Search Bot Tests", test_beam_search_bot),
+        ("Zobrist Hashing Tests", test_zobrist_hashing),
+        ("Randomizer Tests", test_randomizer),
+        ("Replay Tests", test_replay),
+        ("Dirty Renderer Tests", test_dirty_renderer),
+        ("Sprite Atlas Tests", test_sprite_atlas),
+        ("Text Cache Tests", test_text_cache),
+        ("Frame Profiler Tests", test_frame_profiler),
+        ("Benchmark Tests", test_benchmarks),
+        ("Drop Distance Tests", test_drop_distance),
+        ("Board Statistics Tests", test_board_statistics),
+        ("Idle Loop Tests", test_idle_loop),
+        ("Fixed Timestep Tests", test_fixed_timestep),
+        ("Controls Tests", test_controls),
+        ("Environment Tests", test_environment),
+        ("Compact Cells Tests", test_compact_cells),
+        ("Tournament Tests", test_tournament),
+        ("Sound Synthesis Tests", test_sound_synthesis),
         ("Audio System Tests", test_audio_system)
     ]
     
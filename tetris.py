@@ -6,9 +6,18 @@ Handles game mechanics, input, rendering, and game state management
 import pygame
 import random
 import math
+import time
 from board import TetrisBoard
-from pieces import TetrisPiece, get_random_piece, PIECE_COLORS
-from audio import AudioManager
+from pieces import CODE_COLORS
+from audio import AudioManager, NullAudioManager
+from sprites import SpriteAtlas
+from text_cache import TextCache
+from instrumentation import FrameProfiler, PHASES
+from controls import DasInput, DEFAULT_DAS, DEFAULT_ARR
+from randomizer import DEFAULT_POLICY
+from engine import (TetrisEngine, DEFAULT_PREVIEW_COUNT, ACTION_NONE, ACTION_LEFT, ACTION_RIGHT, ACTION_SOFT_DROP,
+                    ACTION_ROTATE_CW, ACTION_ROTATE_CCW, ACTION_HARD_DROP, ACTION_HOLD,
+                    EVENT_MOVE)
 
 # Game constants
 BOARD_WIDTH = 10
@@ -38,28 +47,116 @@ GAME_STATE_PLAYING = 'playing'
 GAME_STATE_PAUSED = 'paused'
 GAME_STATE_GAME_OVER = 'game_over'
 
+# Fixed simulation rate (engine ticks per second) and the default render cap
+DEFAULT_TICK_RATE = 100
+DEFAULT_MAX_FPS = 60
+
+# Most ticks one update may run to catch up before the backlog is dropped (e.g. after a stall)
+MAX_TICKS_PER_UPDATE = 25
+
+# Seconds of simulation per frame when fast-forwarding without a frame cap
+UNCAPPED_SLICE = 1 / 60
+
+# Longest an idle screen (menu, pause, game over) blocks waiting for input, in ms
+IDLE_TIMEOUT = 250
+
+# Engine actions bound to keys while playing
+KEY_ACTIONS = {
+    pygame.K_LEFT: ACTION_LEFT,
+    pygame.K_RIGHT: ACTION_RIGHT,
+    pygame.K_DOWN: ACTION_SOFT_DROP,
+    pygame.K_UP: ACTION_ROTATE_CW,
+    pygame.K_z: ACTION_ROTATE_CW,
+    pygame.K_x: ACTION_ROTATE_CCW,
+    pygame.K_SPACE: ACTION_HARD_DROP,
+    pygame.K_c: ACTION_HOLD,
+}
+
+# Engine actions for single-cell moves
+MOVE_ACTIONS = {(-1, 0): ACTION_LEFT, (1, 0): ACTION_RIGHT, (0, 1): ACTION_SOFT_DROP}
+
 class TetrisGame:
     """Main Tetris game class."""
     
-    def __init__(self):
+    def __init__(self, board_class=TetrisBoard, seed=None, controller=None,
+                 randomizer=DEFAULT_POLICY, preview_count=DEFAULT_PREVIEW_COUNT, record=False,
+                 dirty_rendering=False, audio=True, profile=False, idle_wait=True,
+                 tick_rate=DEFAULT_TICK_RATE, max_fps=DEFAULT_MAX_FPS, uncapped=False,
+                 das=DEFAULT_DAS, arr=DEFAULT_ARR):
         """Initialize the game."""
-        # Initialize Pygame
-        pygame.init()
+        # Startup timing; time_to_first_frame is set (in seconds) once the first frame is shown
+        self.init_time = time.perf_counter()
+        self.time_to_first_frame = None
+        
+        # Optional input source (e.g. bot.BotController) that plays instead of the keyboard
+        self.controller = controller
+        
+        # Game rules live in the headless engine; this class renders and handles input
+        self.engine = TetrisEngine(BOARD_WIDTH, BOARD_HEIGHT, seed=seed, board_class=board_class,
+                                   randomizer=randomizer, preview_count=preview_count)
+        
+        # Optional replay.ReplayRecorder that logs every engine step
+        self.seed = seed
+        self.recorder = None
+        if record:
+            from replay import ReplayRecorder
+            self.recorder = ReplayRecorder(self.engine, seed)
+        
+        # Initialize the Pygame modules we draw with; the mixer is left to the audio manager
+        pygame.display.init()
+        pygame.font.init()
         
         # Set up display
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Tetris - Cyberpunk Edition")
         
+        # Optional instrumentation.FrameProfiler and its overlay (toggled with F3)
+        self.profiler = FrameProfiler() if profile else None
+        self.show_profiler = False
+        self.profiler_lines = []
+        
+        # Block sprites shared by every board, piece and preview renderer
+        self.sprites = SpriteAtlas()
+        
+        # Optional render.DirtyRenderer that only pushes changed regions while playing
+        self.renderer = None
+        if dirty_rendering:
+            from render import DirtyRenderer
+            self.renderer = DirtyRenderer(self, BOARD_X_OFFSET, BOARD_Y_OFFSET, CELL_SIZE)
+        
         # Initialize clock for FPS control
         self.clock = pygame.time.Clock()
         
+        # The engine advances in fixed ticks of whole milliseconds (so replays
+        # reproduce them exactly), independent of the frame rate. Uncapped runs
+        # as many ticks as fit between frames (or in UNCAPPED_SLICE when
+        # max_fps=0); otherwise max_fps=0 renders unthrottled.
+        self.tick_ms = max(1, round(1000 / tick_rate))
+        self.max_fps = max_fps
+        self.uncapped = uncapped
+        self.ticks = 0
+        self.last_frame = time.perf_counter()
+        
+        # Input events are timestamped on arrival (pending until handled) and
+        # held keys repeat by DAS/ARR from those times, not once per frame
+        self.controls = DasInput(das, arr)
+        self.pending_events = []
+        
+        # Arrival times of handled input still waiting for a flip (when profiling)
+        self.input_times = []
+        
+        # Outside of active play, block on input and redraw only when the scene changes
+        self.idle_wait = idle_wait
+        self.drawn_scene = None
+        
         # Initialize fonts
         self.font_large = pygame.font.Font(None, 48)
         self.font_medium = pygame.font.Font(None, 32)
         self.font_small = pygame.font.Font(None, 24)
+        self.text = TextCache()
         
-        # Initialize audio
-        self.audio = AudioManager()
+        # Initialize audio (the mixer and sounds load in the background)
+        self.audio = AudioManager() if audio else NullAudioManager()
         
         # Game state
         self.state = GAME_STATE_MENU
@@ -70,89 +167,113 @@ class TetrisGame:
         
     def reset_game(self):
         """Reset the game to initial state."""
-        self.board = TetrisBoard(BOARD_WIDTH, BOARD_HEIGHT)
-        self.current_piece = get_random_piece()
-        self.current_piece.x = BOARD_WIDTH // 2 - 2
-        self.current_piece.y = 0
-        
-        self.next_piece = get_random_piece()
-        self.hold_piece = None
-        self.can_hold = True
-        
-        # Game statistics
-        self.score = 0
-        self.lines_cleared = 0
-        self.level = 1
+        if self.recorder is not None:
+            self.recorder.start(self.seed)
+        else:
+            self.engine.reset()
         
         # Timing
-        self.fall_time = 0
-        self.fall_speed = 500  # milliseconds
         self.last_time = pygame.time.get_ticks()
+        self.accumulator = 0
+        self.controls.reset()
         
         # Visual effects
         self.line_clear_animation = 0
         self.cleared_lines = []
         
-    def update_fall_speed(self):
-        """Update fall speed based on level."""
-        self.fall_speed = max(50, 500 - (self.level - 1) * 50)
+    @property
+    def board(self):
+        """Get the board from the engine."""
+        return self.engine.board
+        
+    @property
+    def current_piece(self):
+        """Get the falling piece from the engine."""
+        return self.engine.current_piece
+    
+    @property
+    def next_piece(self):
+        """Get the next piece from the engine."""
+        return self.engine.next_piece
+    
+    @property
+    def preview(self):
+        """Get the upcoming pieces from the engine, next piece first."""
+        return self.engine.preview
+    
+    @property
+    def hold_piece(self):
+        """Get the held piece from the engine."""
+        return self.engine.hold_piece
+    
+    @property
+    def score(self):
+        """Get the current score from the engine."""
+        return self.engine.score
+    
+    @property
+    def lines_cleared(self):
+        """Get the number of lines cleared from the engine."""
+        return self.engine.lines_cleared
+    
+    @property
+    def level(self):
+        """Get the current level from the engine."""
+        return self.engine.level
+    
+    def apply_action(self, action, dt=0):
+        """Step the engine and play the sounds for the events it produced."""
+        if self.recorder is not None:
+            events = self.recorder.step(action, dt)
+        else:
+            events = self.engine.step(action, dt)
+        
+        for event in events:
+            self.audio.play_sound(event)
         
-    def calculate_score(self, lines_cleared):
-        """Calculate score based on lines cleared."""
-        base_scores = {0: 0, 1: 40, 2: 100, 3: 300, 4: 1200}
-        return base_scores.get(lines_cleared, 0) * self.level
+        if self.engine.game_over:
+            self.state = GAME_STATE_GAME_OVER
+        return events
         
     def handle_input(self):
-        """Handle keyboard input."""
-        keys = pygame.key.get_pressed()
-        current_time = pygame.time.get_ticks()
-        
-        # Handle continuous key presses
-        if hasattr(self, 'key_timers'):
-            for key, timer in self.key_timers.items():
-                if keys[key] and current_time - timer > 100:  # 100ms repeat rate
-                    if key == pygame.K_LEFT:
-                        self.move_piece(-1, 0)
-                    elif key == pygame.K_RIGHT:
-                        self.move_piece(1, 0)
-                    elif key == pygame.K_DOWN:
-                        self.move_piece(0, 1)
-                    self.key_timers[key] = current_time
-        else:
-            self.key_timers = {}
+        """Handle keyboard input that arrived since the last call, in arrival order."""
+        now = time.perf_counter()
+        events = self.pending_events + [(event, now) for event in pygame.event.get()]
+        self.pending_events = []
+        
+        for event, timestamp in events:
+            # Held keys repeat up to the moment of each event
+            if self.state == GAME_STATE_PLAYING:
+                self.apply_repeats(timestamp)
             
-        # Handle events
-        for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            
+            elif event.type == pygame.VIDEOEXPOSE:
+                self.drawn_scene = None
+                if self.renderer is not None:
+                    self.renderer.invalidate()
                 
             elif event.type == pygame.KEYDOWN:
-                if self.state == GAME_STATE_MENU:
+                if event.key == pygame.K_F3:
+                    self.toggle_profiler_overlay()
+                
+                elif self.state == GAME_STATE_MENU:
                     if event.key == pygame.K_SPACE or event.key == pygame.K_RETURN:
                         self.state = GAME_STATE_PLAYING
                         
                 elif self.state == GAME_STATE_PLAYING:
-                    if event.key == pygame.K_LEFT:
-                        self.move_piece(-1, 0)
-                        self.key_timers[pygame.K_LEFT] = current_time
-                    elif event.key == pygame.K_RIGHT:
-                        self.move_piece(1, 0)
-                        self.key_timers[pygame.K_RIGHT] = current_time
-                    elif event.key == pygame.K_DOWN:
-                        self.move_piece(0, 1)
-                        self.key_timers[pygame.K_DOWN] = current_time
-                    elif event.key == pygame.K_UP or event.key == pygame.K_z:
-                        self.rotate_piece()
-                    elif event.key == pygame.K_x:
-                        self.rotate_piece(clockwise=False)
-                    elif event.key == pygame.K_SPACE:
-                        self.hard_drop()
-                    elif event.key == pygame.K_c:
-                        self.hold_current_piece()
+                    action = KEY_ACTIONS.get(event.key)
+                    if action is not None:
+                        self.apply_action(action)
+                        self.controls.press(action, timestamp * 1000)
+                        if self.profiler is not None:
+                            self.input_times.append(timestamp)
                     elif event.key == pygame.K_m:
                         self.audio.toggle_mute()
                     elif event.key == pygame.K_p or event.key == pygame.K_ESCAPE:
                         self.state = GAME_STATE_PAUSED
+                        self.controls.reset()
                         
                 elif self.state == GAME_STATE_PAUSED:
                     if event.key == pygame.K_p or event.key == pygame.K_ESCAPE:
@@ -166,145 +287,94 @@ class TetrisGame:
                         self.state = GAME_STATE_MENU
                         
             elif event.type == pygame.KEYUP:
-                if event.key in self.key_timers:
-                    del self.key_timers[event.key]
+                action = KEY_ACTIONS.get(event.key)
+                if action is not None:
+                    self.controls.release(action, timestamp * 1000)
+        
+        if self.state == GAME_STATE_PLAYING:
+            self.apply_repeats(now)
+    
+    def apply_repeats(self, timestamp):
+        """Apply the auto-repeated moves of held keys that fell due by timestamp (seconds)."""
+        for action in self.controls.poll(timestamp * 1000):
+            self.apply_action(action)
+            if self.state != GAME_STATE_PLAYING:
+                self.controls.reset()
+                return
                     
     def move_piece(self, dx, dy):
         """Move the current piece."""
         if self.state != GAME_STATE_PLAYING:
             return False
             
-        original_x, original_y = self.current_piece.x, self.current_piece.y
-        self.current_piece.move(dx, dy)
-        
-        if not self.board.is_valid_position(self.current_piece):
-            self.current_piece.x, self.current_piece.y = original_x, original_y
+        action = MOVE_ACTIONS.get((dx, dy))
+        if action is None:
             return False
-        
-        # Play move sound if piece moved successfully
-        if dx != 0 or dy != 0:
-            self.audio.play_move_sound()
-        return True
+        return EVENT_MOVE in self.apply_action(action)
         
     def rotate_piece(self, clockwise=True):
         """Rotate the current piece with wall kicks."""
         if self.state != GAME_STATE_PLAYING:
             return
             
-        original_rotation = self.current_piece.rotation
-        
-        # Try basic rotation
-        if clockwise:
-            self.current_piece.rotate_clockwise()
-        else:
-            self.current_piece.rotate_counterclockwise()
-            
-        # If rotation is invalid, try wall kicks
-        if not self.board.is_valid_position(self.current_piece):
-            wall_kicks = [(0, 0), (-1, 0), (1, 0), (0, -1), (-1, -1), (1, -1)]
-            
-            kicked = False
-            for dx, dy in wall_kicks:
-                self.current_piece.move(dx, dy)
-                if self.board.is_valid_position(self.current_piece):
-                    kicked = True
-                    self.audio.play_rotate_sound()
-                    break
-                self.current_piece.move(-dx, -dy)
-                
-            if not kicked:
-                # Revert rotation
-                self.current_piece.rotation = original_rotation
-        else:
-            # Basic rotation succeeded
-            self.audio.play_rotate_sound()
+        self.apply_action(ACTION_ROTATE_CW if clockwise else ACTION_ROTATE_CCW)
                 
     def hard_drop(self):
         """Drop the piece to the bottom."""
         if self.state != GAME_STATE_PLAYING:
             return
             
-        drop_distance = 0
-        while self.move_piece(0, 1):
-            drop_distance += 1
-            
-        # Add score for hard drop
-        self.score += drop_distance * 2
-        
-        # Play drop sound
-        self.audio.play_drop_sound()
-        
-        # Place the piece immediately
-        self.place_current_piece()
+        self.apply_action(ACTION_HARD_DROP)
         
     def hold_current_piece(self):
         """Hold/swap the current piece."""
-        if not self.can_hold or self.state != GAME_STATE_PLAYING:
+        if self.state != GAME_STATE_PLAYING:
             return
             
-        if self.hold_piece is None:
-            self.hold_piece = TetrisPiece(self.current_piece.type)
-            self.spawn_next_piece()
-        else:
-            # Swap pieces
-            temp_type = self.hold_piece.type
-            self.hold_piece = TetrisPiece(self.current_piece.type)
-            self.current_piece = TetrisPiece(temp_type)
-            self.current_piece.x = BOARD_WIDTH // 2 - 2
-            self.current_piece.y = 0
-            
-        self.can_hold = False
-        
-    def spawn_next_piece(self):
-        """Spawn the next piece."""
-        self.current_piece = self.next_piece
-        self.current_piece.x = BOARD_WIDTH // 2 - 2
-        self.current_piece.y = 0
-        self.next_piece = get_random_piece()
-        self.can_hold = True
-        
-        # Check game over
-        if not self.board.is_valid_position(self.current_piece):
-            self.state = GAME_STATE_GAME_OVER
-            self.audio.play_game_over_sound()
-            
-    def place_current_piece(self):
-        """Place the current piece on the board."""
-        self.board.place_piece(self.current_piece)
-        
-        # Check for line clears
-        lines_cleared = self.board.clear_lines()
-        if lines_cleared > 0:
-            old_level = self.level
-            self.lines_cleared += lines_cleared
-            self.score += self.calculate_score(lines_cleared)
-            self.level = min(15, 1 + self.lines_cleared // 10)
-            self.update_fall_speed()
-            
-            # Play appropriate sound
-            self.audio.play_line_clear_sound(lines_cleared)
-            
-            # Play level up sound if level increased
-            if self.level > old_level:
-                self.audio.play_level_up_sound()
-            
-        self.spawn_next_piece()
-        
-    def update(self):
-        """Update game logic."""
+        self.apply_action(ACTION_HOLD)
+        
+    def update(self, delta_time=None):
+        """Run the simulation ticks that are due (or that fit in one frame when uncapped)."""
+        # Elapsed milliseconds come from the clock unless given (as tests do)
+        if delta_time is None:
+            current_time = pygame.time.get_ticks()
+            delta_time = current_time - self.last_time
+            self.last_time = current_time
         if self.state != GAME_STATE_PLAYING:
             return
-            
-        current_time = pygame.time.get_ticks()
-        delta_time = current_time - self.last_time
-        self.last_time = current_time
-        
-        # Handle falling
-        self.fall_time += delta_time
-        if self.fall_time >= self.fall_speed:
-            if not self.move_piece(0, 1):
-                self.place_current_piece()
-            self.fall_time = 0
+        
+        if self.uncapped:
+            # Fast-forward: simulate until the next frame is due, or for a fixed
+            # slice when frames are unthrottled (a zero budget would run one tick)
+            deadline = time.perf_counter() + (1 / self.max_fps if self.max_fps else UNCAPPED_SLICE)
+            while True:
+                self.run_tick()
+                if self.state != GAME_STATE_PLAYING or time.perf_counter() >= deadline:
+                    return
+        
+        self.accumulator += delta_time
+        ticks = 0
+        while self.accumulator >= self.tick_ms and self.state == GAME_STATE_PLAYING:
+            if ticks == MAX_TICKS_PER_UPDATE:
+                self.accumulator = 0
+                break
+            self.run_tick()
+            self.accumulator -= self.tick_ms
+            ticks += 1
+    
+    def run_tick(self):
+        """Advance the game by one fixed simulation tick."""
+        self.ticks += 1
+        
+        # Let the controller act before gravity
+        if self.controller is not None:
+            for action in self.controller.next_actions(self.engine, self.tick_ms):
+                self.apply_action(action)
+                if self.state != GAME_STATE_PLAYING:
+                    return
+        
+        # Advance gravity in the engine
+        self.apply_action(ACTION_NONE, self.tick_ms)
             
     def draw_grid(self):
         """Draw the game grid."""
@@ -333,41 +403,24 @@ class TetrisGame:
         if piece is None:
             return
             
-        blocks = piece.get_blocks()
-        
-        for x, y in blocks:
-            if 0 <= x < BOARD_WIDTH and y >= 0:
-                screen_x = BOARD_X_OFFSET + x * CELL_SIZE
-                screen_y = BOARD_Y_OFFSET + y * CELL_SIZE
-                
-                if screen_y < BOARD_Y_OFFSET + BOARD_HEIGHT * CELL_SIZE:
-                    # Create surface for alpha blending
-                    block_surface = pygame.Surface((CELL_SIZE, CELL_SIZE))
-                    block_surface.fill(piece.color)
-                    block_surface.set_alpha(alpha)
-                    
-                    # Draw block
-                    self.screen.blit(block_surface, (screen_x, screen_y))
-                    
-                    # Draw border
-                    pygame.draw.rect(self.screen, WHITE,
-                                   (screen_x, screen_y, CELL_SIZE, CELL_SIZE), 1)
+        px, py = piece.x, piece.y
+        blocks = [(px + dx, py + dy) for dx, dy in piece.get_offsets()
+                  if 0 <= px + dx < BOARD_WIDTH and 0 <= py + dy < BOARD_HEIGHT]
+        self.sprites.blit_blocks(self.screen, blocks, piece.color,
+                                 (BOARD_X_OFFSET, BOARD_Y_OFFSET), CELL_SIZE, alpha)
                                    
     def draw_board_blocks(self):
         """Draw the placed blocks on the board."""
-        for y in range(BOARD_HEIGHT):
-            for x in range(BOARD_WIDTH):
-                if self.board.grid[y][x] is not None:
-                    screen_x = BOARD_X_OFFSET + x * CELL_SIZE
-                    screen_y = BOARD_Y_OFFSET + y * CELL_SIZE
-                    
-                    # Draw block
-                    pygame.draw.rect(self.screen, self.board.grid[y][x],
-                                   (screen_x, screen_y, CELL_SIZE, CELL_SIZE))
-                    
-                    # Draw border
-                    pygame.draw.rect(self.screen, WHITE,
-                                   (screen_x, screen_y, CELL_SIZE, CELL_SIZE), 1)
+        # Cells hold piece codes; colors are looked up only here
+        sprite = self.sprites.get
+        width = self.board.width
+        blits = []
+        for index, code in enumerate(self.board.get_cells()):
+            if code:
+                y, x = divmod(index, width)
+                blits.append((sprite(CODE_COLORS[code], 255, CELL_SIZE),
+                              (BOARD_X_OFFSET + x * CELL_SIZE, BOARD_Y_OFFSET + y * CELL_SIZE)))
+        self.screen.blits(blits, doreturn=False)
                                    
     def draw_ghost_piece(self):
         """Draw the ghost piece (projection)."""
@@ -376,48 +429,31 @@ class TetrisGame:
         
     def draw_ui(self):
         """Draw the user interface."""
+        self.draw_stats()
+        self.draw_labels()
+        self.draw_next_piece()
+        self.draw_queue()
+        self.draw_hold()
+        self.draw_bot_stats()
+    
+    def draw_stats(self):
+        """Draw the score, lines and level."""
         # Score
-        score_text = self.font_medium.render(f"Score: {self.score}", True, NEON_GREEN)
-        self.screen.blit(score_text, (450, 100))
+        self.text.blit_number(self.screen, self.font_medium, "Score: ", self.score, NEON_GREEN,
+                              (450, 100))
         
         # Lines
-        lines_text = self.font_medium.render(f"Lines: {self.lines_cleared}", True, NEON_GREEN)
-        self.screen.blit(lines_text, (450, 140))
+        self.text.blit_number(self.screen, self.font_medium, "Lines: ", self.lines_cleared, NEON_GREEN,
+                              (450, 140))
         
         # Level
-        level_text = self.font_medium.render(f"Level: {self.level}", True, NEON_GREEN)
-        self.screen.blit(level_text, (450, 180))
-        
+        self.text.blit_number(self.screen, self.font_medium, "Level: ", self.level, NEON_GREEN,
+                              (450, 180))
+    
+    def draw_labels(self):
+        """Draw the static labels and the controls legend."""
         # Next piece
-        next_text = self.font_medium.render("Next:", True, NEON_PINK)
-        self.screen.blit(next_text, (450, 240))
-        
-        # Draw next piece preview
-        if self.next_piece:
-            preview_x, preview_y = 470, 270
-            blocks = self.next_piece.get_blocks()
-            for x, y in blocks:
-                screen_x = preview_x + x * 20
-                screen_y = preview_y + y * 20
-                pygame.draw.rect(self.screen, self.next_piece.color,
-                               (screen_x, screen_y, 20, 20))
-                pygame.draw.rect(self.screen, WHITE,
-                               (screen_x, screen_y, 20, 20), 1)
-        
-        # Hold piece
-        if self.hold_piece:
-            hold_text = self.font_medium.render("Hold:", True, NEON_PINK)
-            self.screen.blit(hold_text, (450, 370))
-            
-            preview_x, preview_y = 470, 400
-            blocks = self.hold_piece.get_blocks()
-            for x, y in blocks:
-                screen_x = preview_x + x * 20
-                screen_y = preview_y + y * 20
-                pygame.draw.rect(self.screen, self.hold_piece.color,
-                               (screen_x, screen_y, 20, 20))
-                pygame.draw.rect(self.screen, WHITE,
-                               (screen_x, screen_y, 20, 20), 1)
+        self.text.blit(self.screen, self.font_medium, "Next:", NEON_PINK, (450, 240))
         
         # Controls
         controls = [
@@ -433,20 +469,46 @@ class TetrisGame:
         
         for i, control in enumerate(controls):
             color = NEON_PURPLE if i == 0 else WHITE
-            control_text = self.font_small.render(control, True, color)
-            self.screen.blit(control_text, (450, 500 + i * 25))
+            self.text.blit(self.screen, self.font_small, control, color, (450, 500 + i * 25))
+    
+    def draw_next_piece(self):
+        """Draw the next piece preview."""
+        if self.next_piece:
+            self.sprites.blit_blocks(self.screen, self.next_piece.get_offsets(),
+                                     self.next_piece.color, (470, 270), 20)
+    
+    def draw_queue(self):
+        """Draw the later pieces in the preview queue, smaller and to the right."""
+        for i, piece in enumerate(list(self.preview)[1:]):
+            self.sprites.blit_blocks(self.screen, piece.get_offsets(), piece.color,
+                                     (640, 270 + i * 55), 15)
+    
+    def draw_hold(self):
+        """Draw the held piece."""
+        if self.hold_piece:
+            self.text.blit(self.screen, self.font_medium, "Hold:", NEON_PINK, (450, 370))
             
+            self.sprites.blit_blocks(self.screen, self.hold_piece.get_offsets(),
+                                     self.hold_piece.color, (470, 400), 20)
+    
+    def draw_bot_stats(self):
+        """Draw the bot's search speed when a bot is playing."""
+        bot = getattr(self.controller, 'bot', None)
+        if bot is not None:
+            self.text.blit_number(self.screen, self.font_small, "Bot: ", f"{bot.nodes_per_second:,.0f}",
+                                  NEON_BLUE, (450, 60), suffix=" nodes/s")
+    
     def draw_menu(self):
         """Draw the main menu."""
-        title_text = self.font_large.render("TETRIS", True, NEON_BLUE)
+        title_text = self.text.render(self.font_large, "TETRIS", NEON_BLUE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 200))
         self.screen.blit(title_text, title_rect)
         
-        subtitle_text = self.font_medium.render("Cyberpunk Edition", True, NEON_PINK)
+        subtitle_text = self.text.render(self.font_medium, "Cyberpunk Edition", NEON_PINK)
         subtitle_rect = subtitle_text.get_rect(center=(SCREEN_WIDTH // 2, 250))
         self.screen.blit(subtitle_text, subtitle_rect)
         
-        start_text = self.font_medium.render("Press SPACE or ENTER to Start", True, WHITE)
+        start_text = self.text.render(self.font_medium, "Press SPACE or ENTER to Start", WHITE)
         start_rect = start_text.get_rect(center=(SCREEN_WIDTH // 2, 350))
         self.screen.blit(start_text, start_rect)
         
@@ -457,11 +519,11 @@ class TetrisGame:
         overlay.set_alpha(128)
         self.screen.blit(overlay, (0, 0))
         
-        pause_text = self.font_large.render("PAUSED", True, NEON_BLUE)
+        pause_text = self.text.render(self.font_large, "PAUSED", NEON_BLUE)
         pause_rect = pause_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         self.screen.blit(pause_text, pause_rect)
         
-        continue_text = self.font_medium.render("Press P or ESC to continue", True, WHITE)
+        continue_text = self.text.render(self.font_medium, "Press P or ESC to continue", WHITE)
         continue_rect = continue_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))
         self.screen.blit(continue_text, continue_rect)
         
@@ -472,20 +534,61 @@ class TetrisGame:
         overlay.set_alpha(192)
         self.screen.blit(overlay, (0, 0))
         
-        game_over_text = self.font_large.render("GAME OVER", True, NEON_PINK)
+        game_over_text = self.text.render(self.font_large, "GAME OVER", NEON_PINK)
         game_over_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 60))
         self.screen.blit(game_over_text, game_over_rect)
         
-        final_score_text = self.font_medium.render(f"Final Score: {self.score}", True, NEON_GREEN)
+        final_score_text = self.text.render(self.font_medium, f"Final Score: {self.score}", NEON_GREEN)
         final_score_rect = final_score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         self.screen.blit(final_score_text, final_score_rect)
         
-        restart_text = self.font_medium.render("Press R to restart or M for menu", True, WHITE)
+        restart_text = self.text.render(self.font_medium, "Press R to restart or M for menu", WHITE)
         restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))
         self.screen.blit(restart_text, restart_rect)
         
+    def toggle_profiler_overlay(self):
+        """Show or hide frame timings, starting the profiler if needed."""
+        if self.profiler is None:
+            self.profiler = FrameProfiler()
+        self.show_profiler = not self.show_profiler
+        self.profiler_lines = []
+        if self.renderer is not None:
+            self.renderer.invalidate()
+    
+    def draw_profiler_overlay(self):
+        """Draw frame timing statistics in the strip above the board, returning its rectangle."""
+        profiler = self.profiler
+        # Refresh the numbers a few times per second so they stay readable
+        if not self.profiler_lines or profiler.frames % 15 == 0:
+            stats = profiler.get_stats()
+            frame = stats['frame']
+            phases = "  ".join(f"{phase} {stats[phase]['p50']:.1f}/{stats[phase]['p95']:.1f}"
+                               for phase in PHASES)
+            self.profiler_lines = [
+                f"FPS {stats['fps']:.0f}  frame p50 {frame['p50']:.1f}  p95 {frame['p95']:.1f}  "
+                f"p99 {frame['p99']:.1f} ms  dropped {stats['dropped']}  "
+                f"cpu {stats['cpu_percent']:.0f}%  idle {stats['idle_cpu_percent']:.0f}%",
+                f"{phases}  latency {stats['input_latency']['p50']:.1f}/"
+                f"{stats['input_latency']['p95']:.1f}  (p50/p95 ms)",
+            ]
+        
+        rect = pygame.Rect(0, 0, SCREEN_WIDTH, BOARD_Y_OFFSET - 4)
+        self.screen.fill(BLACK, rect)
+        for i, line in enumerate(self.profiler_lines):
+            self.text.blit(self.screen, self.font_small, line, NEON_GREEN, (10, 4 + i * 20))
+        return rect
+    
     def draw(self):
         """Draw everything."""
+        if self.renderer is not None:
+            if self.state == GAME_STATE_PLAYING:
+                self.renderer.draw()
+                if self.show_profiler:
+                    pygame.display.update(self.draw_profiler_overlay())
+                return
+            # Overlays and menus are drawn in full; repaint everything on return
+            self.renderer.invalidate()
+        
         self.screen.fill(BLACK)
         
         if self.state == GAME_STATE_MENU:
@@ -506,12 +609,94 @@ class TetrisGame:
             elif self.state == GAME_STATE_GAME_OVER:
                 self.draw_game_over_screen()
         
+        if self.show_profiler:
+            self.draw_profiler_overlay()
         pygame.display.flip()
         
+    def get_idle_scene(self):
+        """Get a key that changes whenever an idle screen would look different."""
+        return (self.state, self.show_profiler, self.score, self.board.hash, self.engine.pieces_placed)
+    
+    def run_idle(self, timeout=IDLE_TIMEOUT):
+        """Wait for input on an idle screen, redrawing only if the scene changed."""
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin_idle()
+        
+        # Sleep in the event queue instead of redrawing at 60 FPS
+        event = pygame.event.wait(timeout)
+        if event.type != pygame.NOEVENT:
+            self.pending_events.append((event, time.perf_counter()))
+        self.handle_input()
+        
+        # Time spent on an idle screen does not count toward gravity
+        self.last_time = pygame.time.get_ticks()
+        
+        # The timing overlay is the only thing that changes on its own
+        scene = self.get_idle_scene()
+        redraw = scene != self.drawn_scene or self.show_profiler
+        if redraw:
+            self.drawn_scene = scene
+            self.profiler_lines = []
+            self.draw()
+        
+        if self.time_to_first_frame is None:
+            self.time_to_first_frame = time.perf_counter() - self.init_time
+        if profiler is not None:
+            profiler.end_idle(redraw)
+    
     def run(self):
         """Main game loop."""
         while self.running:
-            self.handle_input()
-            self.update()
-            self.draw()
-            self.clock.tick(60)  # 60 FPS
\ No newline at end of file
+            if self.idle_wait and self.state != GAME_STATE_PLAYING:
+                self.run_idle()
+                continue
+            
+            # Active play: simulate, then sample input as late as possible before drawing
+            self.drawn_scene = None
+            profiler = self.profiler
+            if profiler is None:
+                self.update()
+                self.handle_input()
+                self.draw()
+            else:
+                profiler.begin_frame()
+                self.update()
+                profiler.mark('update')
+                self.handle_input()
+                profiler.mark('input')
+                self.draw()
+                profiler.mark('draw')
+                
+                flipped = time.perf_counter()
+                for timestamp in self.input_times:
+                    profiler.record_latency(flipped - timestamp)
+                self.input_times.clear()
+            
+            if self.time_to_first_frame is None:
+                self.time_to_first_frame = time.perf_counter() - self.init_time
+            self.wait_for_frame()
+            
+            if profiler is not None:
+                profiler.mark('wait')
+                profiler.end_frame()
+    
+    def wait_for_frame(self):
+        """Sleep until the next frame is due, timestamping input events as they arrive."""
+        if not self.max_fps:
+            self.last_frame = time.perf_counter()
+            return
+        
+        interval = 1 / self.max_fps
+        deadline = self.last_frame + interval
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            # Waiting on the queue (not a plain sleep) gives sub-frame event times
+            event = pygame.event.wait(max(1, int(remaining * 1000)))
+            if event.type != pygame.NOEVENT:
+                self.pending_events.append((event, time.perf_counter()))
+        
+        # Keep the frame cadence unless we fell more than a frame behind
+        self.last_frame = max(deadline, time.perf_counter() - interval)
\ No newline at end of file
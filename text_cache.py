@@ -0,0 +1,73 @@
+"""
+Tetris Text Cache
+Rendered text surfaces cached by (font, string, color), with digit glyphs for changing numbers
+"""
+
+from collections import OrderedDict
+
+class TextCache:
+    """Bounded LRU cache of antialiased text surfaces."""
+    
+    def __init__(self, max_entries=256):
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self):
+        """Get the number of cached surfaces."""
+        return len(self.surfaces)
+    
+    def render(self, font, text, color):
+        """Get the surface for text, rasterizing it only on a cache miss."""
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+    
+    def blit(self, surface, font, text, color, pos):
+        """Draw cached text at pos, returning its rectangle."""
+        return surface.blit(self.render(font, text, color), pos)
+    
+    def blit_number(self, surface, font, label, value, color, pos, suffix=""):
+        """Draw label + value + suffix, composing the number from cached glyphs."""
+        x, y = pos
+        if label:
+            x += surface.blit(self.render(font, label, color), (x, y)).width
+        
+        # Each digit (and separator) is rasterized once, so a changing score
+        # never re-rasterizes text
+        blits = []
+        for char in value if isinstance(value, str) else str(value):
+            glyph = self.render(font, char, color)
+            blits.append((glyph, (x, y)))
+            x += glyph.get_width()
+        surface.blits(blits, doreturn=False)
+        
+        if suffix:
+            surface.blit(self.render(font, suffix, color), (x, y))
+    
+    def get_stats(self):
+        """Get the hit/miss/eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.surfaces),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
\ No newline at end of file
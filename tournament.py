@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tetris Bot Tournament
+Plays seeded headless bot games across a process pool and aggregates the results
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from engine import TetrisEngine
+from bot import BeamSearchBot
+from randomizer import RANDOMIZERS, DEFAULT_POLICY
+
+def play_game(seed, weights=None, depth=1, beam_width=4, max_pieces=500, randomizer=DEFAULT_POLICY):
+    """Play one seeded headless game with the bot and return its result."""
+    start_time = time.perf_counter()
+    engine = TetrisEngine(seed=seed, randomizer=randomizer)
+    bot = BeamSearchBot(weights, depth=depth, beam_width=beam_width)
+    
+    while not engine.game_over and engine.pieces_placed < max_pieces:
+        placement = bot.choose(engine)
+        if placement is None:
+            break
+        for action in placement.get_path():
+            engine.step(action)
+    
+    return {
+        'seed': seed,
+        'score': engine.score,
+        'lines': engine.lines_cleared,
+        'pieces': engine.pieces_placed,
+        'survived': not engine.game_over,
+        'seconds': time.perf_counter() - start_time,
+    }
+
+def run_tournament(seeds, weights=None, depth=1, beam_width=4, max_pieces=500, workers=None,
+                   randomizer=DEFAULT_POLICY):
+    """Play one game per seed in a process pool, yielding results as games finish."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_game, seed, weights, depth, beam_width, max_pieces, randomizer)
+                   for seed in seeds]
+        for future in as_completed(futures):
+            yield future.result()
+
+def summarize(results):
+    """Aggregate score, lines, pieces and survival statistics over game results."""
+    summary = {'games': len(results)}
+    
+    # An empty tournament reports zeros rather than failing
+    for key in ('score', 'lines', 'pieces'):
+        values = [result[key] for result in results] or [0]
+        summary[key] = {
+            'mean': statistics.mean(values),
+            'median': statistics.median(values),
+            'stdev': statistics.pstdev(values),
+            'min': min(values),
+            'max': max(values),
+        }
+    
+    survived = sum(result['survived'] for result in results)
+    summary['survival_rate'] = survived / len(results) if results else 0.0
+    return summary
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Evaluate bot heuristics over seeded headless games")
+    parser.add_argument('--games', type=int, default=100, help="number of games to play")
+    parser.add_argument('--seed', type=int, default=0, help="first seed; games use consecutive seeds")
+    parser.add_argument('--seeds', type=str, help="comma-separated seed list (overrides --games/--seed)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--max-pieces', type=int, default=500, help="pieces before a game counts as survived")
+    parser.add_argument('--depth', type=int, default=1, help="bot search depth")
+    parser.add_argument('--beam', type=int, default=4, help="bot beam width")
+    parser.add_argument('--randomizer', choices=sorted(RANDOMIZERS), default=DEFAULT_POLICY,
+                        help="piece randomizer policy")
+    parser.add_argument('--weights', type=str, help="JSON file of heuristic weights")
+    parser.add_argument('--output', type=str, help="write per-game results and summary as JSON")
+    parser.add_argument('--quiet', action='store_true', help="don't print each game as it finishes")
+    args = parser.parse_args()
+    
+    if args.seeds is not None:
+        try:
+            args.seed_list = [int(seed) for seed in args.seeds.split(',') if seed.strip()]
+        except ValueError:
+            parser.error(f"invalid --seeds list: {args.seeds}")
+    else:
+        args.seed_list = list(range(args.seed, args.seed + args.games))
+    if not args.seed_list:
+        parser.error("no games to play: use --games 1 or more, or a non-empty --seeds list")
+    return args
+
+def main():
+    """Run a tournament from the command line."""
+    args = parse_args()
+    
+    seeds = args.seed_list
+    
+    weights = None
+    if args.weights:
+        with open(args.weights) as f:
+            weights = json.load(f)
+    
+    print(f"🏆 Playing {len(seeds)} games on {args.workers} workers")
+    start_time = time.perf_counter()
+    results = []
+    
+    for result in run_tournament(seeds, weights, args.depth, args.beam, args.max_pieces,
+                                 args.workers, args.randomizer):
+        results.append(result)
+        if not args.quiet:
+            status = "survived" if result['survived'] else "topped out"
+            print(f"  seed {result['seed']:>6}: score {result['score']:>7}  lines {result['lines']:>5}  "
+                  f"pieces {result['pieces']:>5}  {status}  ({len(results)}/{len(seeds)})")
+    
+    elapsed = time.perf_counter() - start_time
+    results.sort(key=lambda result: result['seed'])
+    summary = summarize(results)
+    
+    print("=" * 50)
+    for key in ('score', 'lines', 'pieces'):
+        stats = summary[key]
+        print(f"{key:>7}: mean {stats['mean']:.1f}  median {stats['median']:.1f}  "
+              f"stdev {stats['stdev']:.1f}  min {stats['min']}  max {stats['max']}")
+    print(f"survival: {summary['survival_rate']:.1%}")
+    print(f"elapsed: {elapsed:.1f}s ({len(results) / elapsed:.2f} games/s)")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'summary': summary, 'results': results}, f, indent=2)
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
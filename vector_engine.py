@@ -0,0 +1,318 @@
+"""
+Vectorized Tetris Engine
+Steps N independent games at once with NumPy array operations
+"""
+
+import numpy as np
+from pieces import PIECE_TYPES, PIECE_BLOCKS, ROTATION_COUNTS
+from randomizer import generate_batch, DEFAULT_POLICY
+from engine import (BOARD_WIDTH, BOARD_HEIGHT, ACTION_LEFT, ACTION_RIGHT, ACTION_SOFT_DROP,
+                    ACTION_ROTATE_CW, ACTION_ROTATE_CCW, ACTION_HARD_DROP, ACTION_HOLD,
+                    WALL_KICKS, LINE_SCORES, HARD_DROP_POINTS, LINES_PER_LEVEL, MAX_LEVEL)
+
+# Piece geometry as arrays: OFFSETS[type_index, rotation, block] = (dx, dy)
+OFFSETS = np.array([[PIECE_BLOCKS[t][r] for r in range(4)] for t in PIECE_TYPES], dtype=np.int64)
+ROTATIONS = np.array([ROTATION_COUNTS[t] for t in PIECE_TYPES], dtype=np.int64)
+KICKS = np.array(WALL_KICKS, dtype=np.int64)
+LINE_SCORE_TABLE = np.array([LINE_SCORES[n] for n in range(5)], dtype=np.int64)
+
+# Cell value for an empty cell; occupied cells hold type_index + 1
+EMPTY = 0
+NO_PIECE = -1
+
+# Pieces dealt into a game's queue at a time; a multiple of 7 so bag policies
+# refill on a bag boundary
+QUEUE_LENGTH = 140
+
+class VectorEngine:
+    """Batch of N Tetris games sharing one board array."""
+    
+    def __init__(self, num_games, width=BOARD_WIDTH, height=BOARD_HEIGHT, seed=None, auto_reset=True,
+                 randomizer=DEFAULT_POLICY):
+        """Initialize the batch with a randomizer policy name shared by every game."""
+        self.num_games = num_games
+        self.width = width
+        self.height = height
+        self.spawn_x = width // 2 - 2
+        self.auto_reset = auto_reset
+        self.randomizer = randomizer
+        # Draws the per-game seeds; each game then deals its pieces like a
+        # TetrisEngine with that seed and policy
+        self.rng = np.random.default_rng(seed)
+        
+        n = num_games
+        self.boards = np.zeros((n, height, width), dtype=np.uint8)
+        self.piece_type = np.zeros(n, dtype=np.int64)
+        self.rotation = np.zeros(n, dtype=np.int64)
+        self.x = np.zeros(n, dtype=np.int64)
+        self.y = np.zeros(n, dtype=np.int64)
+        self.next_type = np.zeros(n, dtype=np.int64)
+        self.hold_type = np.full(n, NO_PIECE, dtype=np.int64)
+        # Upcoming piece type indices per game and the position of the next one
+        self.queue = np.zeros((n, QUEUE_LENGTH), dtype=np.int8)
+        self.queue_pos = np.zeros(n, dtype=np.int64)
+        self.can_hold = np.ones(n, dtype=bool)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.lines_cleared = np.zeros(n, dtype=np.int64)
+        self.level = np.ones(n, dtype=np.int64)
+        self.pieces_placed = np.zeros(n, dtype=np.int64)
+        self.fall_time = np.zeros(n, dtype=np.int64)
+        self.fall_speed = np.full(n, 500, dtype=np.int64)
+        self.game_over = np.zeros(n, dtype=bool)
+        
+        # Final statistics of games that ended during the last step
+        self.final_score = np.zeros(n, dtype=np.int64)
+        self.final_lines = np.zeros(n, dtype=np.int64)
+        
+        self.reset()
+    
+    def reset(self, mask=None):
+        """Reset all games, or only those selected by a boolean mask."""
+        idx = np.arange(self.num_games) if mask is None else np.flatnonzero(mask)
+        if len(idx) == 0:
+            return
+        
+        self.boards[idx] = EMPTY
+        self._fill_queues(idx)
+        self.piece_type[idx] = self._draw_types(idx)
+        self.rotation[idx] = 0
+        self.x[idx] = self.spawn_x
+        self.y[idx] = 0
+        self.next_type[idx] = self._draw_types(idx)
+        self.hold_type[idx] = NO_PIECE
+        self.can_hold[idx] = True
+        self.score[idx] = 0
+        self.lines_cleared[idx] = 0
+        self.level[idx] = 1
+        self.pieces_placed[idx] = 0
+        self.fall_time[idx] = 0
+        self.fall_speed[idx] = 500
+        self.game_over[idx] = False
+    
+    def _fill_queues(self, idx):
+        """Deal a fresh seeded piece sequence into the queues of boards idx."""
+        seeds = self.rng.integers(0, 2 ** 32, size=len(idx))
+        self.queue[idx] = generate_batch(seeds.tolist(), QUEUE_LENGTH, self.randomizer)
+        self.queue_pos[idx] = 0
+    
+    def _draw_types(self, idx):
+        """Take the next piece type index from the queues of boards idx."""
+        empty = idx[self.queue_pos[idx] == QUEUE_LENGTH]
+        if len(empty):
+            self._fill_queues(empty)
+        
+        types = self.queue[idx, self.queue_pos[idx]]
+        self.queue_pos[idx] += 1
+        return types
+    
+    def _block_coords(self, types, rotations, xs, ys):
+        """Get absolute block coordinates (k, 4) for the given pieces."""
+        offsets = OFFSETS[types, rotations]
+        return xs[:, None] + offsets[..., 0], ys[:, None] + offsets[..., 1]
+    
+    def _is_valid(self, idx, types, rotations, xs, ys):
+        """Vectorized TetrisBoard.is_valid_position for boards idx."""
+        bx, by = self._block_coords(types, rotations, xs, ys)
+        inside = (bx >= 0) & (bx < self.width) & (by < self.height)
+        
+        # Only cells with y >= 0 are checked against the board (spawn area)
+        on_board = inside & (by >= 0)
+        cells = self.boards[idx[:, None],
+                            np.clip(by, 0, self.height - 1),
+                            np.clip(bx, 0, self.width - 1)]
+        collides = on_board & (cells != EMPTY)
+        return inside.all(axis=1) & ~collides.any(axis=1)
+    
+    def _try_move(self, idx, dx, dy):
+        """Move pieces of boards idx where valid; return the mask of boards that moved."""
+        moved = self._is_valid(idx, self.piece_type[idx], self.rotation[idx],
+                               self.x[idx] + dx, self.y[idx] + dy)
+        ok = idx[moved]
+        self.x[ok] += dx
+        self.y[ok] += dy
+        return moved
+    
+    def _rotate(self, idx, direction):
+        """Rotate pieces of boards idx with wall kicks."""
+        types = self.piece_type[idx]
+        new_rotation = (self.rotation[idx] + direction) % ROTATIONS[types]
+        done = np.zeros(len(idx), dtype=bool)
+        
+        # Basic rotation first, then the kicks in order
+        for dx, dy in [(0, 0)] + [tuple(kick) for kick in KICKS]:
+            pending = ~done
+            if not pending.any():
+                break
+            sub = idx[pending]
+            valid = self._is_valid(sub, types[pending], new_rotation[pending],
+                                   self.x[sub] + dx, self.y[sub] + dy)
+            ok = sub[valid]
+            self.rotation[ok] = new_rotation[pending][valid]
+            self.x[ok] += dx
+            self.y[ok] += dy
+            done[np.flatnonzero(pending)[valid]] = True
+    
+    def _hard_drop(self, idx):
+        """Drop pieces of boards idx to the bottom, score them and lock them."""
+        distance = np.zeros(len(idx), dtype=np.int64)
+        falling = np.ones(len(idx), dtype=bool)
+        
+        while falling.any():
+            sub = np.flatnonzero(falling)
+            moved = self._try_move(idx[sub], 0, 1)
+            distance[sub[moved]] += 1
+            falling[sub[~moved]] = False
+        
+        self.score[idx] += distance * HARD_DROP_POINTS
+        self._place(idx)
+    
+    def _fall(self, idx, rows):
+        """Move pieces of boards idx down by rows, locking those that land first."""
+        remaining = rows.copy()
+        falling = remaining > 0
+        landed = np.zeros(len(idx), dtype=bool)
+        
+        while falling.any():
+            sub = np.flatnonzero(falling)
+            moved = self._try_move(idx[sub], 0, 1)
+            remaining[sub[moved]] -= 1
+            landed[sub[~moved]] = True
+            falling[sub] = moved & (remaining[sub] > 0)
+        
+        locked = idx[landed]
+        self._place(locked)
+        self.fall_time[locked] = 0
+    
+    def _hold(self, idx):
+        """Hold/swap pieces of boards idx."""
+        idx = idx[self.can_hold[idx]]
+        if len(idx) == 0:
+            return
+        
+        current = self.piece_type[idx].copy()
+        empty = self.hold_type[idx] == NO_PIECE
+        
+        # Swap with the held piece where there is one
+        swap = idx[~empty]
+        self.piece_type[swap] = self.hold_type[swap]
+        self.rotation[swap] = 0
+        self.x[swap] = self.spawn_x
+        self.y[swap] = 0
+        
+        self.hold_type[idx] = current
+        self._spawn(idx[empty])
+        self.can_hold[idx] = False
+        
+        # A swapped-in piece can be blocked at spawn just like a new one
+        valid = self._is_valid(swap, self.piece_type[swap], self.rotation[swap], self.x[swap], self.y[swap])
+        self.game_over[swap[~valid]] = True
+    
+    def _spawn(self, idx):
+        """Spawn the next piece on boards idx."""
+        if len(idx) == 0:
+            return
+        
+        self.piece_type[idx] = self.next_type[idx]
+        self.rotation[idx] = 0
+        self.x[idx] = self.spawn_x
+        self.y[idx] = 0
+        self.next_type[idx] = self._draw_types(idx)
+        self.can_hold[idx] = True
+        
+        valid = self._is_valid(idx, self.piece_type[idx], self.rotation[idx], self.x[idx], self.y[idx])
+        self.game_over[idx[~valid]] = True
+    
+    def _place(self, idx):
+        """Lock pieces of boards idx, clear lines and spawn the next pieces."""
+        types = self.piece_type[idx]
+        bx, by = self._block_coords(types, self.rotation[idx], self.x[idx], self.y[idx])
+        
+        # Blocks outside the board are dropped, as in TetrisBoard.place_piece
+        inside = (bx >= 0) & (bx < self.width) & (by >= 0) & (by < self.height)
+        rows, blocks = np.nonzero(inside)
+        self.boards[idx[rows], by[rows, blocks], bx[rows, blocks]] = types[rows] + 1
+        self.pieces_placed[idx] += 1
+        
+        cleared = self._clear_lines(idx)
+        scoring = cleared > 0
+        if scoring.any():
+            sub = idx[scoring]
+            self.lines_cleared[sub] += cleared[scoring]
+            self.score[sub] += LINE_SCORE_TABLE[cleared[scoring]] * self.level[sub]
+            self.level[sub] = np.minimum(MAX_LEVEL, 1 + self.lines_cleared[sub] // LINES_PER_LEVEL)
+            self.fall_speed[sub] = np.maximum(50, 500 - (self.level[sub] - 1) * 50)
+        
+        self._spawn(idx)
+    
+    def _clear_lines(self, idx):
+        """Clear full rows on boards idx and return the number cleared per board."""
+        boards = self.boards[idx]
+        full = (boards != EMPTY).all(axis=2)
+        cleared = full.sum(axis=1)
+        
+        changed = cleared > 0
+        if changed.any():
+            sub = boards[changed]
+            sub_full = full[changed]
+            
+            # Stable sort puts full rows first, then kept rows in original order
+            order = np.argsort(~sub_full, axis=1, kind='stable')
+            sub = np.take_along_axis(sub, order[:, :, None], axis=1)
+            
+            # The leading rows (the cleared ones) become empty
+            top = np.arange(self.height)[None, :] < cleared[changed][:, None]
+            sub[top] = EMPTY
+            self.boards[idx[changed]] = sub
+        
+        return cleared
+    
+    def step(self, actions, dt=0):
+        """Apply one action per game, advance time by dt milliseconds and return (rewards, dones)."""
+        # Rewards are the score gained this step. With auto_reset, ended games
+        # are reset and their results are left in final_score and final_lines.
+        actions = np.asarray(actions)
+        score_before = self.score.copy()
+        live = ~self.game_over
+        
+        for action, handler in ((ACTION_LEFT, lambda i: self._try_move(i, -1, 0)),
+                                (ACTION_RIGHT, lambda i: self._try_move(i, 1, 0)),
+                                (ACTION_SOFT_DROP, lambda i: self._try_move(i, 0, 1)),
+                                (ACTION_ROTATE_CW, lambda i: self._rotate(i, 1)),
+                                (ACTION_ROTATE_CCW, lambda i: self._rotate(i, -1)),
+                                (ACTION_HARD_DROP, self._hard_drop),
+                                (ACTION_HOLD, self._hold)):
+            idx = np.flatnonzero(live & (actions == action))
+            if len(idx):
+                handler(idx)
+        
+        # Gravity
+        if dt:
+            live = ~self.game_over
+            self.fall_time[live] += dt
+            due = np.flatnonzero(live & (self.fall_time >= self.fall_speed))
+            if len(due):
+                rows, self.fall_time[due] = np.divmod(self.fall_time[due], self.fall_speed[due])
+                self._fall(due, rows)
+        
+        rewards = self.score - score_before
+        dones = self.game_over.copy()
+        
+        if dones.any():
+            self.final_score[dones] = self.score[dones]
+            self.final_lines[dones] = self.lines_cleared[dones]
+            if self.auto_reset:
+                self.reset(dones)
+        
+        return rewards, dones
+    
+    def get_height_map(self):
+        """Get the height of each column for every board, shape (N, width)."""
+        filled = self.boards != EMPTY
+        first = filled.argmax(axis=1)
+        return np.where(filled.any(axis=1), self.height - first, 0)
+    
+    def get_holes_count(self):
+        """Count the holes on every board, shape (N,)."""
+        filled = self.boards != EMPTY
+        covered = np.maximum.accumulate(filled, axis=1)
+        return (covered & ~filled).sum(axis=(1, 2))
\ No newline at end of file
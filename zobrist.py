@@ -0,0 +1,145 @@
+"""
+Zobrist Hashing and Transposition Table
+Incremental board-state hashes and a bounded cache for search results
+"""
+
+import random
+from collections import OrderedDict
+
+# Fixed seed so hashes are stable across runs and processes
+ZOBRIST_SEED = 0x7E7215
+
+# Eviction policies for TranspositionTable
+EVICT_LRU = 'lru'
+EVICT_DEPTH = 'depth'
+
+class ZobristKeys:
+    """Random 64-bit keys for each board cell, with per-row lookup tables."""
+    
+    def __init__(self, width, height, seed=ZOBRIST_SEED):
+        """Initialize keys for a board size."""
+        rng = random.Random(seed)
+        self.width = width
+        self.height = height
+        self.cells = [[rng.getrandbits(64) for _ in range(width)] for _ in range(height)]
+        self._row_tables = [None] * height
+    
+    def row_hash(self, y, mask):
+        """Get the hash contribution of row y with the given occupancy mask."""
+        table = self._row_tables[y]
+        if table is None:
+            # table[mask] = table[mask without its lowest bit] ^ key of that bit
+            keys = self.cells[y]
+            table = [0] * (1 << self.width)
+            for m in range(1, 1 << self.width):
+                low = m & -m
+                table[m] = table[m ^ low] ^ keys[low.bit_length() - 1]
+            self._row_tables[y] = table
+        return table[mask]
+    
+    def board_hash(self, row_masks):
+        """Hash a whole board from its row masks."""
+        value = 0
+        for y, mask in enumerate(row_masks):
+            if mask:
+                value ^= self.row_hash(y, mask)
+        return value
+
+_KEYS = {}
+
+def get_keys(width, height):
+    """Get the shared Zobrist keys for a board size."""
+    keys = _KEYS.get((width, height))
+    if keys is None:
+        keys = _KEYS[width, height] = ZobristKeys(width, height)
+    return keys
+
+class TranspositionTable:
+    """Size-bounded cache of search results keyed by board hash."""
+    
+    def __init__(self, max_entries=100000, policy=EVICT_LRU, sample_size=8):
+        """Initialize the table."""
+        if policy not in (EVICT_LRU, EVICT_DEPTH):
+            raise ValueError(f"Unknown eviction policy: {policy}")
+        
+        self.max_entries = max_entries
+        self.policy = policy
+        # Depth-preferred eviction removes the shallowest of the oldest sample_size entries
+        self.sample_size = sample_size
+        self.entries = OrderedDict()
+        
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self):
+        """Get the number of stored entries."""
+        return len(self.entries)
+    
+    @property
+    def hit_rate(self):
+        """Get the fraction of lookups that hit."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+    
+    def get(self, key, depth=0):
+        """Get the value stored for key if it was searched at least this deep, else None."""
+        entry = self.entries.get(key)
+        if entry is None or entry[1] < depth:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        if self.policy == EVICT_LRU:
+            self.entries.move_to_end(key)
+        return entry[0]
+    
+    def store(self, key, value, depth=0):
+        """Store a value for key, evicting an entry if the table is full."""
+        entries = self.entries
+        old = entries.get(key)
+        if old is not None:
+            # Never replace a deeper result with a shallower one
+            if old[1] > depth:
+                return
+            entries[key] = (value, depth)
+            entries.move_to_end(key)
+            return
+        
+        if len(entries) >= self.max_entries:
+            self._evict()
+        entries[key] = (value, depth)
+    
+    def _evict(self):
+        """Remove one entry according to the eviction policy."""
+        entries = self.entries
+        if self.policy == EVICT_LRU:
+            entries.popitem(last=False)
+        else:
+            victim = None
+            victim_depth = None
+            for count, (key, (_, depth)) in enumerate(entries.items()):
+                if count >= self.sample_size:
+                    break
+                if victim is None or depth < victim_depth:
+                    victim, victim_depth = key, depth
+            del entries[victim]
+        self.evictions += 1
+    
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get_stats(self):
+        """Get the hit/miss/eviction counters."""
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate,
+        }
\ No newline at end of file